@@ -0,0 +1 @@
+"""Benchmarks for the Volkswagen We Connect ID integration."""
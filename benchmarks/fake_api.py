@@ -0,0 +1,191 @@
+"""Local stand-in for the Volkswagen API endpoints weconnect uses.
+
+The server answers with the responses of fixtures.py after a configurable
+latency. The integration reaches it through redirect_backend and
+redirect_api, which send the requests for API_BASE_URL to the server instead.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import time
+from typing import Any
+import uuid
+
+from aiohttp import web
+from requests.adapters import HTTPAdapter
+from weconnect import weconnect
+
+from custom_components.volkswagen_we_connect_id import backend
+
+from .fixtures import (
+    API_BASE_URL,
+    parking_position,
+    selective_status,
+    vehicle_dict,
+    vin_for,
+)
+
+
+# Not a valid PNG, the integration only stores and serves the bytes.
+PICTURE = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+
+
+class FakeWeConnectServer:
+    """Serve a fleet of vehicles on localhost."""
+
+    def __init__(
+        self, vehicles: int = 1, latency: float = 0.05, parking: bool = True
+    ) -> None:
+        """Initialize the server with a fleet size and latency in seconds.
+
+        Without parking the vehicles lack the parking position capability.
+        """
+        self.vins = [vin_for(number) for number in range(vehicles)]
+        self.latency = latency
+        self.parking = parking
+        self.requests: Counter[str] = Counter()
+        # VINs whose status requests fail.
+        self.failing: set[str] = set()
+        # When every setting write and control request arrived.
+        self.command_times: list[float] = []
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        """Start listening on a free port."""
+        app = web.Application(middlewares=[self._delay])
+        app.add_routes(
+            [
+                web.get("/user-login/refresh/v1", self._refresh),
+                web.get("/vehicle/v1/vehicles", self._vehicles),
+                web.get("/vehicle/v1/vehicles/{vin}/selectivestatus", self._status),
+                web.get("/vehicle/v1/vehicles/{vin}/parkingposition", self._parking),
+                web.get("/vehicle/v1/trips/{vin}/{trip_type}/last", self._trip),
+                web.get("/media/v2/vehicle-images/{vin}", self._images),
+                web.get("/pictures/{vin}", self._picture),
+                web.put("/vehicle/v1/vehicles/{vin}/{setting}/settings", self._command),
+                web.post(
+                    "/vehicle/v1/vehicles/{vin}/{domain}/{operation}", self._command
+                ),
+            ]
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[
+            1
+        ]  # pylint: disable=protected-access
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _delay(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count the request and answer after the latency."""
+        self.requests[request.match_info.route.resource.canonical] += 1
+        await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    async def _refresh(self, request: web.Request) -> web.Response:
+        """Hand out new tokens."""
+        return web.json_response(
+            {
+                "accessToken": uuid.uuid4().hex,
+                "idToken": uuid.uuid4().hex,
+                "refreshToken": uuid.uuid4().hex,
+                "expires_in": 3600,
+            }
+        )
+
+    async def _vehicles(self, request: web.Request) -> web.Response:
+        """Return the vehicle list."""
+        return web.json_response(
+            {"data": [vehicle_dict(vin, self.parking) for vin in self.vins]}
+        )
+
+    async def _status(self, request: web.Request) -> web.Response:
+        """Return the requested domains of a vehicle."""
+        if request.match_info["vin"] not in self.vins:
+            raise web.HTTPNotFound()
+        if request.match_info["vin"] in self.failing:
+            raise web.HTTPInternalServerError()
+        status = selective_status(soc=50 + self.vins.index(request.match_info["vin"]))
+        jobs = request.query.get("jobs", "").split(",")
+        if "all" not in jobs:
+            status = {
+                domain: value for domain, value in status.items() if domain in jobs
+            }
+        return web.json_response(status)
+
+    async def _parking(self, request: web.Request) -> web.Response:
+        """Return the parking position of a vehicle."""
+        return web.json_response(parking_position())
+
+    async def _trip(self, request: web.Request) -> web.Response:
+        """Report that there are no trips."""
+        return web.Response(status=204)
+
+    async def _images(self, request: web.Request) -> web.Response:
+        """Return the pictures of a vehicle."""
+        url = f"{API_BASE_URL}/pictures/{request.match_info['vin']}"
+        return web.json_response({"data": [{"id": "car_34view", "url": url}]})
+
+    async def _picture(self, request: web.Request) -> web.Response:
+        """Return a picture, the same for every vehicle."""
+        return web.Response(body=PICTURE, content_type="image/png")
+
+    async def _command(self, request: web.Request) -> web.Response:
+        """Accept a setting write or a control request."""
+        self.command_times.append(time.perf_counter())
+        return web.json_response({"data": {}})
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """Send the requests weconnect makes for API_BASE_URL to the server."""
+
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        self._url = url
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        request.url = self._url + request.url[len(API_BASE_URL) :]
+        return super().send(request, **kwargs)
+
+
+class _RedirectSession:
+    """Send the requests of the backend for API_BASE_URL to the server."""
+
+    def __init__(self, session, url: str) -> None:
+        self._session = session
+        self._url = url
+
+    def get(self, url: str, **kwargs: Any):
+        return self._session.get(self._url + url[len(API_BASE_URL) :], **kwargs)
+
+
+def redirect_api(api: weconnect.WeConnect, server: FakeWeConnectServer) -> None:
+    """Send the blocking requests of a weconnect api object to the server.
+
+    The api gets an expired token, so the integration starts by refreshing it.
+    """
+    api.session.mount(API_BASE_URL, _RedirectAdapter(server.url))
+    api.session.token = {
+        "access_token": "expired",
+        "id_token": "expired",
+        "refresh_token": "benchmark",
+        "token_type": "bearer",
+        "expires_at": time.time() - 1,
+    }
+
+
+def redirect_backend(server: FakeWeConnectServer) -> None:
+    """Send the aiohttp requests of the backend to the server."""
+    get_session = backend.async_get_clientsession
+    backend.async_get_clientsession = lambda hass: _RedirectSession(
+        get_session(hass), server.url
+    )
@@ -0,0 +1,218 @@
+"""Recorded-shape WeConnect API responses used by the benchmarks."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from weconnect import weconnect
+
+API_BASE_URL = "https://emea.bff.cariad.digital"
+
+CAPTURED = "2024-03-01T12:00:00Z"
+
+DOORS = ("bonnet", "trunk", "rearRight", "rearLeft", "frontLeft", "frontRight")
+WINDOWS = ("sunRoof", "roofCover", "rearRight", "rearLeft", "frontLeft", "frontRight")
+
+
+def vin_for(number: int) -> str:
+    """Return a fake VIN."""
+    return f"WVWZZZE1ZPP{number:06d}"
+
+
+def vehicle_dict(vin: str, parking: bool = True) -> dict[str, Any]:
+    """Return an entry of the vehicle list."""
+    return {
+        "vin": vin,
+        "role": "PRIMARY_USER",
+        "enrollmentStatus": "COMPLETED",
+        "userRoleStatus": "ENABLED",
+        "model": "ID.3",
+        "devicePlatform": "WCAR",
+        "nickname": f"ID.3 {vin[-4:]}",
+        "brandCode": "V",
+        "capabilities": [
+            {"id": capability, "userDisablingAllowed": False}
+            for capability in (
+                "access",
+                "charging",
+                "climatisation",
+                "measurements",
+                "parkingPosition",
+                "readiness",
+                "vehicleHealthInspection",
+            )
+            if parking or capability != "parkingPosition"
+        ],
+    }
+
+
+def _status(value: dict[str, Any]) -> dict[str, Any]:
+    return {"value": {"carCapturedTimestamp": CAPTURED, **value}}
+
+
+def selective_status(soc: int = 80) -> dict[str, Any]:
+    """Return a selective status response of an electric vehicle."""
+    return {
+        "access": {
+            "accessStatus": _status(
+                {
+                    "overallStatus": "safe",
+                    "doorLockStatus": "locked",
+                    "doors": [
+                        {"name": door, "status": ["locked", "closed"]} for door in DOORS
+                    ],
+                    "windows": [
+                        {"name": window, "status": ["closed"]} for window in WINDOWS
+                    ],
+                }
+            )
+        },
+        "charging": {
+            "batteryStatus": _status(
+                {"currentSOC_pct": soc, "cruisingRangeElectric_km": soc * 4}
+            ),
+            "chargingStatus": _status(
+                {
+                    "remainingChargingTimeToComplete_min": 0,
+                    "chargingState": "readyForCharging",
+                    "chargeMode": "manual",
+                    "chargePower_kW": 0,
+                    "chargeRate_kmph": 0,
+                    "chargeType": "invalid",
+                    "chargingSettings": "default",
+                }
+            ),
+            "chargingSettings": _status(
+                {
+                    "maxChargeCurrentAC": "maximum",
+                    "autoUnlockPlugWhenCharged": "permanent",
+                    "autoUnlockPlugWhenChargedAC": "permanent",
+                    "targetSOC_pct": 80,
+                }
+            ),
+            "plugStatus": _status(
+                {
+                    "plugConnectionState": "connected",
+                    "plugLockState": "locked",
+                    "externalPower": "ready",
+                    "ledColor": "green",
+                }
+            ),
+        },
+        "climatisation": {
+            "climatisationSettings": _status(
+                {
+                    "targetTemperature_C": 21.5,
+                    "targetTemperature_F": 70,
+                    "unitInCar": "celsius",
+                    "climatizationAtUnlock": False,
+                    "windowHeatingEnabled": True,
+                    "zoneFrontLeftEnabled": True,
+                    "zoneFrontRightEnabled": False,
+                }
+            ),
+            "climatisationStatus": _status(
+                {"remainingClimatisationTime_min": 0, "climatisationState": "off"}
+            ),
+            "windowHeatingStatus": _status(
+                {
+                    "windowHeatingStatus": [
+                        {"windowLocation": "front", "windowHeatingState": "off"},
+                        {"windowLocation": "rear", "windowHeatingState": "off"},
+                    ]
+                }
+            ),
+        },
+        "fuelStatus": {
+            "rangeStatus": _status(
+                {
+                    "carType": "electric",
+                    "primaryEngine": {
+                        "type": "electric",
+                        "currentSOC_pct": soc,
+                        "remainingRange_km": soc * 4,
+                    },
+                    "totalRange_km": soc * 4,
+                }
+            )
+        },
+        "measurements": {
+            "odometerStatus": _status({"odometer": 12345}),
+            "temperatureBatteryStatus": _status(
+                {
+                    "temperatureHvBatteryMin_K": 293.15,
+                    "temperatureHvBatteryMax_K": 295.15,
+                }
+            ),
+        },
+        "readiness": {
+            "readinessStatus": {
+                "value": {
+                    "connectionState": {
+                        "isOnline": True,
+                        "isActive": False,
+                        "batteryPowerLevel": "comfort",
+                        "dailyPowerBudgetAvailable": True,
+                    },
+                    "connectionWarning": {
+                        "insufficientBatteryLevelWarning": False,
+                        "dailyPowerBudgetWarning": False,
+                    },
+                }
+            }
+        },
+        "vehicleHealthInspection": {
+            "maintenanceStatus": _status(
+                {
+                    "inspectionDue_days": 400,
+                    "inspectionDue_km": 20000,
+                    "mileage_km": 12345,
+                }
+            )
+        },
+    }
+
+
+def parking_position() -> dict[str, Any]:
+    """Return a parking position response."""
+    return {"data": {"lat": 52.4227, "lon": 10.7865, "carCapturedTimestamp": CAPTURED}}
+
+
+def populate_cache(api: weconnect.WeConnect, vehicles: int, jobs: str) -> list[str]:
+    """Put the responses of a fleet into the cache of a weconnect api object."""
+    now = str(datetime.utcnow())
+    vins = [vin_for(number) for number in range(vehicles)]
+    api.cache[f"{API_BASE_URL}/vehicle/v1/vehicles"] = (
+        {"data": [vehicle_dict(vin) for vin in vins]},
+        now,
+    )
+    for number, vin in enumerate(vins):
+        api.cache[
+            f"{API_BASE_URL}/vehicle/v1/vehicles/{vin}/selectivestatus?jobs={jobs}"
+        ] = (selective_status(soc=50 + number % 50), now)
+        api.cache[f"{API_BASE_URL}/vehicle/v1/vehicles/{vin}/parkingposition"] = (
+            parking_position(),
+            now,
+        )
+        for trip_type in ("shortterm", "longterm", "cyclic"):
+            api.cache[f"{API_BASE_URL}/vehicle/v1/trips/{vin}/{trip_type}/last"] = (
+                {},
+                now,
+            )
+    return vins
+
+
+def offline_api(vehicles: int = 1) -> weconnect.WeConnect:
+    """Return a weconnect api object that parses a fleet from its cache."""
+    from custom_components.volkswagen_we_connect_id.backend import DEFAULT_JOBS
+
+    api = weconnect.WeConnect(
+        username="benchmark",
+        password="benchmark",
+        loginOnInit=False,
+        updateAfterLogin=False,
+        maxAge=3600,
+    )
+    populate_cache(api, vehicles, ",".join(DEFAULT_JOBS))
+    api.update(updatePictures=False)
+    return api
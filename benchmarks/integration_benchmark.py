@@ -0,0 +1,232 @@
+"""Drive the integration in Home Assistant against the local fake API.
+
+Measures the setup of a config entry, full and idle coordinator refreshes and
+the service handlers, reporting wall time, the time spent in executor jobs and
+the cost of updating the entities. Run from the repository root:
+
+    python -m benchmarks.integration_benchmark --vehicles 5 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import os
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from custom_components.volkswagen_we_connect_id import (
+    DomainEntry,
+    commands,
+    get_account,
+)
+from custom_components.volkswagen_we_connect_id.const import DOMAIN
+
+from .fake_api import FakeWeConnectServer, redirect_api, redirect_backend
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+
+
+class Stats:
+    """Wall time, executor time and entity updates of the measured runs."""
+
+    def __init__(self) -> None:
+        self.executor = 0.0
+        self.listeners = 0.0
+        self.state_writes = 0
+
+    def reset(self) -> None:
+        self.executor = 0.0
+        self.listeners = 0.0
+        self.state_writes = 0
+
+
+async def _start_hass(config_dir: str, stats: Stats) -> HomeAssistant:
+    """Start a Home Assistant instance that loads the custom component."""
+    os.symlink(REPOSITORY / "custom_components", Path(config_dir) / "custom_components")
+    hass = HomeAssistant(config_dir)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    loader.async_setup(hass)
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+
+    add_executor_job = hass.async_add_executor_job
+
+    def timed_executor_job(target: Callable[..., Any], *args: Any):
+        def run() -> Any:
+            start = time.perf_counter()
+            try:
+                return target(*args)
+            finally:
+                stats.executor += time.perf_counter() - start
+
+        return add_executor_job(run)
+
+    hass.async_add_executor_job = timed_executor_job
+
+    def count_state_write(_) -> None:
+        stats.state_writes += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write)
+    return hass
+
+
+def _time_listeners(domain_entry: DomainEntry, stats: Stats) -> None:
+    """Add the time the coordinator spends updating entities to the stats."""
+    coordinator = domain_entry.coordinator
+    update_listeners = coordinator.async_update_listeners
+
+    def timed_update_listeners() -> None:
+        start = time.perf_counter()
+        try:
+            update_listeners()
+        finally:
+            stats.listeners += time.perf_counter() - start
+
+    coordinator.async_update_listeners = timed_update_listeners
+
+
+async def _measure(
+    name: str,
+    runs: int,
+    stats: Stats,
+    run: Callable[[], Awaitable[None]],
+) -> None:
+    """Run a step several times and print its statistics."""
+    durations = []
+    stats.reset()
+    for _ in range(runs):
+        start = time.perf_counter()
+        await run()
+        durations.append(time.perf_counter() - start)
+    print(
+        f"{name:28} {statistics.median(durations) * 1000:9.1f} ms median"
+        f" {max(durations) * 1000:9.1f} ms max"
+        f" {stats.executor / runs * 1000:8.1f} ms executor"
+        f" {stats.listeners / runs * 1000:7.2f} ms entities"
+        f" {stats.state_writes / runs:6.1f} states"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the benchmark."""
+    server = FakeWeConnectServer(args.vehicles, args.latency)
+    await server.start()
+    redirect_backend(server)
+    # Commands are settled after a single refresh instead of waiting for the car.
+    commands.POST_COMMAND_REFRESH_DELAYS_SECONDS = (0,)
+
+    stats = Stats()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _start_hass(config_dir, stats)
+        redirect_api(get_account("benchmark", "benchmark").api, server)
+
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=2,
+            domain=DOMAIN,
+            title="benchmark",
+            data={
+                "username": "benchmark",
+                "password": "benchmark",
+                "fleet_mode": args.fleet_mode,
+            },
+            source=config_entries.SOURCE_USER,
+            options={},
+        )
+        print(
+            f"{args.vehicles} vehicles, {args.latency * 1000:.0f} ms latency,"
+            f" {args.runs} runs per step"
+        )
+
+        stats.reset()
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        print(
+            f"{'setup':28} {(time.perf_counter() - start) * 1000:9.1f} ms"
+            f" {stats.executor * 1000:16.1f} ms executor"
+            f" {stats.state_writes:21} states"
+        )
+
+        domain_entry: DomainEntry = hass.data[DOMAIN][entry.entry_id]
+        coordinator = domain_entry.coordinator
+        _time_listeners(domain_entry, stats)
+
+        async def full_refresh() -> None:
+            domain_entry.scheduler.reset()
+            await coordinator.async_refresh()
+
+        await _measure("full refresh", args.runs, stats, full_refresh)
+        print(
+            "  last full refresh phases: "
+            + ", ".join(
+                f"{phase} {seconds * 1000:.1f} ms"
+                for phase, seconds in domain_entry.metrics.phases.items()
+            )
+        )
+        await _measure("idle refresh", args.runs, stats, coordinator.async_refresh)
+
+        async def list_refresh() -> None:
+            domain_entry.scheduler._next_full_poll = (
+                0.0  # pylint: disable=protected-access
+            )
+            await coordinator.async_refresh()
+
+        await _measure("vehicle list refresh", args.runs, stats, list_refresh)
+
+        vin = server.vins[0]
+        target_soc = iter(range(args.runs * 2))
+
+        async def set_target_soc() -> None:
+            await hass.services.async_call(
+                DOMAIN,
+                "volkswagen_id_set_target_soc",
+                {"vin": vin, "target_soc": 50 + next(target_soc) % 40},
+                blocking=True,
+            )
+            await hass.async_block_till_done()
+
+        async def start_charging() -> None:
+            await hass.services.async_call(
+                DOMAIN,
+                "volkswagen_id_start_stop_charging",
+                {"vin": vin, "start_stop": "start"},
+                blocking=True,
+            )
+            await hass.async_block_till_done()
+
+        await _measure("service set target soc", args.runs, stats, set_target_soc)
+        await _measure("service start charging", args.runs, stats, start_charging)
+
+        print(f"{sum(server.requests.values())} requests served:")
+        for route, count in server.requests.most_common():
+            print(f"  {count:6} {route}")
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    await server.stop()
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--fleet-mode", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
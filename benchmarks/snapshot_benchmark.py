@@ -0,0 +1,113 @@
+"""Compare reading entity values per property with per-vehicle snapshots.
+
+Run from the repository root:
+
+    python -m benchmarks.snapshot_benchmark --vehicles 5 --refreshes 200
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import logging
+import timeit
+from typing import Any
+
+from custom_components.volkswagen_we_connect_id import get_object_value
+from custom_components.volkswagen_we_connect_id.binary_sensor import (
+    SENSORS as BINARY_SENSORS,
+)
+from custom_components.volkswagen_we_connect_id.coordinator import (
+    VolkswagenIDCoordinator,
+)
+from custom_components.volkswagen_we_connect_id.metrics import RefreshMetrics
+from custom_components.volkswagen_we_connect_id.sensor import SENSORS, VEHICLE_SENSORS
+from custom_components.volkswagen_we_connect_id.snapshot import reported_status
+
+from .fixtures import offline_api
+
+
+def _readers() -> dict[str, Callable[[Any], Any]]:
+    """Return the readers of the sensor and binary sensor entities."""
+    readers: dict[str, Callable[[Any], Any]] = {}
+    for sensor in SENSORS:
+        readers[sensor.key] = lambda vehicle, sensor=sensor: (
+            get_object_value(sensor.value(vehicle.domains))
+            if reported_status(vehicle.domains, sensor.domain.value, sensor.status)
+            else None
+        )
+    for sensor in VEHICLE_SENSORS:
+        readers[sensor.key] = lambda vehicle, value=sensor.value: get_object_value(
+            value(vehicle)
+        )
+    for sensor in BINARY_SENSORS:
+        readers[f"binary_{sensor.key}"] = lambda vehicle, sensor=sensor: (
+            bool(getattr(sensor.value(vehicle.domains), "value", None))
+            if reported_status(vehicle.domains, sensor.domain.value, sensor.status)
+            else None
+        )
+    return readers
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5)
+    parser.add_argument("--refreshes", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    vehicles = dict(offline_api(args.vehicles).vehicles)
+    readers = _readers()
+
+    def property_path() -> None:
+        # Every entity state write walks the lambda and get_object_value.
+        for vehicle in vehicles.values():
+            for reader in readers.values():
+                reader(vehicle)
+
+    coordinator = VolkswagenIDCoordinator.__new__(VolkswagenIDCoordinator)
+    coordinator.snapshots = {}
+    coordinator.metrics = RefreshMetrics()
+    coordinator._change_tracker = None  # pylint: disable=protected-access
+    coordinator._changed = set()  # pylint: disable=protected-access
+    coordinator._readers = readers  # pylint: disable=protected-access
+    coordinator._index = {
+        key: position for position, key in enumerate(readers)
+    }  # pylint: disable=protected-access
+
+    def snapshot_path() -> None:
+        # One snapshot per vehicle, only entities whose value changed read it.
+        coordinator._build_snapshots(vehicles)  # pylint: disable=protected-access
+        changed, coordinator._changed = (
+            coordinator._changed,
+            set(),
+        )  # pylint: disable=protected-access
+        for vin, key in changed:
+            coordinator.snapshots[vin][key]  # pylint: disable=pointless-statement
+
+    def snapshot_read_all() -> None:
+        # Same, but as if every value had changed.
+        coordinator._build_snapshots(vehicles)  # pylint: disable=protected-access
+        coordinator._changed.clear()  # pylint: disable=protected-access
+        for vin in vehicles:
+            snapshot = coordinator.snapshots[vin]
+            for key in readers:
+                snapshot[key]  # pylint: disable=pointless-statement
+
+    entities = len(vehicles) * len(readers)
+    print(f"{len(vehicles)} vehicles, {entities} entities, {args.refreshes} refreshes")
+    print(
+        "The property path writes the state of every entity on every refresh,"
+        " the snapshot path only of the entities whose value changed."
+    )
+    for name, path in (
+        ("property path", property_path),
+        ("snapshot path, unchanged values", snapshot_path),
+        ("snapshot path, all values read", snapshot_read_all),
+    ):
+        seconds = min(timeit.repeat(path, number=args.refreshes, repeat=5))
+        print(f"{name:32} {seconds / args.refreshes * 1000:8.3f} ms per refresh")
+
+
+if __name__ == "__main__":
+    main()
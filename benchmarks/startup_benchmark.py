@@ -0,0 +1,157 @@
+"""Measure how long the integration takes to start.
+
+Every run starts a fresh interpreter, so module imports are cold like at the
+boot of Home Assistant. It reports the time to import the integration, the
+setup of a config entry against the local fake API including the import of
+its platforms, the longest stall of the event loop during that setup and
+which platforms were set up. Run from the repository root:
+
+    python -m benchmarks.startup_benchmark --vehicles 2 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+INTEGRATION = "custom_components.volkswagen_we_connect_id"
+BASELINE_MODULES = (
+    "homeassistant.bootstrap",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+)
+
+
+async def _watch_loop(stalls: list[float]) -> None:
+    """Record how late the event loop wakes up a task that sleeps 1 ms."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append(time.perf_counter() - start - 0.001)
+
+
+async def _child(args: argparse.Namespace) -> dict[str, object]:
+    """Import and set up the integration once, return the timings."""
+    # Home Assistant has loaded these before it imports the integration.
+    for module in BASELINE_MODULES:
+        importlib.import_module(module)
+    from homeassistant import config_entries  # pylint: disable=import-outside-toplevel
+
+    start = time.perf_counter()
+    integration = importlib.import_module(INTEGRATION)
+    import_seconds = time.perf_counter() - start
+
+    # pylint: disable-next=import-outside-toplevel
+    from .fake_api import FakeWeConnectServer, redirect_api, redirect_backend
+
+    # pylint: disable-next=import-outside-toplevel
+    from .integration_benchmark import Stats, _start_hass
+
+    server = FakeWeConnectServer(args.vehicles, args.latency, not args.no_parking)
+    await server.start()
+    redirect_backend(server)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _start_hass(config_dir, Stats())
+        redirect_api(integration.get_account("startup", "startup").api, server)
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=2,
+            domain=integration.DOMAIN,
+            title="startup",
+            data={"username": "startup", "password": "startup"},
+            source=config_entries.SOURCE_USER,
+            options={},
+        )
+
+        stalls: list[float] = []
+        watcher = asyncio.create_task(_watch_loop(stalls))
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - start
+        watcher.cancel()
+
+        domain_entry = hass.data[integration.DOMAIN][entry.entry_id]
+        result = {
+            "import": import_seconds,
+            "setup": setup_seconds,
+            "stall": max(stalls, default=0.0),
+            "platforms": [
+                str(platform)
+                for platform in getattr(
+                    domain_entry, "platforms", integration.PLATFORMS
+                )
+            ],
+            "entities": len(hass.states.async_all()),
+        }
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    await server.stop()
+    return result
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the measurements in fresh interpreters and print the medians."""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.startup_benchmark",
+        "--child",
+        f"--vehicles={args.vehicles}",
+        f"--latency={args.latency}",
+    ]
+    if args.no_parking:
+        command.append("--no-parking")
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            command, cwd=REPOSITORY, capture_output=True, check=True, text=True
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    print(
+        f"{args.vehicles} vehicles{' without parking position' if args.no_parking else ''},"
+        f" {args.latency * 1000:.0f} ms latency, {args.runs} runs"
+    )
+    for key, name in (
+        ("import", "import integration"),
+        ("setup", "set up config entry"),
+        ("stall", "longest event loop stall"),
+    ):
+        values = [result[key] for result in results]
+        print(
+            f"{name:28} {statistics.median(values) * 1000:9.1f} ms median"
+            f" {max(values) * 1000:9.1f} ms max"
+        )
+    print(f"platforms: {', '.join(results[-1]['platforms'])}")
+    print(f"entities: {results[-1]['entities']}")
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-parking", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args))))
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,58 @@
 """The Volkswagen We Connect ID integration."""
 from __future__ import annotations
 
+from abc import abstractmethod
 import asyncio
-from dataclasses import dataclass
-from datetime import timedelta
-import functools
+from collections.abc import Collection
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 import logging
 import threading
-import time
 from typing import Any
 
+import aiohttp
 from weconnect import weconnect
+from weconnect.domain import Domain
 from weconnect.elements.vehicle import Vehicle
 from weconnect.elements.control_operation import ControlOperation
+from weconnect.errors import APIError, RetrievalError
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .backend import (
+    API_BASE_URL,
+    CACHE_MAX_AGE_SECONDS,
+    AsyncWeConnectBackend,
+    rate_limit_error,
 )
-
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL_SECONDS
+from .capabilities import CapabilityProbe, capability_store
+from .charging_sessions import ChargingSessionRecorder, charging_store
+from .commands import CommandQueue
+from .coordinator import VolkswagenIDCoordinator
+from .metrics import PHASE_FETCH, PHASE_FILTER, PHASE_PARSE, RefreshMetrics
+from .observers import ChangeTracker
+from .persistence import VehicleCacheStore, cache_store
+from .pictures import VehiclePictureCache, async_remove_pictures
+from .resilience import STATE_CLOSED, CircuitOpenError
+from .const import (
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_MIN_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_MAX_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_IMPORT_TRIP_STATISTICS,
+    DEFAULT_VEHICLE_PICTURES,
+    TOKEN_STORAGE_VERSION,
+)
+from .scheduler import PollScheduler
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -35,16 +64,66 @@ PLATFORMS = [
 
 _LOGGER = logging.getLogger(__name__)
 
-SUPPORTED_VEHICLES = ["ID.3", "ID.4", "ID.5", "ID. Buzz", "ID.7 Limousine", "ID.7 Tourer"]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SUPPORTED_VEHICLES = [
+    "ID.3",
+    "ID.4",
+    "ID.5",
+    "ID. Buzz",
+    "ID.7 Limousine",
+    "ID.7 Tourer",
+]
+
+
+@dataclass
+class WeConnectAccount:
+    """A weconnect api object together with the lock its updates run under."""
+
+    api: weconnect.WeConnect
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    changes: ChangeTracker = field(init=False)
+    # The config entries that hold the account.
+    entry_ids: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        """Observe the changes of the vehicles of the api.
+
+        weconnect can not remove observers, so every api object gets one.
+        """
+        self.changes = ChangeTracker(self.api)
 
 
 @dataclass
 class DomainEntry:
     """References to objects shared through hass.data[DOMAIN][config_entry_id]."""
 
-    coordinator: DataUpdateCoordinator[list[Vehicle]]
+    coordinator: VolkswagenIDCoordinator
     we_connect: weconnect.WeConnect
-    vehicles: list[Vehicle]
+    vehicles: dict[str, Vehicle]
+    account: WeConnectAccount
+    backend: AsyncWeConnectBackend
+    commands: CommandQueue
+    scheduler: PollScheduler
+    metrics: RefreshMetrics
+    charging_sessions: ChargingSessionRecorder
+    capabilities: CapabilityProbe
+    pictures: VehiclePictureCache | None = None
+    # The platforms set up for the config entry.
+    platforms: list[Platform] = field(default_factory=list)
+
+
+def entry_platforms(pictures: bool) -> list[Platform]:
+    """Return the platforms of a config entry.
+
+    Every platform is set up, also when it has no entities for the vehicles
+    of the account right now, so that the entities an earlier setup
+    registered are still provided instead of left behind in the registry.
+    """
+    if pictures:
+        return [*PLATFORMS, Platform.IMAGE]
+    return list(PLATFORMS)
+
 
 def get_parameter(config_entry: ConfigEntry, parameter: str, default_val: Any = None):
     """Get parameter from OptionsFlow or ConfigFlow"""
@@ -54,123 +133,57 @@ def get_parameter(config_entry: ConfigEntry, parameter: str, default_val: Any =
         return config_entry.data.get(parameter)
     return default_val
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Volkswagen We Connect ID from a config entry."""
-
-    hass.data.setdefault(DOMAIN, {})
-    _we_connect = get_we_connect_api(
-        username=get_parameter(entry, "username"),
-        password=get_parameter(entry, "password"),
-    )
-
-    await hass.async_add_executor_job(_we_connect.login)
-    await hass.async_add_executor_job(update, _we_connect)
-
-    async def async_update_data() -> list[Vehicle]:
-        """Fetch data from Volkswagen API."""
-
-        await hass.async_add_executor_job(update, _we_connect)
 
-        vehicles: list[Vehicle] = []
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services, they send commands through the entry of the car.
 
-        for vin, vehicle in _we_connect.vehicles.items():
-            if vehicle.model.value in SUPPORTED_VEHICLES:
-                vehicles.append(vehicle)
-
-        domain_entry: DomainEntry = hass.data[DOMAIN][entry.entry_id]
-        domain_entry.vehicles = vehicles
-        return vehicles
-
-    coordinator = DataUpdateCoordinator[list[Vehicle]](
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=timedelta(
-            seconds=get_parameter(entry, "update_interval", DEFAULT_UPDATE_INTERVAL_SECONDS),
-        ),
-    )
-
-    hass.data[DOMAIN][entry.entry_id] = DomainEntry(coordinator, _we_connect, [])
-
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
-
-    # Setup components
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    The services wait until their commands are sent and fail when the car
+    rejects them. Commands of calls made at the same time are still merged
+    by the queue.
+    """
 
     @callback
     async def volkswagen_id_start_stop_charging(call: ServiceCall) -> None:
-
         vin = call.data["vin"]
+        commands = _commands_for_vin(hass, vin)
         start_stop = call.data["start_stop"]
 
-        if (
-            await hass.async_add_executor_job(
-                start_stop_charging,
-                vin,
-                _we_connect,
-                start_stop,
-            )
-            is False
-        ):
-            _LOGGER.error("Cannot send charging request to car")
+        if not await async_start_stop_charging(commands, vin, start_stop):
+            raise HomeAssistantError("Cannot send charging request to car")
 
     @callback
     async def volkswagen_id_set_climatisation(call: ServiceCall) -> None:
-
         vin = call.data["vin"]
+        commands = _commands_for_vin(hass, vin)
         start_stop = call.data["start_stop"]
         target_temperature = 0
         if "target_temp" in call.data:
             target_temperature = call.data["target_temp"]
 
-        if (
-            await hass.async_add_executor_job(
-                set_climatisation,
-                vin,
-                _we_connect,
-                start_stop,
-                target_temperature,
-            )
-            is False
+        if not await async_set_climatisation(
+            commands, vin, start_stop, target_temperature
         ):
-            _LOGGER.error("Cannot send climate request to car")
+            raise HomeAssistantError("Cannot send climate request to car")
 
     @callback
     async def volkswagen_id_set_target_soc(call: ServiceCall) -> None:
-
         vin = call.data["vin"]
+        commands = _commands_for_vin(hass, vin)
         target_soc = 0
         if "target_soc" in call.data:
             target_soc = call.data["target_soc"]
 
-        if (
-            await hass.async_add_executor_job(
-                set_target_soc,
-                vin,
-                _we_connect,
-                target_soc,
-            )
-            is False
-        ):
-            _LOGGER.error("Cannot send target soc request to car")
+        if not await async_set_target_soc(commands, vin, target_soc):
+            raise HomeAssistantError("Cannot send target soc request to car")
 
     @callback
     async def volkswagen_id_set_ac_charge_speed(call: ServiceCall) -> None:
-
         vin = call.data["vin"]
-        if "maximum_reduced" in call.data:
-            if (
-                await hass.async_add_executor_job(
-                    set_ac_charging_speed,
-                    vin,
-                    _we_connect,
-                    call.data["maximum_reduced"],
-                )
-                is False
-            ):
-                _LOGGER.error("Cannot send ac speed request to car")
+        commands = _commands_for_vin(hass, vin)
+        if "maximum_reduced" in call.data and not await async_set_ac_charging_speed(
+            commands, vin, call.data["maximum_reduced"]
+        ):
+            raise HomeAssistantError("Cannot send ac speed request to car")
 
     # Register our services with Home Assistant.
     hass.services.async_register(
@@ -187,207 +200,559 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         DOMAIN, "volkswagen_id_set_ac_charge_speed", volkswagen_id_set_ac_charge_speed
     )
 
+    return True
+
+
+def _commands_for_vin(hass: HomeAssistant, vin: str) -> CommandQueue:
+    """Return the command queue of the config entry that has a car."""
+    for domain_entry in hass.data.get(DOMAIN, {}).values():
+        if vin in domain_entry.vehicles:
+            return domain_entry.commands
+    raise HomeAssistantError(f"Car {vin} is not in any Volkswagen account")
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Volkswagen We Connect ID from a config entry."""
+
+    hass.data.setdefault(DOMAIN, {})
+    account = get_account(
+        username=get_parameter(entry, "username"),
+        password=get_parameter(entry, "password"),
+        entry_id=entry.entry_id,
+    )
+    _we_connect = account.api
+    metrics = RefreshMetrics()
+    backend = AsyncWeConnectBackend(
+        hass, _we_connect, token_store(hass, entry), metrics
+    )
+    vehicle_cache = VehicleCacheStore(hass, entry.entry_id, account)
+    charging_sessions = ChargingSessionRecorder(hass, entry.entry_id)
+    await charging_sessions.async_load()
+    capabilities = CapabilityProbe(hass, entry.entry_id)
+    await capabilities.async_load()
+
+    await backend.async_restore_tokens()
+    # Entities are created from the data saved by the last session, the login
+    # then happens with the first live refresh.
+    restored_at = await vehicle_cache.async_restore()
+    if restored_at is None:
+        await backend.async_login()
+
+    scheduler = PollScheduler(
+        floor=get_parameter(
+            entry, "min_update_interval", DEFAULT_MIN_UPDATE_INTERVAL_SECONDS
+        ),
+        default=get_parameter(
+            entry, "update_interval", DEFAULT_UPDATE_INTERVAL_SECONDS
+        ),
+        ceiling=get_parameter(
+            entry, "max_update_interval", DEFAULT_MAX_UPDATE_INTERVAL_SECONDS
+        ),
+        stagger=get_parameter(entry, "fleet_mode", DEFAULT_FLEET_MODE),
+    )
+    trip_importer = None
+    if get_parameter(entry, "import_trip_statistics", DEFAULT_IMPORT_TRIP_STATISTICS):
+        # Imported only here, loading the recorder takes long.
+        from .trip_statistics import (  # pylint: disable=import-outside-toplevel
+            TripStatisticsImporter,
+        )
+
+        trip_importer = TripStatisticsImporter(hass, entry, backend)
+
+    async def async_update_data() -> dict[str, Vehicle]:
+        """Fetch data from Volkswagen API, backing off when that fails."""
+        try:
+            return await async_fetch_data()
+        except Exception as exc:
+            if isinstance(exc, CircuitOpenError):
+                # The open circuit skipped the refresh, it did not fail.
+                metrics.paused_refreshes += 1
+            else:
+                metrics.failures += 1
+            # Failures of the fetches weconnect makes itself while parsing are
+            # not seen by the backend.
+            if (
+                isinstance(exc, (RetrievalError, APIError))
+                and exc is not backend.breaker.last_error
+            ):
+                backend.breaker.record_failure(exc, getattr(exc, "retry_after", None))
+            coordinator.update_interval = max(
+                backend.breaker.retry_in(), timedelta(seconds=scheduler.floor)
+            )
+            raise
+
+    async def async_fetch_data() -> dict[str, Vehicle]:
+        """Fetch data from Volkswagen API."""
+
+        domain_entry: DomainEntry = hass.data[DOMAIN][entry.entry_id]
+        due_vins = scheduler.due_vehicles(list(domain_entry.vehicles))
+        # In fleet mode the vehicle list is refreshed with the due vehicles.
+        refresh_list = (
+            due_vins is not None and scheduler.stagger and scheduler.list_due()
+        )
+
+        errors: dict[str, Exception] = {}
+        if due_vins is None or due_vins or refresh_list:
+            selective = coordinator.required_domains()
+            if selective is not None and (due_vins is None or refresh_list):
+                # With the vehicle list the domains of the values a vehicle did
+                # not report yet are fetched too, so they are probed again.
+                selective = sorted(
+                    {*selective, *capabilities.pending_domains()},
+                    key=list(Domain).index,
+                )
+            try:
+                with metrics.span(PHASE_FETCH):
+                    errors = await backend.async_fetch(
+                        due_vins, selective, refresh_list, record_success=False
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                # The backend recorded the failure, while the circuit is open
+                # the API is not called through weconnect either.
+                if backend.breaker.state != STATE_CLOSED:
+                    raise
+                _LOGGER.debug("Async fetch failed, using weconnect instead - %s", exc)
+                with metrics.span(PHASE_PARSE):
+                    errors = await hass.async_add_executor_job(
+                        update, account, due_vins
+                    )
+                backend.breaker.record_success()
+                selective = None
+                refresh_list = False
+            else:
+                with metrics.span(PHASE_PARSE):
+                    errors.update(
+                        await hass.async_add_executor_job(
+                            update,
+                            account,
+                            due_vins,
+                            True,
+                            selective,
+                            refresh_list,
+                            list(errors),
+                        )
+                    )
+                # Only now the refresh worked, weconnect may have failed to
+                # fetch what was not prefetched.
+                if rate_limit_error(errors) is None:
+                    backend.breaker.record_success()
+            coordinator.restored_at = None
+            vehicle_cache.async_schedule_save(selective)
+        else:
+            metrics.skipped_refreshes += 1
+
+        with metrics.span(PHASE_FILTER):
+            vehicles = supported_vehicles(_we_connect)
+
+        polled = due_vins
+        if refresh_list:
+            polled = [
+                *due_vins,
+                *(vin for vin in vehicles if vin not in domain_entry.vehicles),
+            ]
+        scheduler.record_poll(list(vehicles.values()), polled, refresh_list)
+        scheduler.record_failure(list(errors))
+        coordinator.set_vehicle_errors(vehicles if polled is None else polled, errors)
+        coordinator.update_interval = max(
+            scheduler.next_refresh_in(), backend.breaker.retry_in()
+        )
+        await backend.async_save_tokens()
+        charging_sessions.async_update(vehicles)
+        if trip_importer is not None:
+            trip_importer.async_schedule(vehicles)
+        # Values a vehicle did not report are probed again whenever the vehicle
+        # list is refreshed, the entities of new ones are created by a reload.
+        # Only the vehicles refreshed without an error are probed.
+        if (due_vins is None or refresh_list) and await capabilities.async_update(
+            {
+                vin: vehicle
+                for vin, vehicle in vehicles.items()
+                if (polled is None or vin in polled) and vin not in errors
+            }
+        ):
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+        domain_entry.vehicles = vehicles
+        return vehicles
+
+    coordinator = VolkswagenIDCoordinator(
+        hass,
+        _LOGGER,
+        name=DOMAIN,
+        update_method=async_update_data,
+        update_interval=timedelta(seconds=scheduler.default),
+        metrics=metrics,
+        changes=account.changes,
+    )
+
+    async def async_fetch_vehicle(vin: str, domains: list[Domain]) -> None:
+        """Fetch only some domains of one vehicle."""
+        await backend.async_fetch([vin], domains)
+        errors = await hass.async_add_executor_job(
+            update, account, [vin], True, domains
+        )
+        if vin in errors:
+            raise errors[vin]
+
+    commands = CommandQueue(hass, _we_connect, coordinator, async_fetch_vehicle)
+
+    pictures = None
+    if get_parameter(entry, "vehicle_pictures", DEFAULT_VEHICLE_PICTURES):
+        pictures = VehiclePictureCache(hass, entry.entry_id, backend)
+        await pictures.async_load()
+    if trip_importer is not None:
+        # The trips are fetched with every vehicle for the import.
+        entry.async_on_unload(coordinator.async_add_domain_user((Domain.TRIPS,)))
+
+    hass.data[DOMAIN][entry.entry_id] = DomainEntry(
+        coordinator,
+        _we_connect,
+        {},
+        account,
+        backend,
+        commands,
+        scheduler,
+        metrics,
+        charging_sessions,
+        capabilities,
+        pictures,
+    )
+
+    if restored_at is None:
+        # Fetch initial data so we have data when entities subscribe
+        await coordinator.async_config_entry_first_refresh()
+    else:
+        vehicles = supported_vehicles(_we_connect)
+        hass.data[DOMAIN][entry.entry_id].vehicles = vehicles
+        coordinator.async_set_restored_data(vehicles, restored_at)
+
+    # Setup components
+    domain_entry: DomainEntry = hass.data[DOMAIN][entry.entry_id]
+    domain_entry.platforms = entry_platforms(pictures is not None)
+    await hass.config_entries.async_forward_entry_setups(entry, domain_entry.platforms)
+
+    if restored_at is not None:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+
     # Reload entry if configuration has changed
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
-@functools.lru_cache(maxsize=1)
-def get_we_connect_api(username: str, password: str) -> weconnect.WeConnect:
-    """Return a cached weconnect api object, shared with the config flow."""
-    return weconnect.WeConnect(
-        username=username,
-        password=password,
-        updateAfterLogin=False,
-        loginOnInit=False,
-        timeout=10,
-        updatePictures=False,
-    )
+# Accounts by username and password, so that every config entry (and the
+# config flow) keeps its own logged in api object instead of evicting the one
+# of another account. Config entries of the same account share it.
+_accounts: dict[tuple[str, str], WeConnectAccount] = {}
+
+
+def get_account(
+    username: str, password: str, entry_id: str | None = None
+) -> WeConnectAccount:
+    """Return the account of a user, shared with the config flow.
+
+    A config entry holds the account until it releases it.
+    """
+    account = _accounts.get((username, password))
+    if account is None:
+        account = WeConnectAccount(
+            weconnect.WeConnect(
+                username=username,
+                password=password,
+                updateAfterLogin=False,
+                loginOnInit=False,
+                timeout=10,
+                updatePictures=False,
+            )
+        )
+        _accounts[(username, password)] = account
+    if entry_id is not None:
+        account.entry_ids.add(entry_id)
+    return account
+
+
+def release_account(account: WeConnectAccount, entry_id: str) -> None:
+    """Release the account of a config entry.
+
+    The account is forgotten once no config entry holds it, so the next
+    setup starts afresh.
+    """
+    account.entry_ids.discard(entry_id)
+    key = (account.api.username, account.api.password)
+    if not account.entry_ids and _accounts.get(key) is account:
+        del _accounts[key]
 
 
-_last_successful_api_update_timestamp: float = 0.0
-_last_we_connect_api: weconnect.WeConnect | None = None
-_update_lock = threading.Lock()
+def supported_vehicles(api: weconnect.WeConnect) -> dict[str, Vehicle]:
+    """Return the vehicles of the api that the integration supports by VIN."""
+    return {
+        vin: vehicle
+        for vin, vehicle in api.vehicles.items()
+        if vehicle.model.value in SUPPORTED_VEHICLES
+    }
 
 
 def update(
-    api: weconnect.WeConnect
-) -> None:
+    account: WeConnectAccount,
+    vins: list[str] | None = None,
+    prefetched: bool = False,
+    selective: list[Domain] | None = None,
+    refresh_list: bool = False,
+    failed: Collection[str] = (),
+) -> dict[str, Exception]:
     """API call to update vehicle information.
 
-    This function is called on its own thread and it is possible for multiple
-    threads to call it at the same time, before an earlier weconnect update()
-    call has finished. When the integration is loaded, multiple platforms
-    (binary_sensor, number...) may each call async_config_entry_first_refresh()
-    that in turn calls hass.async_add_executor_job() that creates a thread.
+    When vins is given only the status of those vehicles is refreshed, otherwise
+    the vehicle list and the status of every vehicle is fetched. With
+    refresh_list the vehicle list is fetched too, along with the status of the
+    vehicles of vins and of the vehicles that are new. When selective is given
+    only those domains are refreshed. When prefetched is set the responses
+    were already fetched by the AsyncWeConnectBackend and are only parsed from
+    the weconnect cache, the vehicles of failed could not be fetched and keep
+    their last data.
+
+    A vehicle that fails does not stop the others from updating, the errors
+    are returned by VIN.
+
+    This function is called on its own thread. Refreshes of a config entry
+    share a single fetch in the coordinator, but the config flow may update
+    the same account at the same time. Every account has its own lock, so
+    different accounts update in parallel.
     """
-    # pylint: disable=global-statement
-    global _last_successful_api_update_timestamp, _last_we_connect_api
+    api = account.api
+    errors: dict[str, Exception] = {}
 
     # Acquire a lock so that only one thread can call api.update() at a time.
-    with _update_lock:
-        # Skip the update() call altogether if it was last succesfully called
-        # in the past 24 seconds (80% of the minimum update interval of 30s).
-        elapsed = time.monotonic() - _last_successful_api_update_timestamp
-        if elapsed <= 24 and api is _last_we_connect_api:
-            return
-        api.update(updatePictures=False)
-        _last_successful_api_update_timestamp = time.monotonic()
-        _last_we_connect_api = api
-
-
-def start_stop_charging(
-    call_data_vin, api: weconnect.WeConnect, operation: str
+    with account.lock:
+        if prefetched:
+            api.maxAge = CACHE_MAX_AGE_SECONDS
+        try:
+            if vins is None or refresh_list:
+                return _update_vehicle_list(api, vins, selective, failed)
+
+            for vin in vins:
+                if vin not in api.vehicles or vin in failed:
+                    continue
+                try:
+                    api.vehicles[vin].update(updatePictures=False, selective=selective)
+                except Exception as exc:  # pylint: disable=broad-except
+                    errors[vin] = exc
+        finally:
+            api.maxAge = None
+    return errors
+
+
+def _update_vehicle_list(
+    api: weconnect.WeConnect,
+    vins: list[str] | None,
+    selective: list[Domain] | None,
+    failed: Collection[str],
+) -> dict[str, Exception]:
+    """Update the vehicle list and then its vehicles one by one.
+
+    Unlike WeConnect.update a vehicle that fails does not fail the others.
+    Only the vehicles of vins and the new ones are updated when vins is given,
+    the others and the vehicles of failed keep their last data, because
+    weconnect would fetch them again when their response is not in its cache.
+    """
+    errors: dict[str, Exception] = {}
+    url = f"{API_BASE_URL}/vehicle/v1/vehicles"
+    data = api.fetchData(url)
+    if not data or not data.get("data"):
+        return errors
+
+    listed = []
+    for vehicle_dict in data["data"]:
+        if "vin" not in vehicle_dict:
+            break
+        vin = vehicle_dict["vin"]
+        listed.append(vin)
+        if vin in failed or (
+            vins is not None and vin not in vins and vin in api.vehicles
+        ):
+            continue
+        try:
+            if vin in api.vehicles:
+                api.vehicles[vin].update(
+                    fromDict=vehicle_dict, updatePictures=False, selective=selective
+                )
+            else:
+                api.vehicles[vin] = Vehicle(
+                    weConnect=api,
+                    vin=vin,
+                    parent=api.vehicles,
+                    fromDict=vehicle_dict,
+                    fixAPI=api.fixAPI,
+                    updatePictures=False,
+                    selective=selective,
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            errors[vin] = exc
+    for vin in [vin for vin in api.vehicles if vin not in listed]:
+        del api.vehicles[vin]
+
+    api.cache[url] = (data, str(datetime.utcnow()))
+    api.updateComplete()
+    return errors
+
+
+async def async_start_stop_charging(
+    commands: CommandQueue, call_data_vin: str, operation: str
 ) -> bool:
     """Start of stop charging of your volkswagen."""
 
-    for vin, vehicle in api.vehicles.items():
-        if vin == call_data_vin:
-
-            if operation == "start":
-                try:
-                    if (
-                        vehicle.controls.chargingControl is not None
-                        and vehicle.controls.chargingControl.enabled
-                    ):
-                        vehicle.controls.chargingControl.value = ControlOperation.START
-                        _LOGGER.info("Sended start charging call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-
-            if operation == "stop":
-                try:
-                    if (
-                        vehicle.controls.chargingControl is not None
-                        and vehicle.controls.chargingControl.enabled
-                    ):
-                        vehicle.controls.chargingControl.value = ControlOperation.STOP
-                        _LOGGER.info("Sended stop charging call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-    return True
+    if operation == "start":
+        control = commands.async_control(
+            call_data_vin,
+            "chargingControl",
+            ControlOperation.START,
+            Domain.CHARGING,
+            {"chargingState": "charging"},
+        )
+    elif operation == "stop":
+        control = commands.async_control(
+            call_data_vin,
+            "chargingControl",
+            ControlOperation.STOP,
+            Domain.CHARGING,
+            {"chargingState": "readyForCharging"},
+        )
+    else:
+        return True
+    return await control
 
 
-def set_ac_charging_speed(
-    call_data_vin, api: weconnect.WeConnect, charging_speed
+async def async_set_ac_charging_speed(
+    commands: CommandQueue, call_data_vin: str, charging_speed
 ) -> bool:
     """Set charging speed in your volkswagen."""
 
-    for vin, vehicle in api.vehicles.items():
-        if vin == call_data_vin:
-            if (
-                charging_speed
-                != vehicle.domains["charging"][
-                    "chargingSettings"
-                ].maxChargeCurrentAC.value
-            ):
-                try:
-                    vehicle.domains["charging"][
-                        "chargingSettings"
-                    ].maxChargeCurrentAC.value = charging_speed
-                    _LOGGER.info("Sended charging speed call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-
-    return True
+    return await commands.async_set_setting(
+        call_data_vin,
+        "charging",
+        "chargingSettings",
+        "maxChargeCurrentAC",
+        charging_speed,
+        {"maxChargeCurrentAC": charging_speed},
+    )
 
 
-def set_target_soc(call_data_vin, api: weconnect.WeConnect, target_soc: int) -> bool:
+async def async_set_target_soc(
+    commands: CommandQueue, call_data_vin: str, target_soc: int
+) -> bool:
     """Set target SOC in your volkswagen."""
 
     target_soc = int(target_soc)
-
-    for vin, vehicle in api.vehicles.items():
-        if vin == call_data_vin:
-            if (
-                target_soc > 10
-                and target_soc
-                != vehicle.domains["charging"]["chargingSettings"].targetSOC_pct.value
-            ):
-                try:
-                    vehicle.domains["charging"][
-                        "chargingSettings"
-                    ].targetSOC_pct.value = target_soc
-                    _LOGGER.info("Sended target SoC call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-    return True
+    if target_soc <= 10:
+        return True
+
+    return await commands.async_set_setting(
+        call_data_vin,
+        "charging",
+        "chargingSettings",
+        "targetSOC_pct",
+        target_soc,
+        {"targetSOC_pct": target_soc, "target_state_of_charge": target_soc},
+    )
 
 
-def set_climatisation(
-    call_data_vin, api: weconnect.WeConnect, operation: str, target_temperature: float
+async def async_set_climatisation(
+    commands: CommandQueue,
+    call_data_vin: str,
+    operation: str,
+    target_temperature: float,
 ) -> bool:
-    """Set climate in your volkswagen."""
+    """Set climate in your volkswagen.
 
-    for vin, vehicle in api.vehicles.items():
-        if vin == call_data_vin:
+    The target temperature is written before climatisation starts, so it
+    starts with the new temperature.
+    """
 
-            if (
-                target_temperature > 10
-                and target_temperature
-                != vehicle.domains["climatisation"][
-                    "climatisationSettings"
-                ].targetTemperature_C.value
-            ):
-                try:
-                    vehicle.domains["climatisation"][
-                        "climatisationSettings"
-                    ].targetTemperature_C.value = float(target_temperature)
-                    _LOGGER.info("Sended target temperature call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-
-            if operation == "start":
-                try:
-                    if (
-                        vehicle.controls.climatizationControl is not None
-                        and vehicle.controls.climatizationControl.enabled
-                    ):
-                        vehicle.controls.climatizationControl.value = (
-                            ControlOperation.START
-                        )
-                        _LOGGER.info("Sended start climate call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
+    requests = []
+    if target_temperature > 10:
+        requests.append(
+            commands.async_set_setting(
+                call_data_vin,
+                "climatisation",
+                "climatisationSettings",
+                "targetTemperature_C",
+                float(target_temperature),
+                {
+                    "targetTemperature": float(target_temperature),
+                    "target_climate_temperature": float(target_temperature),
+                },
+            )
+        )
 
-            if operation == "stop":
-                try:
-                    if (
-                        vehicle.controls.climatizationControl is not None
-                        and vehicle.controls.climatizationControl.enabled
-                    ):
-                        vehicle.controls.climatizationControl.value = (
-                            ControlOperation.STOP
-                        )
-                        _LOGGER.info("Sended stop climate call to the car")
-                except Exception as exc:
-                    _LOGGER.error("Failed to send request to car - %s", exc)
-                    return False
-    return True
+    # Whether it heats or cools is up to the vehicle, so there is no
+    # expected state when climatisation starts.
+    if operation == "start":
+        requests.append(
+            commands.async_control(
+                call_data_vin,
+                "climatizationControl",
+                ControlOperation.START,
+                Domain.CLIMATISATION,
+            )
+        )
+
+    if operation == "stop":
+        requests.append(
+            commands.async_control(
+                call_data_vin,
+                "climatizationControl",
+                ControlOperation.STOP,
+                Domain.CLIMATISATION,
+                {"climatisationState": "off"},
+            )
+        )
+
+    return all(await asyncio.gather(*requests))
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, hass.data[DOMAIN][entry.entry_id].platforms
+    )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-        get_we_connect_api.cache_clear()
-        global _last_we_connect_api  # pylint: disable=global-statement
-        _last_we_connect_api = None
+        domain_entry: DomainEntry = hass.data[DOMAIN].pop(entry.entry_id)
+        release_account(domain_entry.account, entry.entry_id)
 
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored tokens and vehicle data of a config entry."""
+    await token_store(hass, entry).async_remove()
+    await cache_store(hass, entry.entry_id).async_remove()
+    await _trip_store(hass, entry).async_remove()
+    await charging_store(hass, entry.entry_id).async_remove()
+    await capability_store(hass, entry.entry_id).async_remove()
+    await async_remove_pictures(hass, entry.entry_id)
+
+
+def token_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of the access and refresh tokens of a config entry."""
+    return Store(
+        hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.tokens", private=True
+    )
+
+
+def _trip_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store of the trip import watermarks of a config entry."""
+    from .trip_statistics import trip_store  # pylint: disable=import-outside-toplevel
+
+    return trip_store(hass, entry.entry_id)
+
+
 # Global lock
 volkswagen_we_connect_id_lock = asyncio.Lock()
 
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     # Make sure setup is completed before next unload can be started.
@@ -395,6 +760,7 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
         await async_unload_entry(hass, entry)
         await async_setup_entry(hass, entry)
 
+
 def get_object_value(value) -> str:
     """Get value from object or enum."""
 
@@ -410,16 +776,21 @@ class VolkswagenIDBaseEntity(CoordinatorEntity):
     # _attr_should_poll = False
     _attr_attribution = "Data provided by Volkswagen Connect ID"
 
+    # Domains of the vehicle the entity reads, only those are fetched.
+    required_domains: tuple[Domain, ...] = ()
+    # Key of the value of the entity in the snapshot of its vehicle.
+    snapshot_key: str
+
     def __init__(
         self,
         we_connect: weconnect.WeConnect,
-        coordinator: DataUpdateCoordinator,
-        index: int,
+        coordinator: VolkswagenIDCoordinator,
+        vin: str,
     ) -> None:
         """Initialize sensor."""
         super().__init__(coordinator)
         self.we_connect = we_connect
-        self.index = index
+        self._vin = vin
 
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, f"vw{self.data.vin}")},
@@ -428,7 +799,68 @@ class VolkswagenIDBaseEntity(CoordinatorEntity):
             name=f"Volkswagen {self.data.nickname} ({self.data.vin})",
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Register the domains and the value the entity reads when it is added."""
+        # The listener context tells the coordinator which entity changed.
+        self.coordinator_context = (self._vin, self.snapshot_key)
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_domain_user(self.required_domains)
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_reader(
+                self.snapshot_key, self.read_value, self.required_domains
+            )
+        )
+
+    @abstractmethod
+    def read_value(self, vehicle: Vehicle) -> Any:
+        """Read the value of the entity from a vehicle.
+
+        It runs once per refresh and vehicle for the whole snapshot, it
+        returns None when the vehicle does not report the value.
+        """
+
+    def probe_value(self, vehicle: Vehicle) -> Any:
+        """Read the value to decide whether the vehicle reports it at all.
+
+        The entity is only created when it returns a value other than None.
+        """
+        return self.read_value(vehicle)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the data was saved, while it is restored from disk."""
+        if self.coordinator.restored_at is None:
+            return None
+        return {"restored_data_from": self.coordinator.restored_at.isoformat()}
+
+    @property
+    def snapshot_value(self) -> Any:
+        """Return the value of the entity from the snapshot of its vehicle.
+
+        A value expected after a command is returned until the vehicle
+        reports it.
+        """
+        optimistic = self.coordinator.optimistic_values(self._vin)
+        if self.snapshot_key in optimistic:
+            return optimistic[self.snapshot_key]
+        snapshot = self.coordinator.snapshots.get(self._vin)
+        if snapshot is not None and self.snapshot_key in snapshot:
+            return snapshot[self.snapshot_key]
+        # Entities added since the last refresh are not in the snapshot yet.
+        return self.read_value(self.data)
+
+    @property
+    def available(self) -> bool:
+        """Return True if the vehicle is still in the account and refreshes."""
+        return (
+            super().available
+            and self._vin in self.coordinator.data
+            and self._vin not in self.coordinator.vehicle_errors
+        )
+
     @property
     def data(self):
         """Shortcut to access coordinator data for the entity."""
-        return self.coordinator.data[self.index]
+        return self.coordinator.data[self._vin]
@@ -0,0 +1,456 @@
+"""Asyncio fetch path for the Volkswagen We Connect ID integration.
+
+The weconnect library does blocking requests I/O. This backend fetches the
+same endpoints with Home Assistant's shared aiohttp session and stores the
+responses in the weconnect cache, so the library only has to parse them.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from http import HTTPStatus
+import logging
+import secrets
+import time
+from typing import Any
+
+import aiohttp
+from weconnect import weconnect
+from weconnect.domain import Domain
+from weconnect.elements.trip import Trip
+from weconnect.errors import RetrievalError, TooManyRequestsError
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
+
+from .metrics import PHASE_LOGIN, RefreshMetrics
+from .resilience import CircuitBreaker, parse_retry_after
+
+_LOGGER = logging.getLogger(__name__)
+
+API_BASE_URL = "https://emea.bff.cariad.digital"
+
+REQUEST_TIMEOUT_SECONDS = 10
+
+# Vehicles of an account that are fetched at the same time, and requests of
+# an account that are in flight at the same time.
+MAX_PARALLEL_VEHICLE_FETCHES = 4
+MAX_IN_FLIGHT_REQUESTS = 8
+
+# Maximum age of the fetched responses when weconnect parses them from its cache.
+CACHE_MAX_AGE_SECONDS = 60
+
+# The jobs weconnect requests when updating without a selection of domains.
+DEFAULT_JOBS = [
+    domain.value
+    for domain in Domain
+    if domain not in (Domain.ALL, Domain.ALL_CAPABLE, Domain.PARKING)
+]
+
+# Domains that are not selective status jobs but separate endpoints.
+ENDPOINT_DOMAINS = (Domain.PARKING, Domain.TRIPS)
+
+# Missing parking positions and trips are reported with these status codes.
+OPTIONAL_RESOURCE_STATUSES = (
+    HTTPStatus.NOT_FOUND,
+    HTTPStatus.NO_CONTENT,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.FORBIDDEN,
+)
+
+
+class RateLimitedError(TooManyRequestsError):
+    """Too many requests, with the delay the server asks to wait for."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def rate_limit_error(errors: dict[str, Exception]) -> Exception | None:
+    """Return the error of a vehicle that was rate limited, if any."""
+    return next(
+        (error for error in errors.values() if isinstance(error, TooManyRequestsError)),
+        None,
+    )
+
+
+class AsyncWeConnectBackend:
+    """Fetch vehicle data for a weconnect api object on the event loop."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: weconnect.WeConnect,
+        token_store: Store | None = None,
+        metrics: RefreshMetrics | None = None,
+    ) -> None:
+        """Initialize the backend."""
+        self.hass = hass
+        self.api = api
+        self.metrics = metrics or RefreshMetrics()
+        self._token_lock = asyncio.Lock()
+        self._token_store = token_store
+        self._saved_token: dict[str, Any] | None = None
+        self._vehicle_slots = asyncio.Semaphore(MAX_PARALLEL_VEHICLE_FETCHES)
+        self._request_slots = asyncio.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+        # How long the last fetch of every vehicle took, in seconds.
+        self.fetch_seconds: dict[str, float] = {}
+        self.breaker = CircuitBreaker()
+
+    async def async_restore_tokens(self) -> None:
+        """Reuse the tokens stored by the previous session of the config entry.
+
+        Nothing is restored when the api is already logged in, e.g. by the
+        config flow, or when the stored tokens belong to another user.
+        """
+        if self._token_store is None or self.api.session.authorized:
+            return
+
+        data = await self._token_store.async_load()
+        if not data or data.get("username") != self.api.username:
+            return
+
+        _LOGGER.debug("Reusing the tokens of the previous session")
+        self.api.session.token = dict(data["token"])
+        self.api.session.metadata = dict(data.get("metadata") or {})
+        self._saved_token = data["token"]
+
+    async def async_save_tokens(self) -> None:
+        """Store the tokens of the api when they changed since the last save.
+
+        weconnect also refreshes the tokens by itself while it updates.
+        """
+        token = self.api.session.token
+        if self._token_store is None or not token or token == self._saved_token:
+            return
+
+        self._saved_token = dict(token)
+        await self._token_store.async_save(
+            {
+                "username": self.api.username,
+                "token": self._saved_token,
+                "metadata": dict(self.api.session.metadata),
+            }
+        )
+
+    async def async_login(self) -> None:
+        """Make sure the api has a valid access token.
+
+        The VW login is a web form flow that only the weconnect library
+        implements, it runs in the executor and only when there is no token.
+        An expired token is refreshed instead.
+        """
+        session = self.api.session
+        async with self._token_lock:
+            if session.authorized and not session.expired:
+                return
+            with self.metrics.span(PHASE_LOGIN):
+                await self._async_renew_tokens()
+
+    async def _async_renew_tokens(self) -> None:
+        """Refresh the tokens, or log in when that fails, and store them."""
+        session = self.api.session
+        if session.refreshToken is not None:
+            try:
+                await self.hass.async_add_executor_job(session.refresh)
+            except Exception as exc:  # pylint: disable=broad-except
+                _LOGGER.debug("Refreshing tokens failed, logging in - %s", exc)
+            else:
+                await self.async_save_tokens()
+                return
+        await self.hass.async_add_executor_job(self.api.login)
+        await self.async_save_tokens()
+
+    async def async_fetch(
+        self,
+        vins: list[str] | None = None,
+        selective: list[Domain] | None = None,
+        refresh_list: bool = False,
+        record_success: bool = True,
+    ) -> dict[str, Exception]:
+        """Fetch the vehicle list and the status of the vehicles into the cache.
+
+        When vins is given the vehicle list is not fetched and only the status
+        of those vehicles is. When selective is given only those domains are.
+        With refresh_list the vehicle list is fetched too, along with the
+        status of the vehicles of vins and of the vehicles that are new.
+
+        The vehicles are fetched in parallel and a vehicle that fails does not
+        fail the others, the errors are returned by VIN. It only raises when
+        the vehicle list or every vehicle failed, or while the circuit breaker
+        is open. Without record_success the caller records the success on the
+        circuit breaker once it parsed the responses.
+        """
+        self.breaker.check()
+        try:
+            errors = await self._async_fetch(vins, selective, refresh_list)
+        except Exception as exc:
+            self.breaker.record_failure(exc, getattr(exc, "retry_after", None))
+            raise
+
+        # A rate limit applies to the whole account, not just one vehicle.
+        rate_limit = rate_limit_error(errors)
+        if rate_limit is not None:
+            self.breaker.record_failure(
+                rate_limit, getattr(rate_limit, "retry_after", None)
+            )
+        elif record_success:
+            self.breaker.record_success()
+        return errors
+
+    async def _async_fetch(
+        self,
+        vins: list[str] | None,
+        selective: list[Domain] | None,
+        refresh_list: bool,
+    ) -> dict[str, Exception]:
+        """Fetch the vehicles, see async_fetch."""
+        await self.async_login()
+
+        vehicle_dicts: dict[str, dict[str, Any]] = {}
+        if vins is None or refresh_list:
+            data = await self._async_get(f"{API_BASE_URL}/vehicle/v1/vehicles")
+            for vehicle_dict in (data or {}).get("data") or []:
+                if "vin" not in vehicle_dict:
+                    break
+                vehicle_dicts[vehicle_dict["vin"]] = vehicle_dict
+        if vins is None:
+            vins = list(vehicle_dicts)
+        elif refresh_list:
+            vins = [
+                *vins,
+                *(vin for vin in vehicle_dicts if vin not in self.api.vehicles),
+            ]
+
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_timed(vin, vehicle_dicts.get(vin), selective)
+                for vin in vins
+            ),
+            return_exceptions=True,
+        )
+
+        errors: dict[str, Exception] = {}
+        for vin, result in zip(vins, results):
+            if isinstance(result, Exception):
+                errors[vin] = result
+            elif isinstance(result, BaseException):
+                raise result
+        if errors and len(errors) == len(vins):
+            raise next(iter(errors.values()))
+        return errors
+
+    async def _async_fetch_timed(
+        self,
+        vin: str,
+        vehicle_dict: dict[str, Any] | None,
+        selective: list[Domain] | None,
+    ) -> None:
+        """Fetch a vehicle once a slot is free and record how long it took."""
+        async with self._vehicle_slots:
+            start = time.monotonic()
+            try:
+                await self._async_fetch_vehicle(vin, vehicle_dict, selective)
+            finally:
+                self.fetch_seconds[vin] = time.monotonic() - start
+                _LOGGER.debug("Fetching %s took %.2fs", vin, self.fetch_seconds[vin])
+
+    async def _async_fetch_vehicle(
+        self,
+        vin: str,
+        vehicle_dict: dict[str, Any] | None,
+        selective: list[Domain] | None,
+    ) -> None:
+        """Fetch the status, parking position and trips of a vehicle."""
+        status_url = f"{API_BASE_URL}/vehicle/v1/vehicles/{vin}/selectivestatus?jobs="
+        if selective is None:
+            await self._async_get(status_url + ",".join(DEFAULT_JOBS))
+        else:
+            # weconnect puts every selected domain into the jobs of its url, the
+            # response is stored under that url but the endpoint domains are
+            # fetched from their own endpoints only.
+            jobs = [domain.value for domain in selective]
+            await self._async_get(
+                status_url
+                + ",".join(
+                    domain.value
+                    for domain in selective
+                    if domain not in ENDPOINT_DOMAINS
+                ),
+                cache_url=status_url + ",".join(jobs),
+            )
+
+        urls = []
+        if (
+            selective is None or Domain.PARKING in selective
+        ) and self._wants_parking_position(vin, vehicle_dict):
+            urls.append(f"{API_BASE_URL}/vehicle/v1/vehicles/{vin}/parkingposition")
+        if selective is None or Domain.TRIPS in selective:
+            for trip_type in Trip.TripType:
+                if trip_type != Trip.TripType.UNKNOWN:
+                    urls.append(
+                        f"{API_BASE_URL}/vehicle/v1/trips/{vin}"
+                        f"/{trip_type.value.lower()}/last"
+                    )
+
+        await asyncio.gather(
+            *(
+                self._async_get(url, allowed_errors=OPTIONAL_RESOURCE_STATUSES)
+                for url in urls
+            )
+        )
+
+    def _wants_parking_position(
+        self, vin: str, vehicle_dict: dict[str, Any] | None
+    ) -> bool:
+        """Return True if weconnect will read the parking position of a vehicle.
+
+        weconnect only fetches it when the parkingPosition capability has no
+        status, i.e. when it is not restricted.
+        """
+        if vehicle_dict is not None:
+            return any(
+                capability.get("id") == "parkingPosition" and "status" not in capability
+                for capability in vehicle_dict.get("capabilities") or []
+            )
+        if vin in self.api.vehicles:
+            capabilities = self.api.vehicles[vin].capabilities
+            return (
+                "parkingPosition" in capabilities
+                and capabilities["parkingPosition"].status.value is None
+            )
+        return False
+
+    async def async_fetch_trips(
+        self, vin: str, trip_type: Trip.TripType, start: datetime
+    ) -> list[dict[str, Any]]:
+        """Fetch the trips of a type a vehicle ended since a point in time.
+
+        weconnect only reads the last trip of every type, the history is not
+        stored in its cache.
+        """
+        self.breaker.check()
+        data = await self._async_get(
+            f"{API_BASE_URL}/vehicle/v1/trips/{vin}/{trip_type.value.lower()}"
+            f"?from={start.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+            allowed_errors=OPTIONAL_RESOURCE_STATUSES,
+            cache_url="",
+        )
+        if not data or not isinstance(data.get("data"), list):
+            return []
+        return data["data"]
+
+    async def async_fetch_picture(
+        self, vin: str, picture_id: str
+    ) -> tuple[bytes, str] | None:
+        """Fetch a picture of a vehicle and its content type.
+
+        Returns None when the vehicle has no picture with that id.
+        """
+        self.breaker.check()
+        data = await self._async_get(
+            f"{API_BASE_URL}/media/v2/vehicle-images/{vin}?resolution=2x",
+            allowed_errors=OPTIONAL_RESOURCE_STATUSES,
+            cache_url="",
+        )
+        url = next(
+            (
+                image.get("url")
+                for image in (data or {}).get("data") or []
+                if image.get("id") == picture_id
+            ),
+            None,
+        )
+        if url is None:
+            return None
+
+        websession = async_get_clientsession(self.hass)
+        async with self._request_slots, websession.get(
+            url,
+            # The pictures may be served by another host than the API.
+            headers=self._headers() if url.startswith(API_BASE_URL) else None,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+        ) as response:
+            body = await response.read()
+            self.metrics.record_response(len(body))
+            if response.status != HTTPStatus.OK:
+                raise RetrievalError(
+                    f"Could not fetch vehicle picture. Status Code was: {response.status}"
+                )
+            return body, response.content_type
+
+    async def _async_get(
+        self,
+        url: str,
+        allowed_errors: tuple[HTTPStatus, ...] = (),
+        cache_url: str | None = None,
+    ) -> dict[str, Any] | None:
+        """Fetch a json document and store it in the weconnect cache.
+
+        The document is stored under cache_url when weconnect reads it from a
+        different url than the one it is fetched from, and not at all when
+        cache_url is empty.
+        """
+        cache_url = url if cache_url is None else cache_url
+        websession = async_get_clientsession(self.hass)
+        for attempt in range(2):
+            access_token = self.api.session.accessToken
+            async with self._request_slots, websession.get(
+                url,
+                headers=self._headers(),
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                body = await response.read()
+                self.metrics.record_response(len(body))
+                if response.status in (HTTPStatus.OK, HTTPStatus.MULTI_STATUS):
+                    data = json_loads(body) if body.strip() else None
+                    if cache_url:
+                        self.api.cache[cache_url] = (data, str(datetime.utcnow()))
+                    return data
+                if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                    raise RateLimitedError(
+                        "Could not fetch data due to too many requests from your account",
+                        parse_retry_after(response.headers.get("Retry-After")),
+                    )
+                if response.status == HTTPStatus.UNAUTHORIZED and attempt == 0:
+                    await self._async_reauthorize(access_token)
+                    continue
+                if response.status in allowed_errors:
+                    # An empty document tells weconnect the resource is missing
+                    # without it fetching the url again.
+                    if cache_url:
+                        self.api.cache[cache_url] = ({}, str(datetime.utcnow()))
+                    return None
+                raise RetrievalError(
+                    f"Could not fetch data. Status Code was: {response.status}"
+                )
+        return None
+
+    async def _async_reauthorize(self, access_token: str | None) -> None:
+        """Renew the tokens after the server rejected an access token.
+
+        Requests fetched in parallel are rejected together, only the first
+        one renews the tokens, the others retry with the renewed token.
+        """
+        async with self._token_lock:
+            if self.api.session.accessToken != access_token:
+                return
+            _LOGGER.info("Server asks for new authorization")
+            with self.metrics.span(PHASE_LOGIN):
+                await self._async_renew_tokens()
+
+    def _headers(self) -> dict[str, str]:
+        """Return the headers weconnect sends, with the current access token."""
+        trace_id = secrets.token_hex(16).upper()
+        headers = dict(self.api.session.headers)
+        headers["authorization"] = f"Bearer {self.api.session.accessToken}"
+        headers["weconnect-trace-id"] = (
+            f"{trace_id[:8]}-{trace_id[8:12]}-{trace_id[12:16]}"
+            f"-{trace_id[16:20]}-{trace_id[20:]}"
+        )
+        return headers
@@ -5,7 +5,8 @@ from collections.abc import Callable
 from dataclasses import dataclass
 
 from weconnect import weconnect
-from weconnect.elements.plug_status import PlugStatus
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
 from weconnect.elements.lights_status import LightsStatus
 from weconnect.elements.window_heating_status import WindowHeatingStatus
 
@@ -15,12 +16,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import DomainEntry, VolkswagenIDBaseEntity
 from .const import DOMAIN
+from .snapshot import reported_element, reported_status
 
 
 @dataclass
@@ -30,6 +33,9 @@ class VolkswagenIdBinaryEntityDescription(BinarySensorEntityDescription):
     value: Callable = lambda x, y: x
     on_value: object | None = None
     enabled: Callable = lambda x, y: x
+    domain: Domain | None = None
+    # The status of the domain the value is read from.
+    status: str | None = None
 
 
 SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
@@ -37,6 +43,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="climatisationWithoutExternalPower",
         name="Climatisation Without External Power",
         icon="mdi:fan",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].climatisationWithoutExternalPower,
@@ -45,6 +53,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="climatizationAtUnlock",
         name="Climatisation At Unlock",
         icon="mdi:fan",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].climatizationAtUnlock,
@@ -53,6 +63,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="zoneFrontLeftEnabled",
         name="Zone Front Left Enabled",
         icon="mdi:car-seat",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].zoneFrontLeftEnabled,
@@ -61,6 +73,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="zoneFrontRightEnabled",
         name="Zone Front Right Enabled",
         icon="mdi:car-seat",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].zoneFrontRightEnabled,
@@ -69,6 +83,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="windowHeatingEnabled",
         name="Window Heating Enabled",
         icon="mdi:car-defrost-front",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].windowHeatingEnabled,
@@ -77,24 +93,34 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         key="frontWindowHeatingState",
         name="Front Window Heating State",
         icon="mdi:car-defrost-front",
-        value=lambda data: data["climatisation"]["windowHeatingStatus"]
-        .windows["front"]
-        .windowHeatingState,
+        domain=Domain.CLIMATISATION,
+        status="windowHeatingStatus",
+        value=lambda data: reported_element(
+            data["climatisation"]["windowHeatingStatus"].windows,
+            "front",
+            "windowHeatingState",
+        ),
         on_value=WindowHeatingStatus.Window.WindowHeatingState.ON,
     ),
     VolkswagenIdBinaryEntityDescription(
         key="rearWindowHeatingState",
         name="Rear Window Heating State",
         icon="mdi:car-defrost-rear",
-        value=lambda data: data["climatisation"]["windowHeatingStatus"]
-        .windows["rear"]
-        .windowHeatingState,
+        domain=Domain.CLIMATISATION,
+        status="windowHeatingStatus",
+        value=lambda data: reported_element(
+            data["climatisation"]["windowHeatingStatus"].windows,
+            "rear",
+            "windowHeatingState",
+        ),
         on_value=WindowHeatingStatus.Window.WindowHeatingState.ON,
     ),
     VolkswagenIdBinaryEntityDescription(
         key="insufficientBatteryLevelWarning",
         name="Insufficient Battery Level Warning",
         icon="mdi:battery-alert-variant-outline",
+        domain=Domain.READINESS,
+        status="readinessStatus",
         value=lambda data: data["readiness"][
             "readinessStatus"
         ].connectionWarning.insufficientBatteryLevelWarning,
@@ -102,6 +128,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
     VolkswagenIdBinaryEntityDescription(
         name="Car Is Online",
         key="isOnline",
+        domain=Domain.READINESS,
+        status="readinessStatus",
         value=lambda data: data["readiness"][
             "readinessStatus"
         ].connectionState.isOnline,
@@ -111,6 +139,8 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         name="Car Is Active",
         key="isActive",
         icon="mdi:car-side",
+        domain=Domain.READINESS,
+        status="readinessStatus",
         value=lambda data: data["readiness"][
             "readinessStatus"
         ].connectionState.isActive,
@@ -119,14 +149,22 @@ SENSORS: tuple[VolkswagenIdBinaryEntityDescription, ...] = (
         name="Lights Right",
         key="lightsRight",
         icon="mdi:car-light-dimmed",
-        value=lambda data: data["vehicleLights"]["lightsStatus"].lights["right"].status,
+        domain=Domain.VEHICLE_LIGHTS,
+        status="lightsStatus",
+        value=lambda data: reported_element(
+            data["vehicleLights"]["lightsStatus"].lights, "right", "status"
+        ),
         on_value=LightsStatus.Light.LightState.ON,
     ),
     VolkswagenIdBinaryEntityDescription(
         name="Lights Left",
         key="lightsLeft",
         icon="mdi:car-light-dimmed",
-        value=lambda data: data["vehicleLights"]["lightsStatus"].lights["left"].status,
+        domain=Domain.VEHICLE_LIGHTS,
+        status="lightsStatus",
+        value=lambda data: reported_element(
+            data["vehicleLights"]["lightsStatus"].lights, "left", "status"
+        ),
         on_value=LightsStatus.Light.LightState.ON,
     ),
 )
@@ -142,14 +180,20 @@ async def async_setup_entry(
     we_connect = domain_entry.we_connect
     coordinator = domain_entry.coordinator
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
-
     entities: list[VolkswagenIDSensor] = []
 
-    for index, vehicle in enumerate(coordinator.data):
-        for sensor in SENSORS:
-            entities.append(VolkswagenIDSensor(sensor, we_connect, coordinator, index))
+    for vin in coordinator.data:
+        entities.extend(
+            domain_entry.capabilities.async_supported_entities(
+                Platform.BINARY_SENSOR,
+                coordinator,
+                vin,
+                [
+                    VolkswagenIDSensor(sensor, we_connect, coordinator, vin)
+                    for sensor in SENSORS
+                ],
+            )
+        )
     if entities:
         async_add_entities(entities)
 
@@ -164,25 +208,42 @@ class VolkswagenIDSensor(VolkswagenIDBaseEntity, BinarySensorEntity):
         sensor: VolkswagenIdBinaryEntityDescription,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin)
 
         self.entity_description = sensor
+        self.required_domains = (sensor.domain,)
+        self.snapshot_key = sensor.key
         self._coordinator = coordinator
         self._attr_name = f"{self.data.nickname} {sensor.name}"
         self._attr_unique_id = f"{self.data.vin}-{sensor.key}"
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if sensor is on."""
-        try:
-            state = self.entity_description.value(self.data.domains)
-            if state.enabled and isinstance(state.value, bool):
-                return state.value
+    def read_value(self, vehicle: Vehicle) -> bool:
+        """Read whether the sensor is on from a vehicle."""
+        state = self._state(vehicle)
+        if state is not None and isinstance(state.value, bool):
+            return state.value
+
+        return False
 
-            return False
+    def probe_value(self, vehicle: Vehicle) -> object | None:
+        """Read the raw value, None when the vehicle does not report it."""
+        state = self._state(vehicle)
+        return None if state is None else state.value
 
-        except KeyError:
+    def _state(self, vehicle: Vehicle):
+        """Return the attribute of the sensor, None when it is not reported."""
+        sensor = self.entity_description
+        if reported_status(vehicle.domains, sensor.domain.value, sensor.status) is None:
             return None
+        state = sensor.value(vehicle.domains)
+        if state is None or not state.enabled:
+            return None
+        return state
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if sensor is on."""
+        return self.snapshot_value
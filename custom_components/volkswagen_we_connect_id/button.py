@@ -1,5 +1,4 @@
 """Button integration."""
-from weconnect import weconnect
 from weconnect.elements.vehicle import Vehicle
 
 from homeassistant.components.button import ButtonEntity
@@ -9,11 +8,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import (
     DomainEntry,
+    async_set_ac_charging_speed,
+    async_set_climatisation,
+    async_start_stop_charging,
     get_object_value,
-    set_ac_charging_speed,
-    set_climatisation,
-    start_stop_charging,
 )
+from .commands import CommandQueue
 from .const import DOMAIN
 
 
@@ -24,16 +24,16 @@ async def async_setup_entry(
 ) -> bool:
     """Add buttons for passed config_entry in HA."""
     domain_entry: DomainEntry = hass.data[DOMAIN][config_entry.entry_id]
-    we_connect = domain_entry.we_connect
+    commands = domain_entry.commands
     vehicles = domain_entry.vehicles
 
     entities = []
-    for vehicle in vehicles:  # weConnect.vehicles.items():
-        entities.append(VolkswagenIDStartClimateButton(vehicle, we_connect))
-        entities.append(VolkswagenIDStopClimateButton(vehicle, we_connect))
-        entities.append(VolkswagenIDToggleACChargeSpeed(vehicle, we_connect))
-        entities.append(VolkswagenIDStartChargingButton(vehicle, we_connect))
-        entities.append(VolkswagenIDStopChargingButton(vehicle, we_connect))
+    for vehicle in vehicles.values():
+        entities.append(VolkswagenIDStartClimateButton(vehicle, commands))
+        entities.append(VolkswagenIDStopClimateButton(vehicle, commands))
+        entities.append(VolkswagenIDToggleACChargeSpeed(vehicle, commands))
+        entities.append(VolkswagenIDStartChargingButton(vehicle, commands))
+        entities.append(VolkswagenIDStopChargingButton(vehicle, commands))
 
     async_add_entities(entities)
 
@@ -43,47 +43,51 @@ async def async_setup_entry(
 class VolkswagenIDStartClimateButton(ButtonEntity):
     """Button for starting climate."""
 
-    def __init__(self, vehicle, we_connect) -> None:
+    def __init__(self, vehicle, commands: CommandQueue) -> None:
         """Initialize VolkswagenID vehicle sensor."""
         self._attr_name = f"{vehicle.nickname} Start Climate"
         self._attr_unique_id = f"{vehicle.vin}-start_climate"
         self._attr_icon = "mdi:fan-plus"
-        self._we_connect = we_connect
+        self._commands = commands
         self._vehicle = vehicle
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Handle the button press."""
-        set_climatisation(self._vehicle.vin.value, self._we_connect, "start", 0)
+        await async_set_climatisation(
+            self._commands, self._vehicle.vin.value, "start", 0
+        )
 
 
 class VolkswagenIDStopClimateButton(ButtonEntity):
     """Button for stopping climate."""
 
-    def __init__(self, vehicle, we_connect) -> None:
+    def __init__(self, vehicle, commands: CommandQueue) -> None:
         """Initialize VolkswagenID vehicle sensor."""
         self._attr_name = f"{vehicle.nickname} Stop Climate"
         self._attr_unique_id = f"{vehicle.vin}-stop_climate"
         self._attr_icon = "mdi:fan-off"
-        self._we_connect = we_connect
+        self._commands = commands
         self._vehicle = vehicle
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Handle the button press."""
-        set_climatisation(self._vehicle.vin.value, self._we_connect, "stop", 0)
+        await async_set_climatisation(
+            self._commands, self._vehicle.vin.value, "stop", 0
+        )
 
 
 class VolkswagenIDToggleACChargeSpeed(ButtonEntity):
     """Button for toggling the charge speed."""
 
-    def __init__(self, vehicle: Vehicle, we_connect: weconnect.WeConnect) -> None:
+    def __init__(self, vehicle: Vehicle, commands: CommandQueue) -> None:
         """Initialize VolkswagenID vehicle sensor."""
         self._attr_name = f"{vehicle.nickname} Toggle AC Charge Speed"
         self._attr_unique_id = f"{vehicle.vin}-toggle_ac_charge_speed"
         self._attr_icon = "mdi:ev-station"
-        self._we_connect = we_connect
+        self._commands = commands
         self._vehicle = vehicle
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Handle the button press."""
 
         current_state = get_object_value(
@@ -91,15 +95,15 @@ class VolkswagenIDToggleACChargeSpeed(ButtonEntity):
         )
 
         if current_state == "maximum":
-            set_ac_charging_speed(
+            await async_set_ac_charging_speed(
+                self._commands,
                 self._vehicle.vin.value,
-                self._we_connect,
                 "reduced",
             )
         else:
-            set_ac_charging_speed(
+            await async_set_ac_charging_speed(
+                self._commands,
                 self._vehicle.vin.value,
-                self._we_connect,
                 "maximum",
             )
 
@@ -107,30 +111,32 @@ class VolkswagenIDToggleACChargeSpeed(ButtonEntity):
 class VolkswagenIDStartChargingButton(ButtonEntity):
     """Button for start charging."""
 
-    def __init__(self, vehicle, we_connect) -> None:
+    def __init__(self, vehicle, commands: CommandQueue) -> None:
         """Initialize VolkswagenID vehicle sensor."""
         self._attr_name = f"{vehicle.nickname} Start Charging"
         self._attr_unique_id = f"{vehicle.vin}-start_charging"
         self._attr_icon = "mdi:play-circle-outline"
-        self._we_connect = we_connect
+        self._commands = commands
         self._vehicle = vehicle
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Handle the button press."""
-        start_stop_charging(self._vehicle.vin.value, self._we_connect, "start")
+        await async_start_stop_charging(
+            self._commands, self._vehicle.vin.value, "start"
+        )
 
 
 class VolkswagenIDStopChargingButton(ButtonEntity):
     """Button for stop charging."""
 
-    def __init__(self, vehicle, we_connect) -> None:
+    def __init__(self, vehicle, commands: CommandQueue) -> None:
         """Initialize VolkswagenID vehicle sensor."""
         self._attr_name = f"{vehicle.nickname} Stop Charging"
         self._attr_unique_id = f"{vehicle.vin}-stop_charging"
         self._attr_icon = "mdi:stop-circle-outline"
-        self._we_connect = we_connect
+        self._commands = commands
         self._vehicle = vehicle
 
-    def press(self) -> None:
+    async def async_press(self) -> None:
         """Handle the button press."""
-        start_stop_charging(self._vehicle.vin.value, self._we_connect, "stop")
+        await async_start_stop_charging(self._commands, self._vehicle.vin.value, "stop")
@@ -0,0 +1,187 @@
+"""Which values the vehicles of the Volkswagen We Connect ID integration report.
+
+Not every vehicle reports every value the platforms describe, e.g. an ID.3
+has no fuel consumption or oil inspection. The platforms probe their values
+on the data of each vehicle and only create entities for the values it
+reports, instead of entities that never have a state. The keys a vehicle
+reported once are kept per config entry, so they stay supported after a
+restart while the vehicle does not report them for a while.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+import logging
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CAPABILITY_REMOVE_AFTER_REFRESHES,
+    CAPABILITY_SAVE_DELAY_SECONDS,
+    CAPABILITY_STORAGE_VERSION,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from . import VolkswagenIDBaseEntity
+    from .coordinator import VolkswagenIDCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_EntityT = TypeVar("_EntityT", bound="VolkswagenIDBaseEntity")
+
+
+class CapabilityProbe:
+    """Keys of the values every vehicle of a config entry reports."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the probe, the keys are loaded by async_load."""
+        self.hass = hass
+        self._store = capability_store(hass, entry_id)
+        self._supported: dict[str, set[str]] = {}
+        # Platforms, probes and domains of the keys a vehicle did not report
+        # yet, by VIN and key.
+        self._pending: dict[
+            str,
+            dict[str, tuple[Platform, Callable[[Vehicle], Any], tuple[Domain, ...]]],
+        ] = {}
+        # Vehicle list refreshes in a row without the value, by VIN and key.
+        self._misses: dict[str, dict[str, int]] = {}
+
+    async def async_load(self) -> None:
+        """Load the keys the vehicles reported in earlier sessions."""
+        data = await self._store.async_load() or {}
+        self._supported = {
+            vin: set(keys) for vin, keys in data.get("vehicles", {}).items()
+        }
+        self._misses = {
+            vin: dict(misses) for vin, misses in data.get("misses", {}).items()
+        }
+
+    @callback
+    def async_supported_entities(
+        self,
+        platform: Platform,
+        coordinator: VolkswagenIDCoordinator,
+        vin: str,
+        entities: Iterable[_EntityT],
+    ) -> list[_EntityT]:
+        """Return the entities of a vehicle whose value it reports.
+
+        The probe of an entity returns None when the vehicle does not report
+        its value. Those entities are probed again by async_update. Data
+        restored from disk or of a vehicle that failed to refresh is not
+        probed: the vehicle gets the entities of the keys an earlier session
+        found, or every entity when none was found yet.
+        """
+        live = coordinator.restored_at is None and vin not in coordinator.vehicle_errors
+        if not live and vin not in self._supported:
+            return list(entities)
+
+        vehicle = coordinator.data[vin]
+        supported = self._supported.setdefault(vin, set())
+        pending = self._pending.setdefault(vin, {})
+        found = False
+        result = []
+        for entity in entities:
+            key = entity.snapshot_key
+            if key not in supported:
+                if not live or entity.probe_value(vehicle) is None:
+                    pending[key] = (
+                        platform,
+                        entity.probe_value,
+                        entity.required_domains,
+                    )
+                    continue
+                supported.add(key)
+                self._misses.get(vin, {}).pop(key, None)
+                found = True
+            result.append(entity)
+        if found:
+            self._async_schedule_save()
+        return result
+
+    async def async_update(self, vehicles: Mapping[str, Vehicle]) -> bool:
+        """Probe the keys the refreshed vehicles did not report yet again.
+
+        Returns True when a vehicle reports one of them now, its entity is
+        created when the config entry is set up again. The keys are saved at
+        once, so that setup finds them. An entity an earlier session
+        registered is removed once its value was missing from
+        CAPABILITY_REMOVE_AFTER_REFRESHES refreshes in a row.
+        """
+        found = False
+        missed = False
+        for vin, vehicle in vehicles.items():
+            pending = self._pending.get(vin)
+            if not pending:
+                continue
+            misses = self._misses.setdefault(vin, {})
+            for key, (platform, probe, _) in list(pending.items()):
+                if probe(vehicle) is not None:
+                    _LOGGER.debug("Vehicle %s reports %s now", vin, key)
+                    del pending[key]
+                    misses.pop(key, None)
+                    self._supported[vin].add(key)
+                    found = True
+                    continue
+                if misses.get(key, 0) >= CAPABILITY_REMOVE_AFTER_REFRESHES:
+                    continue
+                misses[key] = misses.get(key, 0) + 1
+                missed = True
+                if misses[key] == CAPABILITY_REMOVE_AFTER_REFRESHES:
+                    _async_remove_entity(self.hass, platform, vin, key)
+        if found:
+            await self._store.async_save(self._data())
+        elif missed:
+            self._async_schedule_save()
+        return found
+
+    def pending_domains(self) -> set[Domain]:
+        """Return the domains of the keys the vehicles did not report yet."""
+        return {
+            domain
+            for pending in self._pending.values()
+            for _, _, domains in pending.values()
+            for domain in domains
+        }
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the supported keys after the delay."""
+        self._store.async_delay_save(self._data, CAPABILITY_SAVE_DELAY_SECONDS)
+
+    def _data(self) -> dict[str, Any]:
+        """Return the supported keys and missed refreshes to save."""
+        return {
+            "vehicles": {vin: sorted(keys) for vin, keys in self._supported.items()},
+            "misses": {vin: misses for vin, misses in self._misses.items() if misses},
+        }
+
+
+@callback
+def _async_remove_entity(
+    hass: HomeAssistant, platform: Platform, vin: str, key: str
+) -> None:
+    """Remove the registered entity of a key a vehicle stopped reporting."""
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id(platform, DOMAIN, f"{vin}-{key}")
+    if entity_id is not None:
+        _LOGGER.info(
+            "Removing %s, vehicle %s did not report it for %d refreshes",
+            entity_id,
+            vin,
+            CAPABILITY_REMOVE_AFTER_REFRESHES,
+        )
+        registry.async_remove(entity_id)
+
+
+def capability_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the supported keys of a config entry."""
+    return Store(hass, CAPABILITY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.capabilities")
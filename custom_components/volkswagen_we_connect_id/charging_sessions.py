@@ -0,0 +1,159 @@
+"""Charging sessions and charged energy for the Volkswagen We Connect ID integration.
+
+The vehicles report their charging power, not the energy they charged. The
+recorder integrates the power over the capture times of the charging status
+with the trapezoidal rule, one step per new status, into a total that only
+increases. A session starts when a plugged in vehicle starts charging and
+ends when it stops or is unplugged. The totals, the running sessions and a
+short log of the finished sessions are saved per config entry.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from weconnect.elements.vehicle import Vehicle
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CHARGING_SAVE_DELAY_SECONDS,
+    CHARGING_STORAGE_VERSION,
+    DOMAIN,
+    MAX_LOGGED_CHARGING_SESSIONS,
+)
+from .scheduler import status_value
+
+
+@dataclass
+class VehicleCharging:
+    """The charged energy of a vehicle and its running session."""
+
+    # Energy charged since the vehicle was first seen, in kWh.
+    energy_kwh: float = 0.0
+    # Capture time and power in kW of the last charging status.
+    sample_at: datetime | None = None
+    power_kw: float = 0.0
+    # Start, total energy and SoC at the start of the running session.
+    session_start: datetime | None = None
+    session_start_energy_kwh: float = 0.0
+    session_start_soc: int | None = None
+
+    @property
+    def session_energy_kwh(self) -> float | None:
+        """Return the energy charged in the running session."""
+        if self.session_start is None:
+            return None
+        return self.energy_kwh - self.session_start_energy_kwh
+
+
+class ChargingSessionRecorder:
+    """Track the charging sessions of the vehicles of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the recorder."""
+        self.vehicles: dict[str, VehicleCharging] = {}
+        # Finished sessions, oldest first: VIN, start and end as timestamps,
+        # energy in kWh and the SoC at start and end.
+        self.sessions: deque[list[Any]] = deque(maxlen=MAX_LOGGED_CHARGING_SESSIONS)
+        self._store = charging_store(hass, entry_id)
+
+    async def async_load(self) -> None:
+        """Restore the totals and sessions of the previous session."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        for vin, charging in data["vehicles"].items():
+            for key in ("sample_at", "session_start"):
+                if charging[key] is not None:
+                    charging[key] = dt_util.parse_datetime(charging[key])
+            self.vehicles[vin] = VehicleCharging(**charging)
+        self.sessions.extend(data["sessions"])
+
+    @callback
+    def async_update(self, vehicles: dict[str, Vehicle]) -> None:
+        """Add the charging status of every vehicle that reported a new one."""
+        changed = False
+        for vin, vehicle in vehicles.items():
+            changed |= self._update(vin, vehicle)
+        if changed:
+            self._store.async_delay_save(
+                self._data_to_save, CHARGING_SAVE_DELAY_SECONDS
+            )
+
+    def _update(self, vin: str, vehicle: Vehicle) -> bool:
+        """Integrate one new charging status, return False when it is not new."""
+        captured = status_value(
+            vehicle, "charging", "chargingStatus", "carCapturedTimestamp"
+        )
+        power = status_value(vehicle, "charging", "chargingStatus", "chargePower_kW")
+        charging = self.vehicles.setdefault(vin, VehicleCharging())
+        if (
+            not isinstance(captured, datetime)
+            or power is None
+            or (charging.sample_at is not None and captured <= charging.sample_at)
+        ):
+            return False
+
+        is_charging = (
+            status_value(vehicle, "charging", "chargingStatus", "chargingState")
+            == "charging"
+            and status_value(vehicle, "charging", "plugStatus", "plugConnectionState")
+            != "disconnected"
+        )
+        power = float(power) if is_charging else 0.0
+
+        if charging.session_start is not None and charging.sample_at is not None:
+            hours = (captured - charging.sample_at).total_seconds() / 3600
+            charging.energy_kwh += (charging.power_kw + power) / 2 * hours
+
+        soc = status_value(vehicle, "charging", "batteryStatus", "currentSOC_pct")
+        if is_charging and charging.session_start is None:
+            charging.session_start = captured
+            charging.session_start_energy_kwh = charging.energy_kwh
+            charging.session_start_soc = soc
+        elif not is_charging and charging.session_start is not None:
+            self.sessions.append(
+                [
+                    vin,
+                    int(charging.session_start.timestamp()),
+                    int(captured.timestamp()),
+                    round(charging.session_energy_kwh or 0.0, 3),
+                    charging.session_start_soc,
+                    soc,
+                ]
+            )
+            charging.session_start = None
+            charging.session_start_soc = None
+
+        charging.sample_at = captured
+        charging.power_kw = power
+        return True
+
+    def energy(self, vin: str) -> float | None:
+        """Return the energy a vehicle charged in kWh, None when unknown."""
+        charging = self.vehicles.get(vin)
+        if charging is None or charging.sample_at is None:
+            return None
+        return round(charging.energy_kwh, 3)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the totals and sessions to save."""
+        vehicles = {}
+        for vin, charging in self.vehicles.items():
+            data = asdict(charging)
+            for key in ("sample_at", "session_start"):
+                if data[key] is not None:
+                    data[key] = data[key].isoformat()
+            vehicles[vin] = data
+        return {"vehicles": vehicles, "sessions": list(self.sessions)}
+
+
+def charging_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the charging sessions of a config entry."""
+    return Store(hass, CHARGING_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.charging")
@@ -0,0 +1,324 @@
+"""Coalescing command queue for the Volkswagen We Connect ID integration.
+
+Settings writes and control operations are queued per vehicle. Everything
+queued within a short window is sent as one batch: all writes to the same
+settings object are merged into a single settings request, which is sent
+before the control operations so these run with the new settings.
+
+While a command is queued its entities show the value it is expected to
+result in. Once sent, only the domains it touched are refreshed for its
+vehicle, a few times until the vehicle reports the expected values.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+import time
+from typing import Any
+
+from weconnect import weconnect
+from weconnect.addressable import AddressableLeaf, AliasChangeableAttribute
+from weconnect.domain import Domain
+from weconnect.elements.control_operation import ControlOperation
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import COMMAND_COALESCE_SECONDS, POST_COMMAND_REFRESH_DELAYS_SECONDS
+from .coordinator import VolkswagenIDCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Command:
+    """A settings write or control operation waiting to be sent."""
+
+    name: str
+    # (domain, status, attribute) of a setting or (control,) of a control.
+    path: tuple[str, ...]
+    value: Any
+    # The domain to refresh after the command and the values expected by key.
+    domain: Domain
+    optimistic: dict[str, Any]
+    future: asyncio.Future[bool]
+    enqueued: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_setting(self) -> bool:
+        """Return True if the command writes a setting."""
+        return len(self.path) == 3
+
+
+class CommandQueue:
+    """Queue the commands of the vehicles of one weconnect api object."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: weconnect.WeConnect,
+        coordinator: VolkswagenIDCoordinator,
+        async_fetch: Callable[[str, list[Domain]], Awaitable[None]],
+    ) -> None:
+        """Initialize the queue.
+
+        async_fetch updates some domains of one vehicle in the api.
+        """
+        self.hass = hass
+        self.api = api
+        self.coordinator = coordinator
+        self._async_fetch = async_fetch
+        self._pending: dict[str, list[Command]] = {}
+        # The batch of every vehicle that is being sent.
+        self._sending: dict[str, list[Command]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # The domains to refresh and the values expected by the commands sent
+        # to every vehicle that is being refreshed.
+        self._refresh_domains: dict[str, set[Domain]] = {}
+        self._refresh_optimistic: dict[str, dict[str, Any]] = {}
+        # Seconds from queueing to done of the last command of every name.
+        self.latencies: dict[str, float] = {}
+
+    @callback
+    def async_set_setting(
+        self,
+        vin: str,
+        domain: str,
+        status: str,
+        attribute: str,
+        value: Any,
+        optimistic: dict[str, Any] | None = None,
+    ) -> asyncio.Future[bool]:
+        """Queue a write of a setting, return a future of its success."""
+        return self._async_enqueue(
+            vin,
+            Command(
+                attribute,
+                (domain, status, attribute),
+                value,
+                Domain(domain),
+                optimistic or {},
+                self.hass.loop.create_future(),
+            ),
+        )
+
+    @callback
+    def async_control(
+        self,
+        vin: str,
+        control: str,
+        operation: ControlOperation,
+        domain: Domain,
+        optimistic: dict[str, Any] | None = None,
+    ) -> asyncio.Future[bool]:
+        """Queue a control operation, return a future of its success."""
+        return self._async_enqueue(
+            vin,
+            Command(
+                f"{control}.{operation.value}",
+                (control,),
+                operation,
+                domain,
+                optimistic or {},
+                self.hass.loop.create_future(),
+            ),
+        )
+
+    @callback
+    def _async_enqueue(self, vin: str, command: Command) -> asyncio.Future[bool]:
+        """Add a command to the queue of a vehicle."""
+        self.coordinator.async_set_optimistic(vin, command.optimistic)
+        if vin not in self._pending:
+            self._pending[vin] = []
+            self.hass.loop.call_later(
+                COMMAND_COALESCE_SECONDS,
+                lambda: self.hass.async_create_task(
+                    self._async_send(vin), f"Send commands to {vin}"
+                ),
+            )
+        self._pending[vin].append(command)
+        return command.future
+
+    async def _async_send(self, vin: str) -> None:
+        """Send the queued commands of a vehicle, one batch at a time."""
+        async with self._locks.setdefault(vin, asyncio.Lock()):
+            commands = self._pending.pop(vin, [])
+            if not commands:
+                return
+            self._sending[vin] = commands
+            try:
+                results = await self.hass.async_add_executor_job(
+                    send_commands, self.api, vin, commands
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to send request to car - %s", exc)
+                results = [False] * len(commands)
+            finally:
+                del self._sending[vin]
+
+        done = time.monotonic()
+        for command, result in zip(commands, results):
+            latency = done - command.enqueued
+            self.latencies[command.name] = latency
+            _LOGGER.debug(
+                "Sent %s to %s in %.2f s (%s)",
+                command.name,
+                vin,
+                latency,
+                "ok" if result else "failed",
+            )
+            if result:
+                self._async_schedule_refresh(vin, command)
+            else:
+                self._async_clear_optimistic(vin, command.optimistic)
+            if not command.future.done():
+                command.future.set_result(result)
+
+    @callback
+    def _async_clear_optimistic(self, vin: str, keys: Iterable[str]) -> None:
+        """Show the reported values of keys no queued command expects."""
+        queued = {
+            key
+            for command in (*self._pending.get(vin, ()), *self._sending.get(vin, ()))
+            for key in command.optimistic
+        }
+        self.coordinator.async_clear_optimistic(
+            vin, [key for key in keys if key not in queued]
+        )
+
+    @callback
+    def _async_schedule_refresh(self, vin: str, command: Command) -> None:
+        """Refresh the domain of a command after it was sent to a vehicle."""
+        self._refresh_optimistic.setdefault(vin, {}).update(command.optimistic)
+        if vin in self._refresh_domains:
+            self._refresh_domains[vin].add(command.domain)
+            return
+        self._refresh_domains[vin] = {command.domain}
+        self.hass.async_create_task(
+            self._async_refresh(vin), f"Refresh {vin} after a command"
+        )
+
+    async def _async_refresh(self, vin: str) -> None:
+        """Refresh the touched domains until the expected values are reported.
+
+        The domains of commands sent while this runs are refreshed too. Only
+        the values expected by the sent commands are cleared afterwards, those
+        of commands still queued are shown until these are sent.
+        """
+        try:
+            for delay in POST_COMMAND_REFRESH_DELAYS_SECONDS:
+                await asyncio.sleep(delay)
+                domains = [
+                    domain for domain in Domain if domain in self._refresh_domains[vin]
+                ]
+                try:
+                    await self._async_fetch(vin, domains)
+                except Exception as exc:  # pylint: disable=broad-except
+                    _LOGGER.debug("Refreshing %s after a command failed - %s", vin, exc)
+                    continue
+                self.coordinator.async_update_vehicles()
+                if self.coordinator.optimistic_confirmed(
+                    vin, self._refresh_optimistic[vin]
+                ):
+                    break
+        finally:
+            del self._refresh_domains[vin]
+            self._async_clear_optimistic(vin, self._refresh_optimistic.pop(vin))
+
+
+def send_commands(
+    api: weconnect.WeConnect, vin: str, commands: list[Command]
+) -> list[bool]:
+    """Send a batch of commands to a vehicle, return the success of each.
+
+    This runs in the executor. Writes to the same settings object are applied
+    to the local values without notifying weconnect, then a single settings
+    request is sent with all of them.
+    """
+    vehicle = api.vehicles.get(vin)
+    if vehicle is None:
+        _LOGGER.error("Cannot send request to unknown car %s", vin)
+        return [False] * len(commands)
+
+    results = [True] * len(commands)
+
+    # Later writes of the same attribute replace earlier ones.
+    writes: dict[tuple[str, str], dict[str, Any]] = {}
+    positions: dict[tuple[str, str], list[int]] = {}
+    for position, command in enumerate(commands):
+        if command.is_setting:
+            domain, status, attribute = command.path
+            writes.setdefault((domain, status), {})[attribute] = command.value
+            positions.setdefault((domain, status), []).append(position)
+
+    for (domain, status), values in writes.items():
+        try:
+            _write_settings(vehicle.domains[domain][status], values)
+            _LOGGER.info("Sended %s call to the car", status)
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to send request to car - %s", exc)
+            for position in positions[(domain, status)]:
+                results[position] = False
+
+    for position, command in enumerate(commands):
+        if command.is_setting:
+            continue
+        try:
+            control = getattr(vehicle.controls, command.path[0])
+            if control is not None and control.enabled:
+                control.value = command.value
+                _LOGGER.info("Sended %s call to the car", command.name)
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to send request to car - %s", exc)
+            results[position] = False
+
+    return results
+
+
+def _write_settings(settings, values: dict[str, Any]) -> None:
+    """Change several attributes of a settings object with one request.
+
+    The values are set as if they came from the server, so weconnect does not
+    send a request per attribute, then the request is sent once. The old
+    values are restored when it fails.
+    """
+    old_values = {}
+    for attribute, value in values.items():
+        leaf = getattr(settings, attribute)
+        value = _coerce(leaf, value)
+        if leaf.value != value:
+            old_values[attribute] = leaf.value
+            _set_from_server(leaf, value)
+
+    if not old_values:
+        return
+
+    try:
+        settings.valueChanged(settings, AddressableLeaf.ObserverEvent.VALUE_CHANGED)
+    except Exception:
+        for attribute, value in old_values.items():
+            _set_from_server(getattr(settings, attribute), value)
+        raise
+
+
+def _set_from_server(leaf, value: Any) -> None:
+    """Set the value of an attribute without weconnect sending it."""
+    leaf.setValueWithCarTime(value, lastUpdateFromCar=None, fromServer=True)
+    if isinstance(leaf, AliasChangeableAttribute) and value is not None:
+        leaf.targetAttribute.setValueWithCarTime(
+            leaf.conversion(value), lastUpdateFromCar=None, fromServer=True
+        )
+
+
+def _coerce(leaf, value: Any) -> Any:
+    """Convert a value to the type of an attribute like its setter does."""
+    value_type = leaf.valueType
+    if not isinstance(value_type, type) or value is None:
+        return value
+    if issubclass(value_type, Enum) and not isinstance(value, Enum):
+        return value_type(value)
+    if value_type is float and isinstance(value, int):
+        return float(value)
+    return value
@@ -12,8 +12,20 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from . import get_parameter, get_we_connect_api, update
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL_SECONDS, MINIMUM_UPDATE_INTERVAL_SECONDS
+from . import get_account, get_parameter, token_store, update
+from .backend import AsyncWeConnectBackend
+from .const import (
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_MIN_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_MAX_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_NUMBER_WRITE_DELAY_SECONDS,
+    DEFAULT_FLEET_MODE,
+    DEFAULT_IMPORT_TRIP_STATISTICS,
+    DEFAULT_TRACKER_MIN_DISTANCE_METERS,
+    DEFAULT_VEHICLE_PICTURES,
+    MINIMUM_UPDATE_INTERVAL_SECONDS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,20 +36,68 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Optional(
             "update_interval", default=DEFAULT_UPDATE_INTERVAL_SECONDS
         ): vol.All(vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)),
+        vol.Optional(
+            "min_update_interval", default=DEFAULT_MIN_UPDATE_INTERVAL_SECONDS
+        ): vol.All(vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)),
+        vol.Optional(
+            "max_update_interval", default=DEFAULT_MAX_UPDATE_INTERVAL_SECONDS
+        ): vol.All(vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)),
+        vol.Optional(
+            "number_write_delay", default=DEFAULT_NUMBER_WRITE_DELAY_SECONDS
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+        vol.Optional("fleet_mode", default=DEFAULT_FLEET_MODE): bool,
+        vol.Optional(
+            "import_trip_statistics", default=DEFAULT_IMPORT_TRIP_STATISTICS
+        ): bool,
+        vol.Optional(
+            "tracker_min_distance", default=DEFAULT_TRACKER_MIN_DISTANCE_METERS
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+        vol.Optional("vehicle_pictures", default=DEFAULT_VEHICLE_PICTURES): bool,
     }
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user input allows us to connect."""
+async def validate_input(
+    hass: HomeAssistant,
+    data: dict[str, Any],
+    entry: config_entries.ConfigEntry | None = None,
+) -> dict[str, Any]:
+    """Validate the user input allows us to connect.
+
+    When the credentials of a config entry did not change, its stored tokens
+    are used, refreshed if needed, instead of logging in again.
+    """
 
-    we_connect = get_we_connect_api(
+    account = get_account(
         username=data["username"],
         password=data["password"],
     )
 
-    await hass.async_add_executor_job(we_connect.login)
-    await hass.async_add_executor_job(update, we_connect)
+    if (
+        entry is not None
+        and data["username"] == get_parameter(entry, "username")
+        and data["password"] == get_parameter(entry, "password")
+    ):
+        domain_entry = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        if domain_entry is not None and domain_entry.account is account:
+            backend = domain_entry.backend
+        else:
+            backend = AsyncWeConnectBackend(hass, account.api, token_store(hass, entry))
+            await backend.async_restore_tokens()
+        await backend.async_login()
+    else:
+        await hass.async_add_executor_job(account.api.login)
+
+    # A loaded config entry of the same account refreshes through its
+    # coordinator, so the flow joins a refresh that is already in flight.
+    for domain_entry in hass.data.get(DOMAIN, {}).values():
+        if domain_entry.account is account:
+            await domain_entry.coordinator.async_refresh()
+            if not domain_entry.coordinator.last_update_success:
+                raise CannotConnect
+            break
+    else:
+        await hass.async_add_executor_job(update, account)
 
     # vin = next(iter(we_connect.vehicles.items()))[0]
 
@@ -89,15 +149,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Options flow handler"""
 
-
-    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
         """Manage the options."""
 
         errors = {}
 
         if user_input is not None:
             try:
-                info = await validate_input(self.hass, user_input)
+                info = await validate_input(self.hass, user_input, self.config_entry)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except AuthentificationError:
@@ -112,15 +173,85 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Required("username", default=get_parameter(self.config_entry, "username")): str,
-                    vol.Required("password", default=get_parameter(self.config_entry, "password")): str,
+                    vol.Required(
+                        "username", default=get_parameter(self.config_entry, "username")
+                    ): str,
+                    vol.Required(
+                        "password", default=get_parameter(self.config_entry, "password")
+                    ): str,
+                    vol.Optional(
+                        "update_interval",
+                        default=get_parameter(
+                            self.config_entry,
+                            "update_interval",
+                            DEFAULT_UPDATE_INTERVAL_SECONDS,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)
+                    ),
+                    vol.Optional(
+                        "min_update_interval",
+                        default=get_parameter(
+                            self.config_entry,
+                            "min_update_interval",
+                            DEFAULT_MIN_UPDATE_INTERVAL_SECONDS,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)
+                    ),
+                    vol.Optional(
+                        "max_update_interval",
+                        default=get_parameter(
+                            self.config_entry,
+                            "max_update_interval",
+                            DEFAULT_MAX_UPDATE_INTERVAL_SECONDS,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)
+                    ),
                     vol.Optional(
-                        "update_interval", default=get_parameter(self.config_entry, "update_interval", DEFAULT_UPDATE_INTERVAL_SECONDS)
-                    ): vol.All(vol.Coerce(int), vol.Range(min=MINIMUM_UPDATE_INTERVAL_SECONDS)),
+                        "number_write_delay",
+                        default=get_parameter(
+                            self.config_entry,
+                            "number_write_delay",
+                            DEFAULT_NUMBER_WRITE_DELAY_SECONDS,
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                    vol.Optional(
+                        "fleet_mode",
+                        default=get_parameter(
+                            self.config_entry, "fleet_mode", DEFAULT_FLEET_MODE
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        "import_trip_statistics",
+                        default=get_parameter(
+                            self.config_entry,
+                            "import_trip_statistics",
+                            DEFAULT_IMPORT_TRIP_STATISTICS,
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        "tracker_min_distance",
+                        default=get_parameter(
+                            self.config_entry,
+                            "tracker_min_distance",
+                            DEFAULT_TRACKER_MIN_DISTANCE_METERS,
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10000)),
+                    vol.Optional(
+                        "vehicle_pictures",
+                        default=get_parameter(
+                            self.config_entry,
+                            "vehicle_pictures",
+                            DEFAULT_VEHICLE_PICTURES,
+                        ),
+                    ): bool,
                 }
             ),
             errors=errors,
         )
 
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
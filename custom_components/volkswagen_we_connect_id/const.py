@@ -4,3 +4,69 @@ DOMAIN = "volkswagen_we_connect_id"
 
 DEFAULT_UPDATE_INTERVAL_SECONDS = 45
 MINIMUM_UPDATE_INTERVAL_SECONDS = 30
+
+# Adaptive polling: active vehicles are polled at the floor interval,
+# offline or parked and unplugged vehicles at the ceiling interval.
+DEFAULT_MIN_UPDATE_INTERVAL_SECONDS = 30
+DEFAULT_MAX_UPDATE_INTERVAL_SECONDS = 900
+
+# Fleet mode staggers the polls of the vehicles over their intervals.
+DEFAULT_FLEET_MODE = False
+
+# A device tracker only moves when its vehicle reports a new capture time or
+# a position at least this many meters away.
+DEFAULT_TRACKER_MIN_DISTANCE_METERS = 50
+
+# Access and refresh tokens are kept per config entry in this storage version.
+TOKEN_STORAGE_VERSION = 1
+
+# The last fetched vehicle data is kept per config entry in this storage
+# version and written at most once per delay.
+CACHE_STORAGE_VERSION = 1
+CACHE_SAVE_DELAY_SECONDS = 60
+
+# Trips are imported into statistics when enabled. The import watermarks are
+# kept per config entry in this storage version, the first import of a
+# vehicle fetches the trips of this many days.
+DEFAULT_IMPORT_TRIP_STATISTICS = False
+TRIP_STORAGE_VERSION = 1
+TRIP_BACKFILL_DAYS = 90
+
+# The charged energy and the charging sessions are kept per config entry in
+# this storage version, written at most once per delay. Only the most recent
+# finished sessions are kept.
+CHARGING_STORAGE_VERSION = 1
+CHARGING_SAVE_DELAY_SECONDS = 60
+MAX_LOGGED_CHARGING_SESSIONS = 200
+
+# Vehicle pictures are fetched when enabled. Their index is kept per config
+# entry in this storage version, a picture is checked again after this many
+# days and a failed fetch is retried after this many minutes.
+DEFAULT_VEHICLE_PICTURES = False
+PICTURE_STORAGE_VERSION = 1
+PICTURE_REVALIDATE_DAYS = 7
+PICTURE_RETRY_MINUTES = 60
+
+# Entities are only created for the values a vehicle reports. The keys of
+# those values are kept per config entry in this storage version, written at
+# most once per delay. An entity registered for a value is removed once this
+# many vehicle list refreshes in a row succeeded without the value.
+CAPABILITY_STORAGE_VERSION = 1
+CAPABILITY_SAVE_DELAY_SECONDS = 10
+CAPABILITY_REMOVE_AFTER_REFRESHES = 20
+
+# Commands sent within this window are merged into as few requests as possible.
+COMMAND_COALESCE_SECONDS = 0.5
+
+# Changes of a number entity are sent once it has not changed for this delay.
+DEFAULT_NUMBER_WRITE_DELAY_SECONDS = 2
+
+# After a command the domains it touched are refreshed for its vehicle after
+# each of these delays, until the vehicle reports the expected values.
+POST_COMMAND_REFRESH_DELAYS_SECONDS = (5, 15, 30)
+
+# Failed refreshes are retried after an exponential backoff between these
+# delays, the calls stop for the backoff once this many failed in a row.
+BACKOFF_MIN_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+CIRCUIT_BREAKER_THRESHOLD = 3
@@ -0,0 +1,317 @@
+"""Data update coordinator for the Volkswagen We Connect ID integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+import logging
+from typing import Any
+
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .metrics import PHASE_ENTITIES, PHASE_REFRESH, PHASE_SNAPSHOTS, RefreshMetrics
+from .observers import ChangeTracker
+from .scheduler import SCHEDULER_DOMAINS
+from .snapshot import VehicleSnapshot, build_snapshot, update_snapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VolkswagenIDCoordinator(DataUpdateCoordinator[dict[str, Vehicle]]):
+    """Coordinator that knows which domains its entities read.
+
+    After every refresh it runs the reader of every entity key once per
+    vehicle into an immutable VehicleSnapshot, and only notifies the entities
+    whose value differs from the previous snapshot. With a ChangeTracker only
+    the readers of the domains weconnect reported changes for run again.
+    """
+
+    def __init__(
+        self,
+        *args,
+        metrics: RefreshMetrics | None = None,
+        changes: ChangeTracker | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or RefreshMetrics()
+        self._change_tracker = changes
+        # The parts of a vehicle a reader reads, empty when it is unknown.
+        self._reader_parts: dict[str, frozenset[str]] = {}
+        self._domain_users: Counter[Domain] = Counter()
+        self._has_domain_users = False
+        self._readers: dict[str, Callable[[Vehicle], Any]] = {}
+        self._reader_users: Counter[str] = Counter()
+        self._index: dict[str, int] = {}
+        self._changed: set[tuple[str, str]] = set()
+        self._notified_update_success: bool | None = None
+        self._notified_restored_at: datetime | None = None
+        self._refresh_task: asyncio.Task[dict[str, Vehicle]] | None = None
+        self.joined_refreshes = 0
+        self.snapshots: dict[str, VehicleSnapshot] = {}
+        self._optimistic: dict[str, dict[str, Any]] = {}
+        # When the data was saved, while it is restored from disk.
+        self.restored_at: datetime | None = None
+        self.suppressed_writes = 0
+        # The error of the last refresh of every vehicle that failed.
+        self.vehicle_errors: dict[str, Exception] = {}
+
+    @callback
+    def async_add_domain_user(self, domains: Iterable[Domain]) -> CALLBACK_TYPE:
+        """Register the domains an entity reads, return a callback to remove them."""
+        domains = tuple(domains)
+        self._domain_users.update(domains)
+        self._has_domain_users = True
+
+        @callback
+        def remove_domain_user() -> None:
+            self._domain_users.subtract(domains)
+
+        return remove_domain_user
+
+    def required_domains(self) -> list[Domain] | None:
+        """Return the domains to fetch, or None to fetch all of them.
+
+        Entities that are disabled are never added to Home Assistant, so only
+        the domains of enabled entities and the ones the poll scheduler reads
+        are requested. Everything is fetched until the first entity is added.
+        """
+        if not self._has_domain_users:
+            return None
+
+        domains = {domain for domain, users in self._domain_users.items() if users > 0}
+        domains.update(SCHEDULER_DOMAINS)
+        return [domain for domain in Domain if domain in domains]
+
+    @callback
+    def async_add_reader(
+        self,
+        key: str,
+        reader: Callable[[Vehicle], Any],
+        domains: Iterable[Domain | None] = (),
+    ) -> CALLBACK_TYPE:
+        """Register how to read the value of a key from a vehicle.
+
+        The entities of all vehicles that show the same key share one reader.
+        The reader runs again when one of the domains changed, or when
+        anything of the vehicle changed if no domains are given.
+        """
+        if key not in self._readers:
+            self._readers[key] = reader
+            self._reader_parts[key] = frozenset(
+                domain.value for domain in domains if domain is not None
+            )
+            self._reindex()
+        self._reader_users[key] += 1
+
+        @callback
+        def remove_reader() -> None:
+            self._reader_users[key] -= 1
+            if self._reader_users[key] <= 0:
+                del self._reader_users[key]
+                del self._readers[key]
+                del self._reader_parts[key]
+                self._reindex()
+
+        return remove_reader
+
+    def _reindex(self) -> None:
+        """Build a new key to position index for the next snapshots."""
+        self._index = {
+            reader_key: position for position, reader_key in enumerate(self._readers)
+        }
+
+    async def _async_update_data(self) -> dict[str, Vehicle]:
+        """Fetch the data, or join the fetch that is already in flight.
+
+        The timer, the platforms, the config flow and the services all refresh
+        through here, concurrent refreshes share a single fetch.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = self.hass.async_create_task(
+                self._async_fetch_data(), f"{self.name} refresh"
+            )
+            self._refresh_task.add_done_callback(self._refresh_done)
+        else:
+            self.joined_refreshes += 1
+            _LOGGER.debug(
+                "Joined the refresh in flight (%d joined in total)",
+                self.joined_refreshes,
+            )
+        # A cancelled caller must not cancel the fetch of the others.
+        return await asyncio.shield(self._refresh_task)
+
+    @callback
+    def _refresh_done(self, task: asyncio.Task[dict[str, Vehicle]]) -> None:
+        """Let the next refresh start a new fetch."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled():
+            # Retrieved here in case every caller was cancelled.
+            task.exception()
+
+    async def _async_fetch_data(self) -> dict[str, Vehicle]:
+        """Fetch the data and build the snapshots of the vehicles."""
+        with self.metrics.span(PHASE_REFRESH):
+            vehicles = await super()._async_update_data()
+            self._build_snapshots(vehicles)
+        return vehicles
+
+    @callback
+    def async_set_restored_data(
+        self, vehicles: dict[str, Vehicle], restored_at: datetime
+    ) -> None:
+        """Use vehicles restored from disk until the first live refresh."""
+        self.restored_at = restored_at
+        self._build_snapshots(vehicles)
+        self.async_set_updated_data(vehicles)
+
+    @callback
+    def async_update_vehicles(self) -> None:
+        """Rebuild the snapshots after vehicles were updated outside a refresh."""
+        self._build_snapshots(self.data)
+        self.async_update_listeners()
+
+    def set_vehicle_errors(
+        self, vins: Iterable[str], errors: Mapping[str, Exception]
+    ) -> None:
+        """Record which of the refreshed vehicles failed.
+
+        The entities of a vehicle are updated when it fails or recovers, the
+        vehicles that were not refreshed keep their state.
+        """
+        for vin in vins:
+            error = errors.get(vin)
+            if error is None:
+                if self.vehicle_errors.pop(vin, None) is None:
+                    continue
+                _LOGGER.info("Refreshing %s works again", vin)
+            else:
+                failed = vin in self.vehicle_errors
+                self.vehicle_errors[vin] = error
+                if failed:
+                    continue
+                _LOGGER.warning("Refreshing %s failed - %s", vin, error)
+            self._changed.update((vin, key) for key in self._readers)
+
+    def optimistic_values(self, vin: str) -> Mapping[str, Any]:
+        """Return the values expected after the commands sent to a vehicle."""
+        return self._optimistic.get(vin, {})
+
+    @callback
+    def async_set_optimistic(self, vin: str, values: Mapping[str, Any]) -> None:
+        """Show expected values until the vehicle reports them."""
+        if not values:
+            return
+        self._optimistic.setdefault(vin, {}).update(values)
+        self._changed.update((vin, key) for key in values)
+        self.async_update_listeners()
+
+    @callback
+    def async_clear_optimistic(
+        self, vin: str, keys: Iterable[str] | None = None
+    ) -> None:
+        """Show the reported values again."""
+        values = self._optimistic.get(vin, {})
+        keys = list(values) if keys is None else [key for key in keys if key in values]
+        if not keys:
+            return
+        for key in keys:
+            del values[key]
+        if not values:
+            del self._optimistic[vin]
+        self._changed.update((vin, key) for key in keys)
+        self.async_update_listeners()
+
+    def optimistic_confirmed(
+        self, vin: str, expected: Mapping[str, Any] | None = None
+    ) -> bool:
+        """Return True if a vehicle reports the expected values.
+
+        Without expected values all the values expected of it are checked.
+        """
+        snapshot = self.snapshots.get(vin)
+        if expected is None:
+            expected = self.optimistic_values(vin)
+        return snapshot is not None and all(
+            key not in snapshot or snapshot[key] == value
+            for key, value in expected.items()
+        )
+
+    def _build_snapshots(self, vehicles: dict[str, Vehicle]) -> None:
+        """Run every reader once per vehicle and diff against the last snapshot."""
+        with self.metrics.span(PHASE_SNAPSHOTS):
+            changes = (
+                None
+                if self._change_tracker is None
+                else self._change_tracker.pop_changes()
+            )
+            previous = self.snapshots
+            self.snapshots = {}
+            for vin, vehicle in vehicles.items():
+                old = previous.get(vin)
+                if changes is None or old is None or old.index is not self._index:
+                    snapshot = build_snapshot(vehicle, self._readers, self._index)
+                elif vin in changes:
+                    snapshot = update_snapshot(
+                        old, vehicle, self._readers, self._keys_to_read(changes[vin])
+                    )
+                else:
+                    snapshot = old
+                self.snapshots[vin] = snapshot
+                if old == snapshot:
+                    continue
+                for key in snapshot.keys():
+                    if old is None or key not in old or old[key] != snapshot[key]:
+                        self._changed.add((vin, key))
+
+    def _keys_to_read(self, parts: set[str]) -> list[str]:
+        """Return the keys whose value may have changed with some parts."""
+        return [
+            key
+            for key, reader_parts in self._reader_parts.items()
+            if not reader_parts or not reader_parts.isdisjoint(parts)
+        ]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose value changed since the last refresh.
+
+        Entities listen with a (vin, key) context. All listeners are updated
+        when the availability changed or the data stopped being restored.
+        """
+        with self.metrics.span(PHASE_ENTITIES):
+            self._async_update_changed_listeners()
+
+    @callback
+    def _async_update_changed_listeners(self) -> None:
+        """Update the listeners, see async_update_listeners."""
+        changed, self._changed = self._changed, set()
+        if (
+            self._notified_update_success != self.last_update_success
+            or self._notified_restored_at != self.restored_at
+        ):
+            self._notified_update_success = self.last_update_success
+            self._notified_restored_at = self.restored_at
+            super().async_update_listeners()
+            return
+
+        suppressed = 0
+        for update_callback, context in list(self._listeners.values()):
+            if context not in changed and context is not None:
+                suppressed += 1
+                continue
+            update_callback()
+
+        self.suppressed_writes += suppressed
+        _LOGGER.debug(
+            "Skipped %d unchanged entity states (%d in total)",
+            suppressed,
+            self.suppressed_writes,
+        )
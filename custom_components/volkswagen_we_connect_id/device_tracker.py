@@ -4,18 +4,23 @@ Support for Volkswagen WeConnect Platform
 import logging
 
 from weconnect import weconnect
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
 
+from homeassistant.components import zone
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_HOME, STATE_NOT_HOME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.util import slugify
+from homeassistant.util.location import distance
 
-from . import DomainEntry, VolkswagenIDBaseEntity, get_object_value
-from .const import DOMAIN
+from . import DomainEntry, VolkswagenIDBaseEntity, get_object_value, get_parameter
+from .const import DEFAULT_TRACKER_MIN_DISTANCE_METERS, DOMAIN
+from .snapshot import reported_status
+from .zones import ZoneIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,54 +35,108 @@ async def async_setup_entry(
     domain_entry: DomainEntry = hass.data[DOMAIN][config_entry.entry_id]
     we_connect = domain_entry.we_connect
     coordinator = domain_entry.coordinator
-
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
+    zones = ZoneIndex(hass)
+    config_entry.async_on_unload(zones.async_remove)
+    min_distance = get_parameter(
+        config_entry, "tracker_min_distance", DEFAULT_TRACKER_MIN_DISTANCE_METERS
+    )
 
     entities = []
 
-    for index, vehicle in enumerate(coordinator.data):
-        entities.append(VolkswagenIDSensor(we_connect, coordinator, index))
+    for vin in coordinator.data:
+        entities.append(
+            VolkswagenIDSensor(we_connect, coordinator, vin, zones, min_distance)
+        )
 
     if entities:
         async_add_entities(entities)
 
 
 class VolkswagenIDSensor(VolkswagenIDBaseEntity, TrackerEntity):
-    """Representation of a VolkswagenID vehicle sensor."""
+    """Representation of a VolkswagenID vehicle sensor.
+
+    The position only moves when the vehicle reports a new capture time or
+    a position further away than the minimum distance, so the state does not
+    change for small differences in the reported coordinates.
+    """
+
+    required_domains = (Domain.PARKING,)
+    snapshot_key = "tracker"
 
     def __init__(
         self,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
+        zones: ZoneIndex,
+        min_distance: float,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin)
 
         self._coordinator = coordinator
+        self._zones = zones
+        self._min_distance = min_distance
+        self._position: tuple[float, float, object] | None = None
         self._attr_name = f"{self.data.nickname} tracker"
         self._attr_unique_id = f"{self.data.vin}-tracker"
 
+    async def async_added_to_hass(self) -> None:
+        """Take the position of the vehicle when the entity is added."""
+        await super().async_added_to_hass()
+        self._position = self.snapshot_value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Move to the reported position if the vehicle moved."""
+        position = self.snapshot_value
+        if (
+            position is None
+            or self._position is None
+            or position[2] != self._position[2]
+            or (distance(*position[:2], *self._position[:2]) or 0) > self._min_distance
+        ):
+            self._position = position
+        super()._handle_coordinator_update()
+
+    def read_value(self, vehicle: Vehicle) -> tuple[float, float, object] | None:
+        """Read the parking position and its capture time from a vehicle."""
+        parking_position = reported_status(
+            vehicle.domains, "parking", "parkingPosition"
+        )
+        if parking_position is None:
+            return None
+        return (
+            get_object_value(parking_position.latitude.value),
+            get_object_value(parking_position.longitude.value),
+            get_object_value(parking_position.carCapturedTimestamp.value),
+        )
+
     @property
     def latitude(self) -> float:
         """Return latitude value of the device."""
-        try:
-            return get_object_value(
-                self.data.domains["parking"]["parkingPosition"].latitude.value
-            )
-        except KeyError:
+        if (position := self._position) is None:
             return None
+        return position[0]
 
     @property
     def longitude(self) -> float:
         """Return longitude value of the device."""
-        try:
-            return get_object_value(
-                self.data.domains["parking"]["parkingPosition"].longitude.value
-            )
-        except KeyError:
+        if (position := self._position) is None:
             return None
+        return position[1]
+
+    @property
+    def state(self) -> str | None:
+        """Return the zone of the device, looked up in the zone index."""
+        if (position := self._position) is None:
+            return None
+        zone_state = self._zones.async_active_zone(position[0], position[1])
+        if zone_state is None:
+            return STATE_NOT_HOME
+        if zone_state.entity_id == zone.ENTITY_ID_HOME:
+            return STATE_HOME
+        return zone_state.name
 
     @property
     def source_type(self):
@@ -92,13 +151,7 @@ class VolkswagenIDSensor(VolkswagenIDBaseEntity, TrackerEntity):
     @property
     def extra_state_attributes(self):
         """Return timestamp of when the data was captured."""
-        try:
-            return {
-                "last_captured": get_object_value(
-                    self.data.domains["parking"][
-                        "parkingPosition"
-                    ].carCapturedTimestamp.value
-                )
-            }
-        except KeyError:
-            return None
+        attributes = super().extra_state_attributes
+        if (position := self._position) is None:
+            return attributes
+        return {**(attributes or {}), "last_captured": position[2]}
@@ -0,0 +1,71 @@
+"""Diagnostics support for the Volkswagen We Connect ID integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import DomainEntry
+from .const import DOMAIN
+
+TO_REDACT = {"username", "password"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the refresh timings and counters of a config entry.
+
+    Vehicles are listed by their position in the account instead of their VIN.
+    """
+    domain_entry: DomainEntry = hass.data[DOMAIN][entry.entry_id]
+    coordinator = domain_entry.coordinator
+    backend = domain_entry.backend
+    breaker = backend.breaker
+    vehicles = {
+        vin: f"vehicle_{number}"
+        for number, vin in enumerate(domain_entry.vehicles, start=1)
+    }
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "metrics": domain_entry.metrics.as_dict(),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval_seconds": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "joined_refreshes": coordinator.joined_refreshes,
+            "skipped_state_writes": coordinator.suppressed_writes,
+            "restored_at": coordinator.restored_at.isoformat()
+            if coordinator.restored_at
+            else None,
+        },
+        "circuit_breaker": {
+            "state": breaker.state,
+            "consecutive_failures": breaker.failures,
+            "retry_in_seconds": breaker.retry_in().total_seconds(),
+            "last_error": None
+            if breaker.last_error is None
+            else str(breaker.last_error),
+        },
+        "vehicles": {
+            name: {
+                "model": str(domain_entry.vehicles[vin].model.value),
+                "fetch_seconds": backend.fetch_seconds.get(vin),
+                "interval_seconds": domain_entry.scheduler.interval_for(
+                    domain_entry.vehicles[vin]
+                ),
+                "error": None
+                if vin not in coordinator.vehicle_errors
+                else str(coordinator.vehicle_errors[vin]),
+            }
+            for vin, name in vehicles.items()
+        },
+        "command_latency_seconds": dict(domain_entry.commands.latencies),
+    }
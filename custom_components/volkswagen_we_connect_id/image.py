@@ -0,0 +1,107 @@
+"""Image integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from weconnect.elements.vehicle import Vehicle
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from . import DomainEntry
+from .const import DOMAIN, PICTURE_RETRY_MINUTES
+from .pictures import VehiclePictureCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    """Add the pictures of the vehicles of a config entry."""
+    domain_entry: DomainEntry = hass.data[DOMAIN][config_entry.entry_id]
+    if domain_entry.pictures is None:
+        return
+
+    async_add_entities(
+        VolkswagenIDPicture(hass, config_entry, domain_entry.pictures, vehicle)
+        for vehicle in domain_entry.coordinator.data.values()
+    )
+
+
+class VolkswagenIDPicture(ImageEntity):
+    """Picture of a VolkswagenID vehicle, served from the picture cache."""
+
+    _attr_attribution = "Data provided by Volkswagen Connect ID"
+    _attr_content_type = "image/png"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        pictures: VehiclePictureCache,
+        vehicle: Vehicle,
+    ) -> None:
+        """Initialize the picture."""
+        super().__init__(hass)
+        self._config_entry = config_entry
+        self._pictures = pictures
+        self._vin = vehicle.vin.value
+        self._revalidating = False
+        self._retry_at: datetime | None = None
+        self._attr_name = f"{vehicle.nickname} picture"
+        self._attr_unique_id = f"{self._vin}-picture"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"vw{vehicle.vin}")},
+            manufacturer="Volkswagen",
+            model=f"{vehicle.model}",  # format because of the ID.3/ID.4 names.
+            name=f"Volkswagen {vehicle.nickname} ({vehicle.vin})",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Show the cached picture and check it when it is stale."""
+        await super().async_added_to_hass()
+        self._attr_image_last_updated = self._pictures.updated_at(self._vin)
+        self._async_revalidate_if_stale()
+
+    async def async_image(self) -> bytes | None:
+        """Return the cached picture."""
+        self._async_revalidate_if_stale()
+        picture = await self._pictures.async_get(self._vin)
+        if picture is None:
+            return None
+        content, self._attr_content_type = picture
+        return content
+
+    @callback
+    def _async_revalidate_if_stale(self) -> None:
+        """Check the picture in the background when it is stale."""
+        if (
+            self._revalidating
+            or not self._pictures.is_stale(self._vin)
+            or (self._retry_at is not None and dt_util.utcnow() < self._retry_at)
+        ):
+            return
+        self._revalidating = True
+        self._config_entry.async_create_background_task(
+            self.hass, self._async_revalidate(), f"{DOMAIN} picture of {self._vin}"
+        )
+
+    async def _async_revalidate(self) -> None:
+        """Fetch the picture and update the state when it changed."""
+        try:
+            if await self._pictures.async_revalidate(self._vin):
+                self._attr_image_last_updated = dt_util.utcnow()
+                self.async_write_ha_state()
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not fetch the picture of %s - %s", self._vin, exc)
+            self._retry_at = dt_util.utcnow() + timedelta(minutes=PICTURE_RETRY_MINUTES)
+        finally:
+            self._revalidating = False
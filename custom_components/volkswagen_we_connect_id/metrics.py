@@ -0,0 +1,69 @@
+"""Refresh timing and counters for the Volkswagen We Connect ID integration."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+# The phases of a refresh that are timed, in the order they run.
+PHASE_LOGIN = "login"
+PHASE_FETCH = "fetch"
+PHASE_PARSE = "parse"
+PHASE_FILTER = "filter"
+PHASE_SNAPSHOTS = "snapshots"
+PHASE_ENTITIES = "entities"
+PHASE_REFRESH = "refresh"
+PHASES = (
+    PHASE_LOGIN,
+    PHASE_FETCH,
+    PHASE_PARSE,
+    PHASE_FILTER,
+    PHASE_SNAPSHOTS,
+    PHASE_ENTITIES,
+    PHASE_REFRESH,
+)
+
+
+class RefreshMetrics:
+    """Durations of the last run of every phase and counters of a config entry.
+
+    The fetch phase includes a login when one was needed and the refresh phase
+    covers everything from the fetch to the snapshots. Entity updates run
+    after the refresh.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.phases: dict[str, float] = {}
+        self.api_calls = 0
+        self.bytes_received = 0
+        self.skipped_refreshes = 0
+        # Refreshes skipped while the circuit breaker is open.
+        self.paused_refreshes = 0
+        self.failures = 0
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Time a phase, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = time.perf_counter() - start
+
+    def record_response(self, size: int) -> None:
+        """Count a response of the API and its size in bytes."""
+        self.api_calls += 1
+        self.bytes_received += size
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for the diagnostics."""
+        return {
+            "phase_seconds": dict(self.phases),
+            "api_calls": self.api_calls,
+            "bytes_received": self.bytes_received,
+            "skipped_refreshes": self.skipped_refreshes,
+            "paused_refreshes": self.paused_refreshes,
+            "failures": self.failures,
+        }
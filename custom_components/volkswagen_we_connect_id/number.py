@@ -1,11 +1,16 @@
 """Entity representing a Volkswagen number control."""
 from __future__ import annotations
 
+from abc import abstractmethod
+
 from weconnect import weconnect
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
@@ -13,14 +18,18 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from . import (
     DomainEntry,
     VolkswagenIDBaseEntity,
+    async_set_climatisation,
+    async_set_target_soc,
     get_object_value,
-    set_climatisation,
-    set_target_soc,
+    get_parameter,
 )
-from .const import DOMAIN
+from .commands import CommandQueue
+from .const import DOMAIN, DEFAULT_NUMBER_WRITE_DELAY_SECONDS
+from .snapshot import reported_status
 
 from homeassistant.const import (
     PERCENTAGE,
+    Platform,
     UnitOfTemperature,
 )
 
@@ -34,100 +43,194 @@ async def async_setup_entry(
     domain_entry: DomainEntry = hass.data[DOMAIN][config_entry.entry_id]
     we_connect = domain_entry.we_connect
     coordinator = domain_entry.coordinator
-
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
+    commands = domain_entry.commands
+    write_delay = get_parameter(
+        config_entry, "number_write_delay", DEFAULT_NUMBER_WRITE_DELAY_SECONDS
+    )
 
     entities = []
 
-    for index, vehicle in enumerate(coordinator.data):
-        entities.append(TargetSoCNumber(we_connect, coordinator, index))
-        entities.append(TargetClimateNumber(we_connect, coordinator, index))
+    for vin in coordinator.data:
+        entities.extend(
+            domain_entry.capabilities.async_supported_entities(
+                Platform.NUMBER,
+                coordinator,
+                vin,
+                [
+                    TargetSoCNumber(
+                        we_connect, coordinator, vin, commands, write_delay
+                    ),
+                    TargetClimateNumber(
+                        we_connect, coordinator, vin, commands, write_delay
+                    ),
+                ],
+            )
+        )
     if entities:
         async_add_entities(entities)
 
 
-class TargetSoCNumber(VolkswagenIDBaseEntity, NumberEntity):
+class VolkswagenIDDebouncedNumber(VolkswagenIDBaseEntity, NumberEntity):
+    """Number that shows a change at once but sends only the last one.
+
+    A change is sent once the number has not changed for the write delay, so
+    dragging a slider sends a single request. The changed value is shown until
+    the vehicle reports a new value or sending it fails.
+    """
+
+    def __init__(
+        self,
+        we_connect: weconnect.WeConnect,
+        coordinator: DataUpdateCoordinator,
+        vin: str,
+        commands: CommandQueue,
+        write_delay: float,
+    ) -> None:
+        """Initialize the number."""
+        super().__init__(we_connect, coordinator, vin)
+
+        self._we_connect = we_connect
+        self._commands = commands
+        self._write_delay = write_delay
+        self._pending_value: float | None = None
+        self._cancel_write: CALLBACK_TYPE | None = None
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the changed value, or the value reported by the vehicle."""
+        if self._pending_value is not None:
+            return self._pending_value
+        return self.snapshot_value
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Show the value and send it when it has not changed for a while."""
+        self._pending_value = value
+        self.async_write_ha_state()
+
+        if self._cancel_write is not None:
+            self._cancel_write()
+        self._cancel_write = async_call_later(
+            self.hass, self._write_delay, self._async_write_value
+        )
+
+    async def _async_write_value(self, _now=None) -> None:
+        """Send the last changed value."""
+        self._cancel_write = None
+        value = self._pending_value
+        if value is None:
+            return
+
+        if not await self.async_send_value(value) and self._pending_value == value:
+            # Show the value of the vehicle again.
+            self._pending_value = None
+            self.async_write_ha_state()
+
+    @abstractmethod
+    async def async_send_value(self, value: float) -> bool:
+        """Send a value to the vehicle, return True if it was sent."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Show the reported value, unless a change is waiting to be sent."""
+        if self._cancel_write is None:
+            self._pending_value = None
+        super()._handle_coordinator_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Send a change that is still waiting."""
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+            self.hass.async_create_task(self.async_send_value(self._pending_value))
+        await super().async_will_remove_from_hass()
+
+
+class TargetSoCNumber(VolkswagenIDDebouncedNumber):
     """Representation of a Target SoC entity."""
 
     _attr_entity_category = EntityCategory.CONFIG
+    required_domains = (Domain.CHARGING,)
+    snapshot_key = "target_state_of_charge"
 
     def __init__(
         self,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
+        commands: CommandQueue,
+        write_delay: float,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin, commands, write_delay)
 
         self._coordinator = coordinator
         self._attr_name = f"{self.data.nickname} Target State Of Charge"
         self._attr_unique_id = f"{self.data.vin}-target_state_of_charge"
         self._attr_icon = "mdi:battery"
-        self._we_connect = we_connect
         self._attr_native_min_value = 10
         self._attr_native_max_value = 100
         self._attr_native_step = 10
         self._attr_native_unit_of_measurement = PERCENTAGE
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the value reported by the number."""
-        return int(
-            get_object_value(
-                self.data.domains["charging"]["chargingSettings"].targetSOC_pct.value
-            )
-        )
+    def read_value(self, vehicle: Vehicle) -> int | None:
+        """Read the target SoC from a vehicle."""
+        settings = reported_status(vehicle.domains, "charging", "chargingSettings")
+        if settings is None or settings.targetSOC_pct.value is None:
+            return None
+        return int(get_object_value(settings.targetSOC_pct.value))
 
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
+    async def async_send_value(self, value: float) -> bool:
+        """Send the target SoC to the vehicle."""
         if value > 10:
-            await self.hass.async_add_executor_job(
-                set_target_soc,
-                self.data.vin.value,
-                self._we_connect,
+            return await async_set_target_soc(
+                self._commands,
+                self._vin,
                 value,
             )
+        return False
 
 
-class TargetClimateNumber(VolkswagenIDBaseEntity, NumberEntity):
+class TargetClimateNumber(VolkswagenIDDebouncedNumber):
     """Representation of a Target Climate entity."""
 
     _attr_entity_category = EntityCategory.CONFIG
+    required_domains = (Domain.CLIMATISATION,)
+    snapshot_key = "target_climate_temperature"
 
     def __init__(
         self,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
+        commands: CommandQueue,
+        write_delay: float,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin, commands, write_delay)
 
         self._coordinator = coordinator
         self._attr_name = f"{self.data.nickname} Target Climate Temperature"
         self._attr_unique_id = f"{self.data.vin}-target_climate_temperature"
         self._attr_icon = "mdi:thermometer"
-        self._we_connect = we_connect
         self._attr_native_min_value = 10
         self._attr_native_max_value = 30
         self._attr_native_step = 0.5
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the value reported by the number."""
-        targetTemp = self.data.domains["climatisation"][
-            "climatisationSettings"
-        ].targetTemperature_C.value
+    def read_value(self, vehicle: Vehicle) -> float | None:
+        """Read the target temperature from a vehicle."""
+        settings = reported_status(
+            vehicle.domains, "climatisation", "climatisationSettings"
+        )
+        if settings is None or settings.targetTemperature_C.value is None:
+            return None
 
-        return float(targetTemp)
+        return float(settings.targetTemperature_C.value)
 
-    async def async_set_native_value(self, value: float) -> None:
-        """Update the current value."""
+    async def async_send_value(self, value: float) -> bool:
+        """Send the target temperature to the vehicle."""
         if value > 10:
-            self._attr_native_value = value
-            await self.hass.async_add_executor_job(
-                set_climatisation, self.data.vin.value, self._we_connect, "none", value
+            return await async_set_climatisation(
+                self._commands, self._vin, "none", value
             )
+        return False
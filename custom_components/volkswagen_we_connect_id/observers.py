@@ -0,0 +1,58 @@
+"""Bridge from weconnect observers to the Volkswagen We Connect ID integration.
+
+weconnect notifies observers of every attribute whose value changed while it
+parses a response. The integration uses that to re-read only the values of
+the entities whose domain of the vehicle changed.
+"""
+from __future__ import annotations
+
+import threading
+
+from weconnect import weconnect
+from weconnect.addressable import AddressableLeaf
+
+# Changes that can change the value an entity reads.
+OBSERVED_EVENTS = (
+    AddressableLeaf.ObserverEvent.VALUE_CHANGED
+    | AddressableLeaf.ObserverEvent.ENABLED
+    | AddressableLeaf.ObserverEvent.DISABLED
+)
+
+
+class ChangeTracker:
+    """Collect which parts of which vehicles changed since they were last taken.
+
+    A part is the domain of an attribute under the domains of a vehicle, e.g.
+    "charging", or else the first element under the vehicle, e.g. "trips" or
+    "nickname". weconnect calls the observer on the thread that updates the
+    api, so the changes are guarded by a lock.
+    """
+
+    def __init__(self, api: weconnect.WeConnect) -> None:
+        """Observe all vehicles of an api object."""
+        self._lock = threading.Lock()
+        self._changes: dict[str, set[str]] = {}
+        api.addObserver(
+            self._on_change,
+            OBSERVED_EVENTS,
+            priority=AddressableLeaf.ObserverPriority.USER_LOW,
+        )
+
+    def _on_change(self, element: AddressableLeaf, flags) -> None:
+        """Record the vehicle and part of a changed element."""
+        del flags
+        parts = element.getGlobalAddress().split("/")
+        # The address of a vehicle attribute is /vehicles/<vin>/<part>/...
+        if len(parts) < 4 or parts[1] != "vehicles":
+            return
+        vin, part = parts[2], parts[3]
+        if part == "domains" and len(parts) > 4:
+            part = parts[4]
+        with self._lock:
+            self._changes.setdefault(vin, set()).add(part)
+
+    def pop_changes(self) -> dict[str, set[str]]:
+        """Return the changes since the last call and forget them."""
+        with self._lock:
+            changes, self._changes = self._changes, {}
+        return changes
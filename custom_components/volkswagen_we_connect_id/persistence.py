@@ -0,0 +1,125 @@
+"""Persisted vehicle data for the Volkswagen We Connect ID integration.
+
+The raw responses of the last successful refresh are saved per config entry,
+so that after a restart the entities can be created from them before the
+first live refresh has finished.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+from weconnect.domain import Domain
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .backend import API_BASE_URL
+from .const import CACHE_SAVE_DELAY_SECONDS, CACHE_STORAGE_VERSION, DOMAIN
+
+if TYPE_CHECKING:
+    from . import WeConnectAccount
+
+_LOGGER = logging.getLogger(__name__)
+
+# The restored responses are parsed regardless of how old they are.
+RESTORE_MAX_AGE_SECONDS = 10 * 365 * 24 * 3600
+
+
+class VehicleCacheStore:
+    """Save and restore the weconnect cache of a config entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, account: WeConnectAccount
+    ) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.account = account
+        self._store = cache_store(hass, entry_id)
+        self._selective: list[Domain] | None = None
+
+    async def async_restore(self) -> datetime | None:
+        """Parse the saved responses into the api, return when they were saved.
+
+        Returns None when nothing was saved or the saved data can not be parsed.
+        """
+        data = await self._store.async_load()
+        if not data or data.get("username") != self.account.api.username:
+            return None
+
+        selective = data.get("selective")
+        try:
+            saved_at = dt_util.parse_datetime(data["saved_at"])
+            await self.hass.async_add_executor_job(
+                _restore,
+                self.account,
+                data["cache"],
+                None if selective is None else [Domain(job) for job in selective],
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not restore the saved vehicle data - %s", exc)
+            self.account.api.vehicles.clear()
+            return None
+
+        return saved_at
+
+    @callback
+    def async_schedule_save(self, selective: list[Domain] | None) -> None:
+        """Save the responses of a successful refresh after a delay."""
+        self._selective = selective
+        self._store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY_SECONDS)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the responses of the weconnect cache to save."""
+        cache = dict(self.account.api.cache)
+        return {
+            "username": self.account.api.username,
+            "saved_at": dt_util.utcnow().isoformat(),
+            "selective": None
+            if self._selective is None
+            else [domain.value for domain in self._selective],
+            "cache": {
+                url: response
+                for url, (response, _) in cache.items()
+                if url.startswith(API_BASE_URL)
+            },
+        }
+
+
+class _CacheStore(Store[dict[str, Any]]):
+    """Store of the vehicle data, data of another version is discarded."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: Any
+    ) -> dict[str, Any]:
+        """Discard the data, the next refresh fetches it again."""
+        _LOGGER.debug(
+            "Discarding the vehicle data saved with version %s", old_major_version
+        )
+        return {}
+
+
+def cache_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the vehicle data of a config entry."""
+    return _CacheStore(
+        hass, CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.cache", private=True
+    )
+
+
+def _restore(
+    account: WeConnectAccount, cache: dict[str, Any], selective: list[Domain] | None
+) -> None:
+    """Parse saved responses with weconnect, without fetching anything."""
+    api = account.api
+    now = str(datetime.utcnow())
+    with account.lock:
+        for url, response in cache.items():
+            api.cache.setdefault(url, (response, now))
+        api.maxAge = RESTORE_MAX_AGE_SECONDS
+        try:
+            api.update(updatePictures=False, selective=selective)
+        finally:
+            api.maxAge = None
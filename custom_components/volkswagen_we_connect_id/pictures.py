@@ -0,0 +1,157 @@
+"""Vehicle pictures for the Volkswagen We Connect ID integration.
+
+The pictures are fetched by the integration instead of weconnect, which would
+download and decode them with Pillow on every update. They are stored on disk
+under the SHA-256 of their content and an index per config entry remembers
+which picture belongs to which vehicle and when it was last checked. A picture
+is only fetched again once it is older than the revalidation interval.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PICTURE_REVALIDATE_DAYS, PICTURE_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .backend import AsyncWeConnectBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+# The picture of the vehicle seen from the front left.
+PICTURE_ID = "car_34view"
+
+
+class VehiclePictureCache:
+    """Content-addressed disk cache of the vehicle pictures of a config entry."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, backend: AsyncWeConnectBackend
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.backend = backend
+        self._directory = picture_directory(hass)
+        self._store = picture_store(hass, entry_id)
+        # Per VIN: the digest and content type of the picture, when it last
+        # changed and when it was last checked.
+        self._index: dict[str, dict[str, str]] = {}
+        # The content of the pictures that were read, by digest.
+        self._pictures: dict[str, bytes] = {}
+
+    async def async_load(self) -> None:
+        """Load the index of the pictures."""
+        data = await self._store.async_load()
+        self._index = (data or {}).get("vehicles", {})
+
+    def updated_at(self, vin: str) -> datetime | None:
+        """Return when the picture of a vehicle last changed."""
+        if (entry := self._index.get(vin)) is None:
+            return None
+        return dt_util.parse_datetime(entry["updated_at"])
+
+    def is_stale(self, vin: str) -> bool:
+        """Return True when the picture of a vehicle should be checked again."""
+        if (entry := self._index.get(vin)) is None:
+            return True
+        checked_at = dt_util.parse_datetime(entry["checked_at"])
+        return checked_at is None or dt_util.utcnow() - checked_at > timedelta(
+            days=PICTURE_REVALIDATE_DAYS
+        )
+
+    async def async_get(self, vin: str) -> tuple[bytes, str] | None:
+        """Return the picture of a vehicle and its content type from the cache."""
+        if (entry := self._index.get(vin)) is None:
+            return None
+        digest = entry["digest"]
+        if digest not in self._pictures:
+            try:
+                self._pictures[digest] = await self.hass.async_add_executor_job(
+                    self._path(digest).read_bytes
+                )
+            except OSError as exc:
+                _LOGGER.debug("Could not read the picture of %s - %s", vin, exc)
+                # Fetched again on the next check.
+                del self._index[vin]
+                return None
+        return self._pictures[digest], entry["content_type"]
+
+    async def async_revalidate(self, vin: str) -> bool:
+        """Fetch the picture of a vehicle, return True when it changed."""
+        picture = await self.backend.async_fetch_picture(vin, PICTURE_ID)
+        now = dt_util.utcnow().isoformat()
+        old = self._index.get(vin)
+        if picture is None:
+            if old is not None:
+                old["checked_at"] = now
+                await self._store.async_save({"vehicles": self._index})
+            return False
+
+        content, content_type = picture
+        digest = hashlib.sha256(content).hexdigest()
+        if old is not None and old["digest"] == digest:
+            old["checked_at"] = now
+            await self._store.async_save({"vehicles": self._index})
+            return False
+
+        await self.hass.async_add_executor_job(self._write, digest, content)
+        self._pictures[digest] = content
+        self._index[vin] = {
+            "digest": digest,
+            "content_type": content_type,
+            "updated_at": now,
+            "checked_at": now,
+        }
+        if old is not None:
+            self._pictures.pop(old["digest"], None)
+        await self._store.async_save({"vehicles": self._index})
+        return True
+
+    def _path(self, digest: str) -> Path:
+        """Return the file of a picture."""
+        return self._directory / digest
+
+    def _write(self, digest: str, content: bytes) -> None:
+        """Write a picture unless a picture with the same content exists."""
+        path = self._path(digest)
+        if path.exists():
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(content)
+        temporary.replace(path)
+
+
+def picture_directory(hass: HomeAssistant) -> Path:
+    """Return the directory the pictures of all config entries are stored in."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.pictures"))
+
+
+def picture_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the picture index of a config entry."""
+    return Store(hass, PICTURE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.pictures")
+
+
+async def async_remove_pictures(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the picture index of a config entry and its pictures.
+
+    Pictures with the same content as a picture of another config entry are
+    removed as well, that entry fetches them again when it misses them.
+    """
+    store = picture_store(hass, entry_id)
+    data = await store.async_load()
+    directory = picture_directory(hass)
+
+    def remove() -> None:
+        for entry in (data or {}).get("vehicles", {}).values():
+            (directory / entry["digest"]).unlink(missing_ok=True)
+
+    await hass.async_add_executor_job(remove)
+    await store.async_remove()
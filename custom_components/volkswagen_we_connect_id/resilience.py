@@ -0,0 +1,133 @@
+"""Backoff and circuit breaker for the Volkswagen We Connect ID integration.
+
+Repeated failures and rate limited responses must not be retried at the
+polling interval, Volkswagen temporarily blocks accounts that keep trying.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BACKOFF_MAX_SECONDS,
+    BACKOFF_MIN_SECONDS,
+    CIRCUIT_BREAKER_THRESHOLD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+STATES = [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+
+
+class CircuitOpenError(UpdateFailed):
+    """Raised instead of calling the API while the circuit is open."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds of a Retry-After header, in seconds or as a date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt_util.UTC)
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Back off exponentially after failures and stop calling a failing API.
+
+    Every failure delays the next call by an exponentially growing, jittered
+    delay, or by the Retry-After of a rate limited response when that is
+    longer. After CIRCUIT_BREAKER_THRESHOLD failures in a row the circuit
+    opens and no call is made until the delay has passed. Then a single call
+    probes the API: it closes the circuit when it succeeds and opens it again
+    when it fails.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        min_delay: float = BACKOFF_MIN_SECONDS,
+        max_delay: float = BACKOFF_MAX_SECONDS,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.threshold = threshold
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.last_error: Exception | None = None
+        self._retry_at = 0.0
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may be made now."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN and time.monotonic() >= self._retry_at:
+            _LOGGER.debug("Probing the API after %d failures", self.failures)
+            self.state = STATE_HALF_OPEN
+            return
+        raise CircuitOpenError(
+            f"Paused after {self.failures} failures, retrying in "
+            f"{self.retry_in().total_seconds():.0f}s"
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("The API responds again, the circuit is closed")
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.last_error = None
+        self._retry_at = 0.0
+
+    def record_failure(
+        self, error: Exception, retry_after: float | None = None
+    ) -> None:
+        """Delay the next call after a failed call, open the circuit if needed."""
+        self.failures += 1
+        self.last_error = error
+        delay = min(self.min_delay * 2 ** (self.failures - 1), self.max_delay)
+        # Equal jitter, so that accounts failing together do not retry together.
+        delay = random.uniform(delay / 2, delay)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        self._retry_at = time.monotonic() + delay
+
+        if self.state == STATE_HALF_OPEN or self.failures >= self.threshold:
+            if self.state != STATE_OPEN:
+                _LOGGER.warning(
+                    "Pausing calls to the API for %.0fs after %d failures - %s",
+                    delay,
+                    self.failures,
+                    error,
+                )
+            self.state = STATE_OPEN
+
+    def retry_in(self) -> timedelta:
+        """Return the delay until the next call may be made."""
+        return timedelta(seconds=max(self._retry_at - time.monotonic(), 0.0))
+
+    @property
+    def retry_at(self) -> datetime | None:
+        """Return when the next call may be made, None if it may be made now."""
+        retry_in = self.retry_in()
+        if not retry_in:
+            return None
+        return dt_util.utcnow() + retry_in
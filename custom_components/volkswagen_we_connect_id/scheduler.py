@@ -0,0 +1,165 @@
+"""Adaptive per-vehicle polling for the Volkswagen We Connect ID integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+import zlib
+
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
+
+# Domains the scheduler reads to pick the interval of a vehicle.
+SCHEDULER_DOMAINS = (Domain.CHARGING, Domain.CLIMATISATION, Domain.READINESS)
+
+# Shortest delay between two refreshes of a fleet with staggered polls.
+STAGGER_MIN_REFRESH_SECONDS = 5
+
+ACTIVE_CHARGING_STATES = ("charging", "discharging")
+ACTIVE_CLIMATISATION_STATES = ("heating", "cooling", "ventilation")
+
+
+def status_value(vehicle: Vehicle, domain: str, status: str, *attributes: str):
+    """Return a raw status value of the vehicle or None when it is not reported."""
+    try:
+        value = vehicle.domains[domain][status]
+        for attribute in attributes:
+            value = getattr(value, attribute)
+    except (KeyError, AttributeError):
+        return None
+
+    if not value.enabled:
+        return None
+
+    value = value.value
+    return getattr(value, "value", value)
+
+
+class PollScheduler:
+    """Decide per vehicle how often it should be polled.
+
+    Vehicles that are charging or climatising are polled at the floor interval,
+    vehicles that are offline or parked and unplugged at the ceiling interval and
+    everything else at the configured default interval.
+
+    In fleet mode the polls of the vehicles are staggered: every vehicle is
+    polled at its own offset into its interval, derived from a hash of its
+    VIN, and the periodic refresh of the vehicle list does not poll all
+    vehicles at once.
+    """
+
+    def __init__(
+        self, floor: int, default: int, ceiling: int, stagger: bool = False
+    ) -> None:
+        """Initialize the scheduler with intervals in seconds."""
+        self.floor = floor
+        self.ceiling = max(ceiling, floor)
+        self.default = min(max(default, self.floor), self.ceiling)
+        self.stagger = stagger
+        self._next_poll: dict[str, float] = {}
+        self._next_full_poll: float = 0.0
+
+    def interval_for(self, vehicle: Vehicle) -> int:
+        """Return the polling interval in seconds for the last known vehicle state."""
+        if (
+            status_value(vehicle, "charging", "chargingStatus", "chargingState")
+            in ACTIVE_CHARGING_STATES
+            or status_value(
+                vehicle, "climatisation", "climatisationStatus", "climatisationState"
+            )
+            in ACTIVE_CLIMATISATION_STATES
+        ):
+            return self.floor
+
+        if (
+            status_value(
+                vehicle, "readiness", "readinessStatus", "connectionState", "isOnline"
+            )
+            is False
+        ):
+            return self.ceiling
+
+        if (
+            status_value(
+                vehicle, "readiness", "readinessStatus", "connectionState", "isActive"
+            )
+            is False
+            and status_value(vehicle, "charging", "plugStatus", "plugConnectionState")
+            == "disconnected"
+        ):
+            return self.ceiling
+
+        return self.default
+
+    def due_vehicles(self, vins: list[str]) -> list[str] | None:
+        """Return the vehicles to poll now, or None when a full refresh is due.
+
+        A full refresh also fetches the vehicle list, it runs on the ceiling
+        interval and whenever a vehicle is not known to the scheduler yet. In
+        fleet mode the vehicle list is refreshed along with the due vehicles
+        instead, see list_due.
+        """
+        now = time.monotonic()
+        if any(vin not in self._next_poll for vin in vins) or (
+            now >= self._next_full_poll and not self.stagger
+        ):
+            return None
+
+        return [vin for vin in vins if self._next_poll[vin] <= now]
+
+    def list_due(self) -> bool:
+        """Return True when the vehicle list should be refreshed."""
+        return time.monotonic() >= self._next_full_poll
+
+    def record_poll(
+        self,
+        vehicles: list[Vehicle],
+        polled: list[str] | None,
+        list_refreshed: bool = False,
+    ) -> None:
+        """Store the next poll time of every vehicle that was just polled."""
+        now = time.monotonic()
+        if polled is None or list_refreshed:
+            self._next_full_poll = now + self.ceiling
+        if polled is None:
+            self._next_poll.clear()
+
+        for vehicle in vehicles:
+            vin = vehicle.vin.value
+            if polled is None or vin in polled:
+                self._next_poll[vin] = self._next_poll_time(
+                    vin, self.interval_for(vehicle), now
+                )
+
+    def _next_poll_time(self, vin: str, interval: int, now: float) -> float:
+        """Return when a vehicle polled now is due again.
+
+        Staggered vehicles are due at the next multiple of their interval
+        plus their offset, so the polls of a fleet spread evenly over time.
+        """
+        if not self.stagger:
+            return now + interval
+        offset = zlib.crc32(vin.encode()) / 2**32 * interval
+        return now + interval - (now + interval - offset) % interval
+
+    def record_failure(self, vins: list[str]) -> None:
+        """Poll vehicles whose refresh failed again at the floor interval."""
+        now = time.monotonic()
+        for vin in vins:
+            self._next_poll[vin] = now + self.floor
+
+    def reset(self) -> None:
+        """Make the next refresh a full refresh."""
+        self._next_full_poll = 0.0
+        self._next_poll.clear()
+
+    def next_refresh_in(self) -> timedelta:
+        """Return the delay until the next vehicle is due.
+
+        Staggered vehicles are due at many different times, so the refreshes
+        may follow each other closer than the floor interval. Every vehicle
+        is still polled at most once per floor interval.
+        """
+        now = time.monotonic()
+        next_poll = min([self._next_full_poll, *self._next_poll.values()])
+        shortest = STAGGER_MIN_REFRESH_SECONDS if self.stagger else self.floor
+        return timedelta(seconds=min(max(next_poll - now, shortest), self.ceiling))
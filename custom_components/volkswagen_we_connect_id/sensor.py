@@ -3,9 +3,11 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import cast
+from typing import Any, cast
 
 from weconnect import weconnect
+from weconnect.domain import Domain
+from weconnect.elements.vehicle import Vehicle
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -15,21 +17,33 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     PERCENTAGE,
+    Platform,
     UnitOfPower,
     UnitOfTemperature,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfSpeed,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
 
 from . import DomainEntry, VolkswagenIDBaseEntity, get_object_value
+from .charging_sessions import ChargingSessionRecorder
 from .const import DOMAIN
+from .metrics import PHASES, RefreshMetrics
+from .resilience import STATES, CircuitBreaker
+from .snapshot import reported_element, reported_status
 
 
 @dataclass
@@ -37,6 +51,14 @@ class VolkswagenIdEntityDescription(SensorEntityDescription):
     """Describes Volkswagen ID sensor entity."""
 
     value: Callable = lambda x, y: x
+    domain: Domain | None = None
+    # The status of the domain the value is read from.
+    status: str | None = None
+
+
+def _celsius(kelvin: float | None) -> float | None:
+    """Convert a temperature in kelvin, None when it is not reported."""
+    return None if kelvin is None else kelvin - 273.15
 
 
 SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
@@ -44,14 +66,16 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="carType",
         name="Car Type",
         icon="mdi:car",
-        value=lambda data: data["fuelStatus"][
-            "rangeStatus"
-        ].carType.value,
+        domain=Domain.FUEL_STATUS,
+        status="rangeStatus",
+        value=lambda data: data["fuelStatus"]["rangeStatus"].carType.value,
     ),
     VolkswagenIdEntityDescription(
         key="climatisationState",
         name="Climatisation State",
         icon="mdi:fan",
+        domain=Domain.CLIMATISATION,
+        status="climatisationStatus",
         value=lambda data: data["climatisation"][
             "climatisationStatus"
         ].climatisationState.value,
@@ -61,6 +85,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Remaining Climatisation Time",
         icon="mdi:fan-clock",
         native_unit_of_measurement=UnitOfTime.MINUTES,
+        domain=Domain.CLIMATISATION,
+        status="climatisationStatus",
         value=lambda data: data["climatisation"][
             "climatisationStatus"
         ].remainingClimatisationTime_min.value,
@@ -70,6 +96,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Target Temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].targetTemperature_C.value,
@@ -77,6 +105,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
     VolkswagenIdEntityDescription(
         key="unitInCar",
         name="Unit In car",
+        domain=Domain.CLIMATISATION,
+        status="climatisationSettings",
         value=lambda data: data["climatisation"][
             "climatisationSettings"
         ].unitInCar.value,
@@ -85,6 +115,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="chargingState",
         name="Charging State",
         icon="mdi:ev-station",
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargingState.value,
     ),
     VolkswagenIdEntityDescription(
@@ -92,6 +124,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Remaining Charging Time",
         icon="mdi:battery-clock",
         native_unit_of_measurement=UnitOfTime.MINUTES,
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"][
             "chargingStatus"
         ].remainingChargingTimeToComplete_min.value,
@@ -100,6 +134,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="chargeMode",
         name="Charging Mode",
         icon="mdi:ev-station",
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargeMode.value,
     ),
     VolkswagenIdEntityDescription(
@@ -107,6 +143,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Charge Power",
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         device_class=SensorDeviceClass.POWER,
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargePower_kW.value,
     ),
     VolkswagenIdEntityDescription(
@@ -114,24 +152,32 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Charge Rate",
         native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
         device_class=SensorDeviceClass.SPEED,
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargeRate_kmph.value,
     ),
     VolkswagenIdEntityDescription(
         key="chargingSettings",
         name="Charging Settings",
         icon="mdi:ev-station",
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargingSettings.value,
     ),
     VolkswagenIdEntityDescription(
         key="chargeType",
         name="Charge Type",
         icon="mdi:ev-station",
+        domain=Domain.CHARGING,
+        status="chargingStatus",
         value=lambda data: data["charging"]["chargingStatus"].chargeType.value,
     ),
     VolkswagenIdEntityDescription(
         key="maxChargeCurrentAC",
         name="Max Charge Current AC",
         icon="mdi:ev-station",
+        domain=Domain.CHARGING,
+        status="chargingSettings",
         value=lambda data: data["charging"][
             "chargingSettings"
         ].maxChargeCurrentAC.value,
@@ -141,6 +187,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="Target State of Charge",
         device_class=SensorDeviceClass.BATTERY,
         native_unit_of_measurement=PERCENTAGE,
+        domain=Domain.CHARGING,
+        status="chargingSettings",
         value=lambda data: data["charging"]["chargingSettings"].targetSOC_pct.value,
     ),
     VolkswagenIdEntityDescription(
@@ -148,6 +196,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         name="State of Charge",
         device_class=SensorDeviceClass.BATTERY,
         native_unit_of_measurement=PERCENTAGE,
+        domain=Domain.CHARGING,
+        status="batteryStatus",
         value=lambda data: data["charging"]["batteryStatus"].currentSOC_pct.value,
     ),
     VolkswagenIdEntityDescription(
@@ -156,6 +206,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:car-arrow-right",
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        domain=Domain.CHARGING,
+        status="batteryStatus",
         value=lambda data: data["charging"][
             "batteryStatus"
         ].cruisingRangeElectric_km.value,
@@ -165,6 +217,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="inspectionDue",
         icon="mdi:wrench-clock-outline",
         native_unit_of_measurement=UnitOfTime.DAYS,
+        domain=Domain.VEHICLE_HEALTH_INSPECTION,
+        status="maintenanceStatus",
         value=lambda data: data["vehicleHealthInspection"][
             "maintenanceStatus"
         ].inspectionDue_days.value,
@@ -175,6 +229,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:wrench-clock-outline",
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        domain=Domain.VEHICLE_HEALTH_INSPECTION,
+        status="maintenanceStatus",
         value=lambda data: data["vehicleHealthInspection"][
             "maintenanceStatus"
         ].inspectionDue_km.value,
@@ -185,164 +241,208 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:car-cruise-control",
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        domain=Domain.MEASUREMENTS,
+        status="odometerStatus",
         value=lambda data: data["measurements"]["odometerStatus"].odometer.value,
     ),
     VolkswagenIdEntityDescription(
         key="doorLockStatus",
         name="Door Lock Status",
         icon="mdi:car-door-lock",
+        domain=Domain.ACCESS,
+        status="accessStatus",
         value=lambda data: data["access"]["accessStatus"].doorLockStatus.value,
     ),
     VolkswagenIdEntityDescription(
         key="bonnetLockStatus",
         name="Bonnet Lock Status",
         icon="mdi:lock-outline",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["bonnet"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "bonnet", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="trunkLockStatus",
         name="Trunk Lock Status",
         icon="mdi:lock-outline",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["trunk"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "trunk", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="rearRightLockStatus",
         name="Door Rear Right Lock Status",
         icon="mdi:car-door-lock",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["rearRight"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "rearRight", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="rearLeftLockStatus",
         name="Door Rear Left Lock Status",
         icon="mdi:car-door-lock",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["rearLeft"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "rearLeft", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="frontLeftLockStatus",
         name="Door Front Left Lock Status",
         icon="mdi:car-door-lock",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["frontLeft"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "frontLeft", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="frontRightLockStatus",
         name="Door Front Right Lock Status",
         icon="mdi:car-door-lock",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["frontRight"]
-        .lockState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "frontRight", "lockState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="bonnetOpenStatus",
         name="Bonnet Open Status",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["bonnet"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "bonnet", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="trunkOpenStatus",
         name="Trunk Open Status",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["trunk"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "trunk", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="rearRightOpenStatus",
         name="Door Rear Right Open Status",
         icon="mdi:car-door",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["rearRight"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "rearRight", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="rearLeftOpenStatus",
         name="Door Rear Left Open Status",
         icon="mdi:car-door",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["rearLeft"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "rearLeft", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="frontLeftOpenStatus",
         name="Door Front Left Open Status",
         icon="mdi:car-door",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["frontLeft"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "frontLeft", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="frontRightOpenStatus",
         name="Door Front Right Open Status",
         icon="mdi:car-door",
-        value=lambda data: data["access"]["accessStatus"]
-        .doors["frontRight"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].doors, "frontRight", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="sunRoofStatus",
         name="Sunroof Open Status",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["sunRoof"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "sunRoof", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="roofCoverStatus",
         name="Sunroof Cover Status",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["roofCover"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "roofCover", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="windowRearRightOpenStatus",
         name="Window Rear Right Open Status",
         icon="mdi:window-closed",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["rearRight"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "rearRight", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="windowRearLeftOpenStatus",
         name="Window Rear Left Open Status",
         icon="mdi:window-closed",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["rearLeft"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "rearLeft", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="windowFrontLeftOpenStatus",
         name="Window Front Left Open Status",
         icon="mdi:window-closed",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["frontLeft"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "frontLeft", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="windowfrontRightOpenStatus",
         name="Window Front Right Open Status",
         icon="mdi:window-closed",
-        value=lambda data: data["access"]["accessStatus"]
-        .windows["frontRight"]
-        .openState.value,
+        domain=Domain.ACCESS,
+        status="accessStatus",
+        value=lambda data: reported_element(
+            data["access"]["accessStatus"].windows, "frontRight", "openState"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="overallStatus",
         name="Overall Status",
         icon="mdi:car-info",
+        domain=Domain.ACCESS,
+        status="accessStatus",
         value=lambda data: data["access"]["accessStatus"].overallStatus.value,
     ),
     VolkswagenIdEntityDescription(
         key="autoUnlockPlugWhenCharged",
         name="Auto Unlock Plug When Charged",
         icon="mdi:ev-plug-type2",
+        domain=Domain.CHARGING,
+        status="chargingSettings",
         value=lambda data: data["charging"][
             "chargingSettings"
         ].autoUnlockPlugWhenCharged.value,
@@ -351,6 +451,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="autoUnlockPlugWhenChargedAC",
         name="Auto Unlock Plug When Charged AC",
         icon="mdi:ev-plug-type2",
+        domain=Domain.CHARGING,
+        status="chargingSettings",
         value=lambda data: data["charging"][
             "chargingSettings"
         ].autoUnlockPlugWhenChargedAC.value,
@@ -359,12 +461,16 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="plugConnectionState",
         name="Plug Connection State",
         icon="mdi:ev-plug-type2",
+        domain=Domain.CHARGING,
+        status="plugStatus",
         value=lambda data: data["charging"]["plugStatus"].plugConnectionState,
     ),
     VolkswagenIdEntityDescription(
         key="plugLockState",
         name="Plug Lock State",
         icon="mdi:ev-plug-type2",
+        domain=Domain.CHARGING,
+        status="plugStatus",
         value=lambda data: data["charging"]["plugStatus"].plugLockState,
     ),
     VolkswagenIdEntityDescription(
@@ -372,7 +478,11 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="fuelLevel",
         icon="mdi:fuel",
         native_unit_of_measurement=PERCENTAGE,
-        value=lambda data: data["fuelStatus"]["rangeStatus"].primaryEngine.currentFuelLevel_pct.value,
+        domain=Domain.FUEL_STATUS,
+        status="rangeStatus",
+        value=lambda data: data["fuelStatus"][
+            "rangeStatus"
+        ].primaryEngine.currentFuelLevel_pct.value,
     ),
     VolkswagenIdEntityDescription(
         name="Gasoline Range",
@@ -380,15 +490,17 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:car-arrow-right",
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
-        value=lambda data: data["measurements"][
-            "rangeStatus"
-        ].gasolineRange.value,
+        domain=Domain.MEASUREMENTS,
+        status="rangeStatus",
+        value=lambda data: data["measurements"]["rangeStatus"].gasolineRange.value,
     ),
     VolkswagenIdEntityDescription(
         name="Oil Inspection days",
         key="oilInspectionDue",
         icon="mdi:wrench-clock-outline",
         native_unit_of_measurement=UnitOfTime.DAYS,
+        domain=Domain.VEHICLE_HEALTH_INSPECTION,
+        status="maintenanceStatus",
         value=lambda data: data["vehicleHealthInspection"][
             "maintenanceStatus"
         ].oilServiceDue_days.value,
@@ -399,6 +511,8 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:wrench-clock-outline",
         device_class=SensorDeviceClass.DISTANCE,
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        domain=Domain.VEHICLE_HEALTH_INSPECTION,
+        status="maintenanceStatus",
         value=lambda data: data["vehicleHealthInspection"][
             "maintenanceStatus"
         ].oilServiceDue_km.value,
@@ -409,9 +523,13 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:thermometer",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        value=lambda data: data["measurements"][
-            "temperatureBatteryStatus"
-        ].temperatureHvBatteryMin_K.value - 273.15,
+        domain=Domain.MEASUREMENTS,
+        status="temperatureBatteryStatus",
+        value=lambda data: _celsius(
+            data["measurements"][
+                "temperatureBatteryStatus"
+            ].temperatureHvBatteryMin_K.value
+        ),
     ),
     VolkswagenIdEntityDescription(
         name="HV Battery Temperature Max",
@@ -419,11 +537,14 @@ SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         icon="mdi:thermometer",
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        value=lambda data: data["measurements"][
-            "temperatureBatteryStatus"
-        ].temperatureHvBatteryMax_K.value - 273.15,
+        domain=Domain.MEASUREMENTS,
+        status="temperatureBatteryStatus",
+        value=lambda data: _celsius(
+            data["measurements"][
+                "temperatureBatteryStatus"
+            ].temperatureHvBatteryMax_K.value
+        ),
     ),
-
 )
 
 VEHICLE_SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
@@ -431,18 +552,96 @@ VEHICLE_SENSORS: tuple[VolkswagenIdEntityDescription, ...] = (
         key="lastTripAverageElectricConsumption",
         name="Last Trip Average Electric consumption",
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        value=lambda vehicle: vehicle.trips["shortTerm"].averageElectricConsumption.value,
+        domain=Domain.TRIPS,
+        value=lambda vehicle: reported_element(
+            vehicle.trips, "shortTerm", "averageElectricConsumption"
+        ),
     ),
     VolkswagenIdEntityDescription(
         key="lastTripAverageFuelConsumption",
         name="Last Trip Average Fuel consumption",
         native_unit_of_measurement="l/100km",
-        value=lambda vehicle: vehicle.trips["shortTerm"].averageFuelConsumption.value,
+        domain=Domain.TRIPS,
+        value=lambda vehicle: reported_element(
+            vehicle.trips, "shortTerm", "averageFuelConsumption"
+        ),
     ),
+)
+
 
+@dataclass
+class VolkswagenIdMetricDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of the refreshes of a config entry."""
+
+    value: Callable[[RefreshMetrics], StateType] = lambda metrics: None
+
+
+METRIC_SENSORS: tuple[VolkswagenIdMetricDescription, ...] = (
+    *(
+        VolkswagenIdMetricDescription(
+            key=f"{phase}_duration",
+            name=f"Last {phase} duration",
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            suggested_display_precision=0,
+            value=lambda metrics, phase=phase: None
+            if phase not in metrics.phases
+            else metrics.phases[phase] * 1000,
+        )
+        for phase in PHASES
+    ),
+    VolkswagenIdMetricDescription(
+        key="api_calls",
+        name="API calls",
+        icon="mdi:api",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value=lambda metrics: metrics.api_calls,
+    ),
+    VolkswagenIdMetricDescription(
+        key="bytes_received",
+        name="Bytes received",
+        icon="mdi:download-network",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value=lambda metrics: metrics.bytes_received,
+    ),
+    VolkswagenIdMetricDescription(
+        key="skipped_refreshes",
+        name="Skipped refreshes",
+        icon="mdi:debug-step-over",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value=lambda metrics: metrics.skipped_refreshes,
+    ),
+    VolkswagenIdMetricDescription(
+        key="paused_refreshes",
+        name="Paused refreshes",
+        icon="mdi:pause-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value=lambda metrics: metrics.paused_refreshes,
+    ),
+    VolkswagenIdMetricDescription(
+        key="failures",
+        name="Failed refreshes",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value=lambda metrics: metrics.failures,
+    ),
 )
 
 
+def account_device_info(config_entry: ConfigEntry) -> DeviceInfo:
+    """Return the service device of the account of a config entry."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"account-{config_entry.entry_id}")},
+        entry_type=DeviceEntryType.SERVICE,
+        manufacturer="Volkswagen",
+        name=f"Volkswagen We Connect ID ({config_entry.title})",
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -453,16 +652,43 @@ async def async_setup_entry(
     we_connect = domain_entry.we_connect
     coordinator = domain_entry.coordinator
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
-
-    entities: list[VolkswagenIDSensor] = []
-
-    for index, vehicle in enumerate(coordinator.data):
-        for sensor in SENSORS:
-            entities.append(VolkswagenIDSensor(sensor, we_connect, coordinator, index))
-        for sensor in VEHICLE_SENSORS:
-            entities.append(VolkswagenIDVehicleSensor(sensor, we_connect, coordinator, index))
+    entities: list[SensorEntity] = []
+
+    for vin in coordinator.data:
+        entities.extend(
+            domain_entry.capabilities.async_supported_entities(
+                Platform.SENSOR,
+                coordinator,
+                vin,
+                [
+                    *(
+                        VolkswagenIDSensor(sensor, we_connect, coordinator, vin)
+                        for sensor in SENSORS
+                    ),
+                    *(
+                        VolkswagenIDVehicleSensor(sensor, we_connect, coordinator, vin)
+                        for sensor in VEHICLE_SENSORS
+                    ),
+                ],
+            )
+        )
+        entities.append(
+            VolkswagenIDChargedEnergySensor(
+                we_connect, coordinator, vin, domain_entry.charging_sessions
+            )
+        )
+
+    entities.append(
+        VolkswagenIDApiStatusSensor(
+            config_entry, coordinator, domain_entry.backend.breaker
+        )
+    )
+    for sensor in METRIC_SENSORS:
+        entities.append(
+            VolkswagenIDMetricSensor(
+                sensor, config_entry, coordinator, domain_entry.metrics
+            )
+        )
 
     if entities:
         async_add_entities(entities)
@@ -478,12 +704,14 @@ class VolkswagenIDSensor(VolkswagenIDBaseEntity, SensorEntity):
         sensor: VolkswagenIdEntityDescription,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin)
 
         self.entity_description = sensor
+        self.required_domains = (sensor.domain,)
+        self.snapshot_key = sensor.key
         self._coordinator = coordinator
         self._attr_name = f"{self.data.nickname} {sensor.name}"
         self._attr_unique_id = f"{self.data.vin}-{sensor.key}"
@@ -491,16 +719,18 @@ class VolkswagenIDSensor(VolkswagenIDBaseEntity, SensorEntity):
             self._attr_native_unit_of_measurement = sensor.native_unit_of_measurement
             self._attr_state_class = SensorStateClass.MEASUREMENT
 
+    def read_value(self, vehicle: Vehicle) -> StateType:
+        """Read the state from a vehicle."""
+        sensor = self.entity_description
+        if reported_status(vehicle.domains, sensor.domain.value, sensor.status) is None:
+            return None
+        return get_object_value(sensor.value(vehicle.domains))
+
     @property
     def native_value(self) -> StateType:
         """Return the state."""
+        return cast(StateType, self.snapshot_value)
 
-        try:
-            state = get_object_value(self.entity_description.value(self.data.domains))
-        except (TypeError, KeyError, ValueError):
-            return None
-
-        return cast(StateType, state)
 
 class VolkswagenIDVehicleSensor(VolkswagenIDBaseEntity, SensorEntity):
     """Representation of a VolkswagenID vehicle sensor."""
@@ -512,12 +742,14 @@ class VolkswagenIDVehicleSensor(VolkswagenIDBaseEntity, SensorEntity):
         sensor: VolkswagenIdEntityDescription,
         we_connect: weconnect.WeConnect,
         coordinator: DataUpdateCoordinator,
-        index: int,
+        vin: str,
     ) -> None:
         """Initialize VolkswagenID vehicle sensor."""
-        super().__init__(we_connect, coordinator, index)
+        super().__init__(we_connect, coordinator, vin)
 
         self.entity_description = sensor
+        self.required_domains = (sensor.domain,)
+        self.snapshot_key = sensor.key
         self._coordinator = coordinator
         self._attr_name = f"{self.data.nickname} {sensor.name}"
         self._attr_unique_id = f"{self.data.vin}-{sensor.key}"
@@ -525,13 +757,134 @@ class VolkswagenIDVehicleSensor(VolkswagenIDBaseEntity, SensorEntity):
             self._attr_native_unit_of_measurement = sensor.native_unit_of_measurement
             self._attr_state_class = SensorStateClass.MEASUREMENT
 
+    def read_value(self, vehicle: Vehicle) -> StateType:
+        """Read the state from a vehicle."""
+        return get_object_value(self.entity_description.value(vehicle))
+
     @property
     def native_value(self) -> StateType:
         """Return the state."""
+        return cast(StateType, self.snapshot_value)
 
-        try:
-            state = get_object_value(self.entity_description.value(self.data))
-        except (KeyError, ValueError):
-            return None
 
-        return cast(StateType, state)
+class VolkswagenIDChargedEnergySensor(VolkswagenIDBaseEntity, SensorEntity):
+    """Energy a vehicle charged, integrated from its charging power."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 2
+    required_domains = (Domain.CHARGING,)
+    snapshot_key = "chargedEnergy"
+
+    def __init__(
+        self,
+        we_connect: weconnect.WeConnect,
+        coordinator: DataUpdateCoordinator,
+        vin: str,
+        charging_sessions: ChargingSessionRecorder,
+    ) -> None:
+        """Initialize the charged energy sensor."""
+        super().__init__(we_connect, coordinator, vin)
+        self._charging_sessions = charging_sessions
+        self._attr_name = f"{self.data.nickname} Charged Energy"
+        self._attr_unique_id = f"{self.data.vin}-{self.snapshot_key}"
+
+    def read_value(self, vehicle: Vehicle) -> float | None:
+        """Read the charged energy of a vehicle."""
+        return self._charging_sessions.energy(vehicle.vin.value)
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        return cast(StateType, self.snapshot_value)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the start and energy of the running charging session."""
+        attributes = super().extra_state_attributes or {}
+        charging = self._charging_sessions.vehicles.get(self._vin)
+        if charging is not None and charging.session_start is not None:
+            attributes["session_start"] = charging.session_start.isoformat()
+            attributes["session_energy"] = round(charging.session_energy_kwh or 0.0, 3)
+        return attributes or None
+
+
+class VolkswagenIDApiStatusSensor(CoordinatorEntity, SensorEntity):
+    """State of the circuit breaker in front of the Volkswagen API."""
+
+    _attr_attribution = "Data provided by Volkswagen Connect ID"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:api"
+    _attr_options = STATES
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        coordinator: DataUpdateCoordinator,
+        breaker: CircuitBreaker,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._breaker = breaker
+        self._attr_name = "Volkswagen API status"
+        self._attr_unique_id = f"{config_entry.entry_id}-api_status"
+        self._attr_device_info = account_device_info(config_entry)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the state is known while the API fails."""
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the state of the circuit breaker."""
+        return self._breaker.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the failures and when the API is called again."""
+        retry_at = self._breaker.retry_at
+        return {
+            "consecutive_failures": self._breaker.failures,
+            "retry_at": None if retry_at is None else retry_at.isoformat(),
+            "last_error": None
+            if self._breaker.last_error is None
+            else str(self._breaker.last_error),
+        }
+
+
+class VolkswagenIDMetricSensor(CoordinatorEntity, SensorEntity):
+    """Timing or counter of the refreshes of a config entry."""
+
+    entity_description: VolkswagenIdMetricDescription
+
+    _attr_attribution = "Data provided by Volkswagen Connect ID"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        sensor: VolkswagenIdMetricDescription,
+        config_entry: ConfigEntry,
+        coordinator: DataUpdateCoordinator,
+        metrics: RefreshMetrics,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = sensor
+        self._metrics = metrics
+        self._attr_name = f"Volkswagen {sensor.name}"
+        self._attr_unique_id = f"{config_entry.entry_id}-{sensor.key}"
+        self._attr_device_info = account_device_info(config_entry)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are known while the API fails."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        return self.entity_description.value(self._metrics)
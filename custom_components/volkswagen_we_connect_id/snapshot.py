@@ -0,0 +1,98 @@
+"""Per-vehicle value snapshots for the Volkswagen We Connect ID integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from weconnect.elements.vehicle import Vehicle
+
+
+def reported_status(
+    domains: Mapping[str, Mapping[str, Any]], domain: str, status: str
+) -> Any:
+    """Return a status of a vehicle, None when the vehicle does not report it.
+
+    Readers check their status with it before reading its attributes, so a
+    value the vehicle does not report is read without raising.
+    """
+    element = domains.get(domain, {}).get(status)
+    if element is None or not element.enabled:
+        return None
+    return element
+
+
+def reported_element(elements: Mapping[str, Any], name: str, attribute: str) -> Any:
+    """Return an attribute of a named element, e.g. a door of the access status.
+
+    None when the vehicle does not report the element.
+    """
+    element = elements.get(name)
+    if element is None or not element.enabled:
+        return None
+    return getattr(element, attribute)
+
+
+class VehicleSnapshot:
+    """Immutable values of every registered reader for one vehicle.
+
+    The key to position index is shared by the snapshots of all vehicles built
+    from the same set of readers.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: Mapping[str, int], values: tuple[Any, ...]) -> None:
+        """Initialize the snapshot."""
+        self._index = index
+        self._values = values
+
+    @property
+    def index(self) -> Mapping[str, int]:
+        """Return the key to position index of the snapshot."""
+        return self._index
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the snapshot has a value for the key."""
+        return key in self._index
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both snapshots have the same keys and values."""
+        if not isinstance(other, VehicleSnapshot):
+            return NotImplemented
+        return self._index is other._index and self._values == other._values
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a key."""
+        return self._values[self._index[key]]
+
+    def keys(self):
+        """Return the keys of the snapshot."""
+        return self._index.keys()
+
+
+def build_snapshot(
+    vehicle: Vehicle,
+    readers: Mapping[str, Callable[[Vehicle], Any]],
+    index: Mapping[str, int],
+) -> VehicleSnapshot:
+    """Run every reader once on the vehicle.
+
+    The readers must be in the order of the index.
+    """
+    return VehicleSnapshot(index, tuple(reader(vehicle) for reader in readers.values()))
+
+
+def update_snapshot(
+    snapshot: VehicleSnapshot,
+    vehicle: Vehicle,
+    readers: Mapping[str, Callable[[Vehicle], Any]],
+    keys: Iterable[str],
+) -> VehicleSnapshot:
+    """Run the readers of some keys again, keep the other values."""
+    index = snapshot.index
+    values = list(snapshot._values)  # pylint: disable=protected-access
+    for key in keys:
+        values[index[key]] = readers[key](vehicle)
+    return VehicleSnapshot(index, tuple(values))
@@ -0,0 +1,273 @@
+"""Trip history in the long-term statistics of Home Assistant.
+
+The trip sensors only show the last trip. The importer fetches the trips every
+vehicle ended since the last import and adds their distance, travel time and
+consumption to external statistics, one row per hour. A watermark per vehicle
+and trip type remembers the last imported trip and the running sums, so every
+trip is imported once. Long-term and cyclic trips are running totals the
+vehicle updates in place, only what they grew by since the last import is
+added. The first import of a vehicle backfills its history.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from weconnect.elements.trip import Trip
+from weconnect.elements.vehicle import Vehicle
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfLength, UnitOfTime, UnitOfVolume
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, TRIP_BACKFILL_DAYS, TRIP_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .backend import AsyncWeConnectBackend
+
+_LOGGER = logging.getLogger(__name__)
+
+TRIP_TYPES = tuple(
+    trip_type for trip_type in Trip.TripType if trip_type != Trip.TripType.UNKNOWN
+)
+
+# The vehicles keep adding to the last trip of these types until they start a
+# new one.
+CUMULATIVE_TRIP_TYPES = (Trip.TripType.LONGTERM, Trip.TripType.CYCLIC)
+
+
+def _per_distance(trip: dict[str, Any], average: str) -> float | None:
+    """Return the total of an average per 100 km over the distance of a trip."""
+    if trip.get(average) is None or trip.get("mileage_km") is None:
+        return None
+    return trip["mileage_km"] * trip[average] / 100
+
+
+@dataclass(frozen=True)
+class TripQuantity:
+    """A quantity of trips that is summed into a statistic."""
+
+    key: str
+    name: str
+    unit: str
+    value: Callable[[dict[str, Any]], float | None]
+
+
+TRIP_QUANTITIES = (
+    TripQuantity(
+        "distance",
+        "Distance",
+        UnitOfLength.KILOMETERS,
+        lambda trip: trip.get("mileage_km"),
+    ),
+    TripQuantity(
+        "travel_time",
+        "Travel time",
+        UnitOfTime.MINUTES,
+        lambda trip: trip.get("travelTime"),
+    ),
+    TripQuantity(
+        "electric_energy",
+        "Electric energy",
+        UnitOfEnergy.KILO_WATT_HOUR,
+        lambda trip: _per_distance(trip, "averageElectricConsumption"),
+    ),
+    TripQuantity(
+        "fuel",
+        "Fuel",
+        UnitOfVolume.LITERS,
+        lambda trip: _per_distance(trip, "averageFuelConsumption"),
+    ),
+)
+
+
+def statistic_id(vin: str, trip_type: Trip.TripType, quantity: TripQuantity) -> str:
+    """Return the id of the statistic of a quantity of the trips of a vehicle."""
+    return f"{DOMAIN}:{vin.lower()}_{trip_type.value.lower()}_{quantity.key}"
+
+
+def _trip_end(trip: dict[str, Any]) -> datetime | None:
+    """Return when a trip of the API ended."""
+    end = trip.get("tripEndTimestamp")
+    return dt_util.parse_datetime(end) if isinstance(end, str) else None
+
+
+class TripStatisticsImporter:
+    """Import the trips of the vehicles of a config entry into statistics."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        backend: AsyncWeConnectBackend,
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.entry = entry
+        self.backend = backend
+        self._store = trip_store(hass, entry.entry_id)
+        # Per VIN and trip type: the end of the last imported trip, and the
+        # hour, hourly value and sum of the last row of every statistic.
+        self._watermarks: dict[str, dict[str, dict[str, Any]]] | None = None
+        self._importing = False
+
+    @callback
+    def async_schedule(self, vehicles: dict[str, Vehicle]) -> None:
+        """Import the trips of vehicles whose last trip is not imported yet.
+
+        The import runs in the background. Nothing happens while an import is
+        running, its vehicles are checked again after the next refresh.
+        """
+        if self._importing or "recorder" not in self.hass.config.components:
+            return
+
+        due = [
+            (vin, trip_type, last_end)
+            for vin, vehicle in vehicles.items()
+            for trip_type in TRIP_TYPES
+            if (last_end := self._new_trip_end(vin, vehicle, trip_type)) is not None
+        ]
+        if due:
+            self._importing = True
+            self.entry.async_create_background_task(
+                self.hass, self._async_import(due), f"{DOMAIN} trip statistics import"
+            )
+
+    def _new_trip_end(
+        self, vin: str, vehicle: Vehicle, trip_type: Trip.TripType
+    ) -> datetime | None:
+        """Return the end of the last trip of a type if it is not imported yet."""
+        trip = vehicle.trips.get(trip_type.value)
+        if trip is None or not trip.enabled or not trip.tripEndTimestamp.enabled:
+            return None
+        end: datetime = trip.tripEndTimestamp.value
+        watermark = (self._watermarks or {}).get(vin, {}).get(trip_type.value)
+        if watermark is not None and dt_util.parse_datetime(watermark["end"]) >= end:
+            return None
+        return end
+
+    async def _async_import(
+        self, due: list[tuple[str, Trip.TripType, datetime]]
+    ) -> None:
+        """Import the new trips, then save the watermarks once.
+
+        The watermark also moves to the last trip the vehicle reported when
+        the history lacks it, so the same trips are not fetched every refresh.
+        """
+        try:
+            if self._watermarks is None:
+                self._watermarks = (await self._store.async_load() or {}).get(
+                    "watermarks", {}
+                )
+
+            imported = 0
+            for vin, trip_type, last_end in due:
+                watermark = self._watermarks.get(vin, {}).get(trip_type.value)
+                start = (
+                    dt_util.utcnow() - timedelta(days=TRIP_BACKFILL_DAYS)
+                    if watermark is None
+                    else dt_util.parse_datetime(watermark["end"])
+                )
+                try:
+                    trips = await self.backend.async_fetch_trips(vin, trip_type, start)
+                except Exception as exc:  # pylint: disable=broad-except
+                    _LOGGER.debug(
+                        "Could not fetch the %s trips of %s - %s",
+                        trip_type.value,
+                        vin,
+                        exc,
+                    )
+                    continue
+
+                new_trips = sorted(
+                    (
+                        (end, trip)
+                        for trip in trips
+                        if (end := _trip_end(trip)) is not None and end > start
+                    ),
+                    key=lambda end_trip: end_trip[0],
+                )
+                watermark = watermark or {"end": None, "statistics": {}}
+                for quantity in TRIP_QUANTITIES:
+                    rows = _hourly_rows(
+                        new_trips,
+                        quantity,
+                        watermark["statistics"],
+                        trip_type in CUMULATIVE_TRIP_TYPES,
+                    )
+                    if not rows:
+                        continue
+                    async_add_external_statistics(
+                        self.hass,
+                        StatisticMetaData(
+                            has_mean=False,
+                            has_sum=True,
+                            name=f"{vin} {trip_type.value} trips {quantity.name.lower()}",
+                            source=DOMAIN,
+                            statistic_id=statistic_id(vin, trip_type, quantity),
+                            unit_of_measurement=quantity.unit,
+                        ),
+                        [
+                            StatisticData(start=hour, state=state, sum=total)
+                            for hour, (state, total) in rows.items()
+                        ],
+                    )
+                watermark["end"] = (
+                    max(last_end, new_trips[-1][0]) if new_trips else last_end
+                ).isoformat()
+                self._watermarks.setdefault(vin, {})[trip_type.value] = watermark
+                imported += len(new_trips)
+
+            _LOGGER.debug("Imported %d trips into the statistics", imported)
+            await self._store.async_save({"watermarks": self._watermarks})
+        finally:
+            self._importing = False
+
+
+def _hourly_rows(
+    trips: list[tuple[datetime, dict[str, Any]]],
+    quantity: TripQuantity,
+    statistics: dict[str, dict[str, Any]],
+    cumulative: bool = False,
+) -> dict[datetime, tuple[float, float]]:
+    """Sum the values of trips per hour they ended in, after the last row.
+
+    Returns the value and running sum per hour and moves the last row of the
+    statistic in statistics forward. A trip in the hour of the last row is
+    added to that row. Cumulative trips are running totals, a trip that was
+    imported before only adds what its value grew by since.
+    """
+    last = statistics.get(quantity.key, {"hour": None, "state": 0.0, "sum": 0.0})
+    rows: dict[datetime, tuple[float, float]] = {}
+    for end, trip in trips:
+        value = quantity.value(trip)
+        if value is None:
+            continue
+        total = value
+        trip_id = trip.get("id", trip.get("startMileage_km"))
+        # A total that shrank belongs to a trip the vehicle started afresh.
+        if cumulative and last.get("trip") == trip_id and value >= last["total"]:
+            value -= last["total"]
+        hour = dt_util.as_utc(end).replace(minute=0, second=0, microsecond=0)
+        if last["hour"] != hour.isoformat():
+            last = {"hour": hour.isoformat(), "state": 0.0, "sum": last["sum"]}
+        last["state"] += value
+        last["sum"] += value
+        if cumulative:
+            last["trip"] = trip_id
+            last["total"] = total
+        rows[hour] = (last["state"], last["sum"])
+    statistics[quantity.key] = last
+    return rows
+
+
+def trip_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the trip import watermarks of a config entry."""
+    return Store(hass, TRIP_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.trips")
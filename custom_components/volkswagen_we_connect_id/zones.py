@@ -0,0 +1,108 @@
+"""Zone lookups for the device trackers of the Volkswagen We Connect ID integration.
+
+Home Assistant resolves the zone of a tracker by measuring the distance to
+every zone on every state write. The index puts the active zones into a grid
+of cells once, so a lookup only measures the zones of one cell. It is rebuilt
+on the next lookup after a zone changed.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+import math
+
+from homeassistant.components import zone
+from homeassistant.components.zone.const import ATTR_PASSIVE, ATTR_RADIUS
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, STATE_UNAVAILABLE
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import TrackStates, async_track_state_change_filtered
+from homeassistant.util.location import distance
+
+# Size of the cells of the grid in degrees, roughly 11 km north to south.
+CELL_DEGREES = 0.1
+METERS_PER_DEGREE = 111_320
+
+
+def _cell(latitude: float, longitude: float) -> tuple[int, int]:
+    """Return the cell of a position."""
+    return (
+        math.floor(latitude / CELL_DEGREES),
+        math.floor(longitude / CELL_DEGREES),
+    )
+
+
+class ZoneIndex:
+    """Grid of the active zones of Home Assistant."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index, it is built on the first lookup."""
+        self.hass = hass
+        self._cells: dict[tuple[int, int], list[State]] | None = None
+        self._tracker = async_track_state_change_filtered(
+            hass, TrackStates(False, set(), {zone.DOMAIN}), self._async_zone_changed
+        )
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop following the changes of the zones."""
+        self._tracker.async_remove()
+
+    @callback
+    def _async_zone_changed(self, event: Event) -> None:
+        """Rebuild the index on the next lookup."""
+        self._cells = None
+
+    def _build(self) -> dict[tuple[int, int], list[State]]:
+        """Put every active zone into the cells its circle overlaps."""
+        cells: dict[tuple[int, int], list[State]] = defaultdict(list)
+        for state in self.hass.states.async_all(zone.DOMAIN):
+            attributes = state.attributes
+            if (
+                state.state == STATE_UNAVAILABLE
+                or attributes.get(ATTR_PASSIVE)
+                or attributes.get(ATTR_LATITUDE) is None
+                or attributes.get(ATTR_LONGITUDE) is None
+                or attributes.get(ATTR_RADIUS) is None
+            ):
+                continue
+            latitude = attributes[ATTR_LATITUDE]
+            longitude = attributes[ATTR_LONGITUDE]
+            radius = attributes[ATTR_RADIUS] / METERS_PER_DEGREE
+            # Degrees of longitude get shorter towards the poles.
+            radius_longitude = radius / max(math.cos(math.radians(latitude)), 0.01)
+            south, west = _cell(latitude - radius, longitude - radius_longitude)
+            north, east = _cell(latitude + radius, longitude + radius_longitude)
+            for row in range(south, north + 1):
+                for column in range(west, east + 1):
+                    cells[(row, column)].append(state)
+        return cells
+
+    @callback
+    def async_active_zone(self, latitude: float, longitude: float) -> State | None:
+        """Return the zone of a position like zone.async_active_zone does."""
+        if self._cells is None:
+            self._cells = self._build()
+
+        closest: State | None = None
+        min_dist = math.inf
+        for state in self._cells.get(_cell(latitude, longitude), ()):
+            zone_dist = distance(
+                latitude,
+                longitude,
+                state.attributes[ATTR_LATITUDE],
+                state.attributes[ATTR_LONGITUDE],
+            )
+            zone_radius = state.attributes[ATTR_RADIUS]
+            if zone_dist is None or zone_dist >= zone_radius:
+                continue
+            # The closest zone wins, of two equally close zones the smaller.
+            if (
+                closest is None
+                or zone_dist < min_dist
+                or (
+                    zone_dist == min_dist
+                    and zone_radius < closest.attributes[ATTR_RADIUS]
+                )
+            ):
+                min_dist = zone_dist
+                closest = state
+        return closest
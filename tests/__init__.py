@@ -0,0 +1 @@
+"""Tests for the Volkswagen We Connect ID integration."""
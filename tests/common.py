@@ -0,0 +1,59 @@
+"""Stand-ins for the weconnect objects the integration reads."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+
+class FakeAttribute:
+    """A weconnect attribute with a value."""
+
+    def __init__(self, value: Any, enabled: bool = True) -> None:
+        self.value = value
+        self.enabled = enabled
+
+
+def fake_element(values: dict[str, Any]) -> SimpleNamespace:
+    """Return an enabled element, nested dicts become nested elements."""
+    return SimpleNamespace(
+        enabled=True,
+        **{
+            name: fake_element(value)
+            if isinstance(value, dict)
+            else FakeAttribute(value)
+            for name, value in values.items()
+        },
+    )
+
+
+def fake_vehicle(
+    vin: str, domains: dict[str, dict[str, dict[str, Any]]] | None = None
+) -> SimpleNamespace:
+    """Return a vehicle with the statuses of domains, by domain and status."""
+    return SimpleNamespace(
+        vin=FakeAttribute(vin),
+        domains={
+            domain: {
+                status: fake_element(values) for status, values in statuses.items()
+            }
+            for domain, statuses in (domains or {}).items()
+        },
+    )
+
+
+class FakeStore:
+    """A Store that keeps its data in memory."""
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        self.data = data
+        self.delayed_saves = 0
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return self.data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        self.delayed_saves += 1
+        self.data = data_func()
@@ -0,0 +1,35 @@
+"""Tests for the account registry shared by the config entries."""
+from __future__ import annotations
+
+from custom_components.volkswagen_we_connect_id import (
+    _accounts,
+    get_account,
+    release_account,
+)
+
+
+def test_entries_share_account() -> None:
+    """Entries of the same account share it until the last one releases it."""
+    first = get_account("shared@example.com", "secret", "entry_1")
+    second = get_account("shared@example.com", "secret", "entry_2")
+    assert first is second
+
+    release_account(first, "entry_1")
+    assert get_account("shared@example.com", "secret") is second
+    release_account(second, "entry_2")
+    assert ("shared@example.com", "secret") not in _accounts
+
+
+def test_new_password_keeps_running_account() -> None:
+    """A new password does not replace the account a running entry holds."""
+    running = get_account("user@example.com", "old", "entry_1")
+    changed = get_account("user@example.com", "new")
+    assert changed is not running
+    assert get_account("user@example.com", "old") is running
+
+    # Unloading the entry does not forget the account of the new password.
+    release_account(running, "entry_1")
+    assert ("user@example.com", "old") not in _accounts
+    assert get_account("user@example.com", "new", "entry_1") is changed
+    release_account(changed, "entry_1")
+    assert not any(key[0] == "user@example.com" for key in _accounts)
@@ -0,0 +1,223 @@
+"""Tests for the token handling of the asyncio fetch path."""
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.volkswagen_we_connect_id import backend
+from custom_components.volkswagen_we_connect_id.backend import (
+    API_BASE_URL,
+    AsyncWeConnectBackend,
+)
+
+from .common import FakeStore
+
+URL = f"{API_BASE_URL}/vehicle/v1/vehicles"
+
+
+class FakeSession:
+    """The OAuth session of a weconnect api object."""
+
+    def __init__(self, token: dict[str, Any] | None = None) -> None:
+        self.token = token or {}
+        self.metadata: dict[str, Any] = {}
+        self.headers = {"user-agent": "test"}
+        self.expired = False
+        self.refreshToken = "refresh" if token else None
+        self.refreshes = 0
+
+    @property
+    def authorized(self) -> bool:
+        return bool(self.token)
+
+    @property
+    def accessToken(self) -> str | None:
+        return self.token.get("access_token")
+
+    def refresh(self) -> None:
+        self.refreshes += 1
+        self.token = {"access_token": f"refreshed-{self.refreshes}"}
+
+
+class FakeApi:
+    """A weconnect api object that counts its logins."""
+
+    def __init__(self, token: dict[str, Any] | None = None) -> None:
+        self.username = "user@example.com"
+        self.session = FakeSession(token)
+        self.cache: dict[str, Any] = {}
+        self.vehicles: dict[str, Any] = {}
+        self.logins = 0
+
+    def login(self) -> None:
+        self.logins += 1
+        self.session.token = {"access_token": f"login-{self.logins}"}
+
+
+class FakeResponse:
+    """An aiohttp response."""
+
+    def __init__(self, status: int, body: bytes = b"") -> None:
+        self.status = status
+        self.headers: dict[str, str] = {}
+        self._body = body
+
+    async def __aenter__(self) -> FakeResponse:
+        # Let the other requests in flight start before this one answers.
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class FakeWebSession:
+    """An aiohttp session that only accepts one access token."""
+
+    def __init__(self, api: FakeApi, valid_token: str) -> None:
+        self.api = api
+        self.valid_token = valid_token
+        self.requests: list[str] = []
+
+    def get(self, url: str, headers: dict[str, str], **kwargs: Any) -> FakeResponse:
+        token = headers["authorization"].removeprefix("Bearer ")
+        self.requests.append(token)
+        if token != self.valid_token and not token.startswith(("refreshed", "login")):
+            return FakeResponse(HTTPStatus.UNAUTHORIZED)
+        return FakeResponse(HTTPStatus.OK, json.dumps({"data": []}).encode())
+
+
+async def _executor_job(target, *args):
+    """Run an executor job right away."""
+    return target(*args)
+
+
+def make_backend(
+    monkeypatch: pytest.MonkeyPatch,
+    api: FakeApi,
+    store: FakeStore | None = None,
+    valid_token: str = "valid",
+) -> tuple[AsyncWeConnectBackend, FakeWebSession]:
+    """Return a backend whose requests go to a fake web session."""
+    websession = FakeWebSession(api, valid_token)
+    monkeypatch.setattr(backend, "async_get_clientsession", lambda hass: websession)
+    hass = SimpleNamespace(async_add_executor_job=_executor_job)
+    return AsyncWeConnectBackend(hass, api, store), websession
+
+
+def test_tokens_are_restored(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The tokens of the previous session are reused without a login."""
+    store = FakeStore(
+        {
+            "username": "user@example.com",
+            "token": {"access_token": "valid"},
+            "metadata": {"state": "x"},
+        }
+    )
+    api = FakeApi()
+    async_backend, _ = make_backend(monkeypatch, api, store)
+
+    async def run() -> None:
+        await async_backend.async_restore_tokens()
+        await async_backend.async_login()
+
+    asyncio.run(run())
+    assert api.session.token == {"access_token": "valid"}
+    assert api.session.metadata == {"state": "x"}
+    assert api.logins == 0
+
+
+def test_tokens_of_other_user_are_ignored(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tokens stored for another username are not restored."""
+    store = FakeStore(
+        {"username": "other@example.com", "token": {"access_token": "valid"}}
+    )
+    api = FakeApi()
+    async_backend, _ = make_backend(monkeypatch, api, store)
+    asyncio.run(async_backend.async_restore_tokens())
+    assert not api.session.authorized
+
+
+def test_tokens_saved_when_changed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tokens are only written when they changed since the last save."""
+    store = FakeStore()
+    api = FakeApi({"access_token": "valid"})
+    async_backend, _ = make_backend(monkeypatch, api, store)
+
+    asyncio.run(async_backend.async_save_tokens())
+    assert store.data == {
+        "username": "user@example.com",
+        "token": {"access_token": "valid"},
+        "metadata": {},
+    }
+    store.data = None
+    asyncio.run(async_backend.async_save_tokens())
+    assert store.data is None
+
+
+def test_expired_token_is_refreshed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An expired token is refreshed instead of logging in again."""
+    store = FakeStore()
+    api = FakeApi({"access_token": "old"})
+    api.session.expired = True
+    async_backend, _ = make_backend(monkeypatch, api, store)
+    asyncio.run(async_backend.async_login())
+    assert api.session.refreshes == 1
+    assert api.logins == 0
+    assert store.data["token"] == {"access_token": "refreshed-1"}
+
+
+def test_login_when_refresh_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The full login is only the fallback of a failed refresh."""
+    api = FakeApi({"access_token": "old"})
+    api.session.expired = True
+
+    def refresh() -> None:
+        raise RuntimeError("refresh token expired")
+
+    api.session.refresh = refresh
+    async_backend, _ = make_backend(monkeypatch, api, FakeStore())
+    asyncio.run(async_backend.async_login())
+    assert api.logins == 1
+
+
+def test_unauthorized_renews_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parallel requests rejected with 401 renew the tokens only once."""
+    store = FakeStore()
+    api = FakeApi({"access_token": "revoked"})
+    async_backend, websession = make_backend(monkeypatch, api, store)
+
+    async def run() -> list[Any]:
+        return await asyncio.gather(
+            *(
+                async_backend._async_get(URL) for _ in range(5)
+            )  # pylint: disable=protected-access
+        )
+
+    assert asyncio.run(run()) == [{"data": []}] * 5
+    assert api.session.refreshes == 1
+    assert api.logins == 0
+    assert websession.requests.count("revoked") == 5
+    assert websession.requests.count("refreshed-1") == 5
+    assert store.data["token"] == {"access_token": "refreshed-1"}
+    assert api.cache[URL][0] == {"data": []}
+
+
+def test_unauthorized_twice_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A request that is rejected again after renewing the tokens fails."""
+    api = FakeApi({"access_token": "revoked"})
+    async_backend, websession = make_backend(monkeypatch, api, FakeStore())
+    websession.get = lambda url, headers, **kwargs: FakeResponse(
+        HTTPStatus.UNAUTHORIZED
+    )
+    with pytest.raises(backend.RetrievalError):
+        asyncio.run(async_backend._async_get(URL))  # pylint: disable=protected-access
+    assert api.session.refreshes == 1
@@ -0,0 +1,158 @@
+"""Tests for the probing of the values the vehicles report."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from homeassistant.const import Platform
+
+from custom_components.volkswagen_we_connect_id import capabilities
+from custom_components.volkswagen_we_connect_id.capabilities import CapabilityProbe
+from custom_components.volkswagen_we_connect_id.const import (
+    CAPABILITY_REMOVE_AFTER_REFRESHES,
+)
+
+from .common import FakeStore, fake_vehicle
+
+VIN = "WVWZZZE1ZPP000000"
+
+
+def vehicle(**battery: Any) -> Any:
+    """Return a vehicle with a battery status."""
+    return fake_vehicle(VIN, {"charging": {"batteryStatus": battery}})
+
+
+def entity(key: str) -> Any:
+    """Return an entity that reads an attribute of the battery status."""
+
+    def probe_value(car: Any) -> Any:
+        attribute = getattr(car.domains["charging"]["batteryStatus"], key, None)
+        return None if attribute is None else attribute.value
+
+    return SimpleNamespace(
+        snapshot_key=key, probe_value=probe_value, required_domains=()
+    )
+
+
+def coordinator(car: Any, restored: bool = False, failed: bool = False) -> Any:
+    """Return a coordinator with the data of a vehicle."""
+    return SimpleNamespace(
+        data={VIN: car},
+        restored_at=datetime(2024, 3, 1, tzinfo=timezone.utc) if restored else None,
+        vehicle_errors={VIN: RuntimeError("boom")} if failed else {},
+    )
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> FakeStore:
+    """Keep the saved keys in memory."""
+    fake = FakeStore()
+    monkeypatch.setattr(capabilities, "capability_store", lambda hass, entry_id: fake)
+    return fake
+
+
+@pytest.fixture
+def removed(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Platform, str, str]]:
+    """Collect the registry entries that are removed."""
+    calls: list[tuple[Platform, str, str]] = []
+    monkeypatch.setattr(
+        capabilities,
+        "_async_remove_entity",
+        lambda hass, platform, vin, key: calls.append((platform, vin, key)),
+    )
+    return calls
+
+
+def keys(entities: list[Any]) -> list[str]:
+    """Return the keys of entities."""
+    return [entity.snapshot_key for entity in entities]
+
+
+def supported(
+    probe: CapabilityProbe, car_coordinator: Any, names: tuple[str, ...]
+) -> list[str]:
+    """Return the keys of the entities the probe creates."""
+    return keys(
+        probe.async_supported_entities(
+            Platform.SENSOR, car_coordinator, VIN, [entity(name) for name in names]
+        )
+    )
+
+
+def test_unreported_values_get_no_entity(store: FakeStore) -> None:
+    """Only the values the vehicle reports get entities, and are saved."""
+    probe = CapabilityProbe(None, "entry")
+    assert supported(probe, coordinator(vehicle(soc=50)), ("soc", "fuel")) == ["soc"]
+    assert store.data["vehicles"] == {VIN: ["soc"]}
+
+
+def test_value_reported_later(store: FakeStore, removed: list[Any]) -> None:
+    """A value that shows up later is supported and asks for a reload."""
+    probe = CapabilityProbe(None, "entry")
+    supported(probe, coordinator(vehicle(soc=50)), ("soc", "fuel"))
+    assert not asyncio.run(probe.async_update({VIN: vehicle(soc=50)}))
+    assert asyncio.run(probe.async_update({VIN: vehicle(soc=50, fuel=10)}))
+    assert store.data["vehicles"] == {VIN: ["fuel", "soc"]}
+    assert store.data["misses"] == {}
+    assert not probe.pending_domains()
+    assert not removed
+
+
+def test_restored_data_is_not_probed(store: FakeStore) -> None:
+    """Restored data creates every entity until a live probe found keys."""
+    probe = CapabilityProbe(None, "entry")
+    restored = coordinator(vehicle(soc=50), restored=True)
+    assert supported(probe, restored, ("soc", "fuel")) == ["soc", "fuel"]
+    assert store.data is None
+
+    store.data = {"vehicles": {VIN: ["soc"]}}
+    probe = CapabilityProbe(None, "entry")
+    asyncio.run(probe.async_load())
+    # A value the restored data lacks is not taken as unsupported.
+    restored = coordinator(vehicle(), restored=True)
+    assert supported(probe, restored, ("soc", "fuel")) == ["soc"]
+    assert store.data == {"vehicles": {VIN: ["soc"]}}
+
+
+def test_failed_vehicle_is_not_probed(store: FakeStore) -> None:
+    """A vehicle that failed to refresh gets every entity."""
+    probe = CapabilityProbe(None, "entry")
+    failed = coordinator(vehicle(), failed=True)
+    assert supported(probe, failed, ("soc", "fuel")) == ["soc", "fuel"]
+    assert store.data is None
+
+
+def test_entity_removed_after_missed_refreshes(
+    store: FakeStore, removed: list[Any]
+) -> None:
+    """A registered entity goes only after many refreshes without its value."""
+    probe = CapabilityProbe(None, "entry")
+    supported(probe, coordinator(vehicle(soc=50)), ("soc", "fuel"))
+    for _ in range(CAPABILITY_REMOVE_AFTER_REFRESHES - 1):
+        asyncio.run(probe.async_update({VIN: vehicle(soc=50)}))
+    assert not removed
+    assert store.data["misses"] == {
+        VIN: {"fuel": CAPABILITY_REMOVE_AFTER_REFRESHES - 1}
+    }
+
+    asyncio.run(probe.async_update({VIN: vehicle(soc=50)}))
+    assert removed == [(Platform.SENSOR, VIN, "fuel")]
+    asyncio.run(probe.async_update({VIN: vehicle(soc=50)}))
+    assert len(removed) == 1
+
+
+def test_missed_refreshes_survive_restart(store: FakeStore, removed: list[Any]) -> None:
+    """The missed refreshes are counted on after a restart."""
+    store.data = {
+        "vehicles": {VIN: ["soc"]},
+        "misses": {VIN: {"fuel": CAPABILITY_REMOVE_AFTER_REFRESHES - 1}},
+    }
+    probe = CapabilityProbe(None, "entry")
+    asyncio.run(probe.async_load())
+    supported(probe, coordinator(vehicle(soc=50)), ("soc", "fuel"))
+    asyncio.run(probe.async_update({VIN: vehicle(soc=50)}))
+    assert removed == [(Platform.SENSOR, VIN, "fuel")]
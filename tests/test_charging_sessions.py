@@ -0,0 +1,151 @@
+"""Tests for the charging session recorder."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from custom_components.volkswagen_we_connect_id import charging_sessions
+from custom_components.volkswagen_we_connect_id.charging_sessions import (
+    ChargingSessionRecorder,
+)
+
+from .common import FakeStore, fake_vehicle
+
+VIN = "WVWZZZE1ZPP000000"
+START = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def vehicle(
+    minutes: float,
+    power: float,
+    state: str = "charging",
+    plug: str = "connected",
+    soc: int = 50,
+) -> Any:
+    """Return a vehicle with a charging status captured minutes after START."""
+    return fake_vehicle(
+        VIN,
+        {
+            "charging": {
+                "chargingStatus": {
+                    "carCapturedTimestamp": START + timedelta(minutes=minutes),
+                    "chargePower_kW": power,
+                    "chargingState": state,
+                },
+                "plugStatus": {"plugConnectionState": plug},
+                "batteryStatus": {"currentSOC_pct": soc},
+            }
+        },
+    )
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> FakeStore:
+    """Keep the saved charging data in memory."""
+    fake = FakeStore()
+    monkeypatch.setattr(
+        charging_sessions, "charging_store", lambda hass, entry_id: fake
+    )
+    return fake
+
+
+@pytest.fixture
+def recorder(store: FakeStore) -> ChargingSessionRecorder:
+    """Return a recorder without saved data."""
+    return ChargingSessionRecorder(None, "entry")
+
+
+def test_session_energy_is_integrated(
+    recorder: ChargingSessionRecorder, store: FakeStore
+) -> None:
+    """Power is integrated with the trapezoidal rule while charging."""
+    assert recorder.energy(VIN) is None
+    recorder.async_update({VIN: vehicle(0, 11, soc=20)})
+    assert recorder.energy(VIN) == 0.0
+    assert recorder.vehicles[VIN].session_start == START
+
+    recorder.async_update({VIN: vehicle(30, 11, soc=30)})
+    assert recorder.energy(VIN) == 5.5
+    recorder.async_update({VIN: vehicle(60, 7, soc=40)})
+    assert recorder.energy(VIN) == 10.0
+    assert recorder.vehicles[VIN].session_energy_kwh == pytest.approx(10.0)
+
+    # Charging stopped, the power falls to zero over the last step.
+    recorder.async_update({VIN: vehicle(90, 0, state="readyForCharging", soc=45)})
+    assert recorder.energy(VIN) == 11.75
+    assert recorder.vehicles[VIN].session_start is None
+    assert list(recorder.sessions) == [
+        [
+            VIN,
+            int(START.timestamp()),
+            int((START + timedelta(minutes=90)).timestamp()),
+            11.75,
+            20,
+            45,
+        ]
+    ]
+    assert store.delayed_saves == 4
+
+
+def test_same_status_is_not_counted_twice(
+    recorder: ChargingSessionRecorder, store: FakeStore
+) -> None:
+    """A status that is not newer than the last one is ignored."""
+    recorder.async_update({VIN: vehicle(0, 11)})
+    recorder.async_update({VIN: vehicle(60, 11)})
+    recorder.async_update({VIN: vehicle(60, 11)})
+    recorder.async_update({VIN: vehicle(30, 11)})
+    assert recorder.energy(VIN) == 11.0
+    assert store.delayed_saves == 2
+
+
+def test_idle_vehicle_adds_no_energy(recorder: ChargingSessionRecorder) -> None:
+    """Outside of a session the reported power is not counted."""
+    recorder.async_update({VIN: vehicle(0, 3, state="readyForCharging")})
+    recorder.async_update({VIN: vehicle(60, 3, state="readyForCharging")})
+    assert recorder.energy(VIN) == 0.0
+    assert not recorder.sessions
+
+    # The session starts at the first charging status, not before.
+    recorder.async_update({VIN: vehicle(120, 11)})
+    recorder.async_update({VIN: vehicle(180, 11)})
+    assert recorder.energy(VIN) == 11.0
+    assert recorder.vehicles[VIN].session_start == START + timedelta(minutes=120)
+
+
+def test_unplugging_ends_session(recorder: ChargingSessionRecorder) -> None:
+    """A vehicle that is unplugged does not charge, whatever it reports."""
+    recorder.async_update({VIN: vehicle(0, 11)})
+    recorder.async_update({VIN: vehicle(60, 11, plug="disconnected")})
+    assert recorder.energy(VIN) == 5.5
+    assert len(recorder.sessions) == 1
+    assert recorder.sessions[0][3] == 5.5
+
+
+def test_status_without_power_is_ignored(recorder: ChargingSessionRecorder) -> None:
+    """A status without power or capture time is not a sample."""
+    car = vehicle(0, 11)
+    car.domains["charging"]["chargingStatus"].chargePower_kW.enabled = False
+    recorder.async_update({VIN: car})
+    assert recorder.energy(VIN) is None
+    recorder.async_update({VIN: fake_vehicle(VIN)})
+    assert recorder.energy(VIN) is None
+
+
+def test_running_session_is_restored(
+    recorder: ChargingSessionRecorder, store: FakeStore
+) -> None:
+    """The totals and running sessions survive a restart."""
+    recorder.async_update({VIN: vehicle(0, 11, soc=20)})
+    recorder.async_update({VIN: vehicle(60, 11)})
+
+    restored = ChargingSessionRecorder(None, "entry")
+    asyncio.run(restored.async_load())
+    assert restored.vehicles == recorder.vehicles
+    restored.async_update({VIN: vehicle(120, 11)})
+    assert restored.energy(VIN) == 22.0
+    assert restored.vehicles[VIN].session_energy_kwh == pytest.approx(22.0)
+    assert restored.vehicles[VIN].session_start_soc == 20
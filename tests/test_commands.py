@@ -0,0 +1,270 @@
+"""Tests for the coalescing command queue and the merged settings writes."""
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from weconnect.domain import Domain
+from weconnect.elements.enums import UnlockPlugState
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fixtures import offline_api, vin_for
+from custom_components.volkswagen_we_connect_id import commands
+from custom_components.volkswagen_we_connect_id.commands import (
+    Command,
+    CommandQueue,
+    send_commands,
+)
+
+from .test_coordinator import run
+
+VIN = vin_for(0)
+
+
+class FakeCoordinator:
+    """Record the optimistic values a queue sets and clears."""
+
+    def __init__(self, confirmed_after: int = 1) -> None:
+        """Initialize, the values are confirmed by the given refresh."""
+        self.optimistic: dict[str, Any] = {}
+        self.cleared: list[list[str]] = []
+        self.updates = 0
+        self.confirmed_after = confirmed_after
+
+    def async_set_optimistic(self, vin: str, values: dict[str, Any]) -> None:
+        """Show expected values."""
+        self.optimistic.update(values)
+
+    def async_clear_optimistic(self, vin: str, keys: list[str]) -> None:
+        """Show the reported values again."""
+        self.cleared.append(sorted(keys))
+        for key in keys:
+            self.optimistic.pop(key, None)
+
+    def async_update_vehicles(self) -> None:
+        """Count the updates after a refresh."""
+        self.updates += 1
+
+    def optimistic_confirmed(self, vin: str, expected: dict[str, Any]) -> bool:
+        """Return True once the vehicle reported the expected values."""
+        return self.updates >= self.confirmed_after
+
+
+def setting(attribute: str, value: Any) -> Command:
+    """Return a write of a charging setting."""
+    return Command(
+        attribute,
+        ("charging", "chargingSettings", attribute),
+        value,
+        Domain.CHARGING,
+        {},
+        None,
+    )
+
+
+class SettingsRequests:
+    """Answer the settings requests of weconnect and record them."""
+
+    def __init__(self, status_code: int = 200) -> None:
+        """Initialize with the status code of every answer."""
+        self.status_code = status_code
+        self.puts: list[tuple[str, dict[str, Any]]] = []
+
+    def put(self, url: str, data: str, **kwargs: Any) -> Any:
+        """Record a request."""
+        self.puts.append((url, json.loads(data)))
+        return SimpleNamespace(
+            status_code=self.status_code,
+            json=lambda: {"data": {}} if self.status_code == 200 else {},
+        )
+
+
+@pytest.fixture
+def api() -> Any:
+    """Return an api object whose settings requests are recorded."""
+    api = offline_api(1)
+    api.requests = SettingsRequests()
+    api.session.put = api.requests.put
+    return api
+
+
+def charging_settings(api: Any) -> Any:
+    """Return the charging settings of the vehicle."""
+    return api.vehicles[VIN].domains["charging"]["chargingSettings"]
+
+
+def test_settings_merged_into_one_put(api: Any) -> None:
+    """Writes to one settings object are sent with a single request."""
+    results = send_commands(
+        api,
+        VIN,
+        [
+            setting("targetSOC_pct", 70),
+            setting("autoUnlockPlugWhenCharged", "off"),
+            setting("targetSOC_pct", 90),
+        ],
+    )
+
+    assert results == [True, True, True]
+    assert len(api.requests.puts) == 1
+    url, body = api.requests.puts[0]
+    assert url.endswith(f"/vehicles/{VIN}/charging/settings")
+    assert body["targetSOC_pct"] == 90
+    assert body["autoUnlockPlugWhenCharged"] == "off"
+    settings = charging_settings(api)
+    assert settings.targetSOC_pct.value == 90
+    assert settings.autoUnlockPlugWhenCharged.value == UnlockPlugState.OFF
+
+
+def test_unchanged_settings_are_not_sent(api: Any) -> None:
+    """Writing the values a vehicle already has sends no request."""
+    assert send_commands(api, VIN, [setting("targetSOC_pct", 80)]) == [True]
+    assert api.requests.puts == []
+
+
+def test_failed_put_restores_values(api: Any) -> None:
+    """A rejected request fails its writes and restores the old values."""
+    api.requests.status_code = 500
+
+    results = send_commands(
+        api,
+        VIN,
+        [setting("targetSOC_pct", 90), setting("autoUnlockPlugWhenCharged", "off")],
+    )
+
+    assert results == [False, False]
+    assert len(api.requests.puts) == 1
+    settings = charging_settings(api)
+    assert settings.targetSOC_pct.value == 80
+    assert settings.autoUnlockPlugWhenCharged.value == UnlockPlugState.PERMANENT
+
+
+def queue_test(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    coordinator: FakeCoordinator,
+    results: list[bool] | None = None,
+) -> tuple[list[list[Command]], list[list[Domain]], Any]:
+    """Patch the timings and the sending, return the batches and fetches."""
+    monkeypatch.setattr(commands, "COMMAND_COALESCE_SECONDS", 0.05)
+    monkeypatch.setattr(commands, "POST_COMMAND_REFRESH_DELAYS_SECONDS", (0, 0, 0))
+    batches: list[list[Command]] = []
+    fetches: list[list[Domain]] = []
+
+    def send(api: Any, vin: str, batch: list[Command]) -> list[bool]:
+        batches.append(batch)
+        return results or [True] * len(batch)
+
+    async def fetch(vin: str, domains: list[Domain]) -> None:
+        fetches.append(domains)
+
+    monkeypatch.setattr(commands, "send_commands", send)
+
+    def runner(test: Callable[[CommandQueue], Awaitable[None]]) -> None:
+        async def wrapped(hass: HomeAssistant) -> None:
+            await test(CommandQueue(hass, None, coordinator, fetch))
+
+        run(tmp_path, wrapped)
+
+    return batches, fetches, runner
+
+
+def test_commands_within_window_are_one_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Commands queued within the window are sent together."""
+    coordinator = FakeCoordinator()
+    batches, _, runner = queue_test(tmp_path, monkeypatch, coordinator)
+
+    async def test(queue: CommandQueue) -> None:
+        first = queue.async_set_setting(
+            VIN, "charging", "chargingSettings", "targetSOC_pct", 90, {"soc": 90}
+        )
+        second = queue.async_set_setting(
+            VIN,
+            "charging",
+            "chargingSettings",
+            "autoUnlockPlugWhenCharged",
+            "off",
+            {"unlock": "off"},
+        )
+        assert coordinator.optimistic == {"soc": 90, "unlock": "off"}
+        assert await asyncio.gather(first, second) == [True, True]
+        assert [[command.name for command in batch] for batch in batches] == [
+            ["targetSOC_pct", "autoUnlockPlugWhenCharged"]
+        ]
+
+        # A command after the window is the next batch.
+        assert await queue.async_set_setting(
+            VIN, "charging", "chargingSettings", "targetSOC_pct", 80
+        )
+        assert len(batches) == 2
+
+    runner(test)
+
+
+def test_refresh_until_confirmed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The touched domain is refreshed until the values are reported."""
+    coordinator = FakeCoordinator(confirmed_after=2)
+    _, fetches, runner = queue_test(tmp_path, monkeypatch, coordinator)
+
+    async def test(queue: CommandQueue) -> None:
+        assert await queue.async_set_setting(
+            VIN, "charging", "chargingSettings", "targetSOC_pct", 90, {"soc": 90}
+        )
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert fetches == [[Domain.CHARGING], [Domain.CHARGING]]
+        assert coordinator.cleared == [["soc"]]
+        assert coordinator.optimistic == {}
+
+    runner(test)
+
+
+def test_unconfirmed_values_cleared_after_last_refresh(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The expected values are shown until the last follow-up refresh."""
+    coordinator = FakeCoordinator(confirmed_after=10)
+    _, fetches, runner = queue_test(tmp_path, monkeypatch, coordinator)
+
+    async def test(queue: CommandQueue) -> None:
+        assert await queue.async_set_setting(
+            VIN, "charging", "chargingSettings", "targetSOC_pct", 90, {"soc": 90}
+        )
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert len(fetches) == 3
+        assert coordinator.cleared == [["soc"]]
+        assert coordinator.optimistic == {}
+
+    runner(test)
+
+
+def test_failed_command_clears_at_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A command that failed shows the reported value without a refresh."""
+    coordinator = FakeCoordinator()
+    _, fetches, runner = queue_test(tmp_path, monkeypatch, coordinator, [False])
+
+    async def test(queue: CommandQueue) -> None:
+        assert not await queue.async_set_setting(
+            VIN, "charging", "chargingSettings", "targetSOC_pct", 90, {"soc": 90}
+        )
+        await asyncio.sleep(0)
+
+        assert fetches == []
+        assert coordinator.cleared == [["soc"]]
+
+    runner(test)
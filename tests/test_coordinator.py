@@ -0,0 +1,190 @@
+"""Tests for the shared refreshes and change detection of the coordinator."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.volkswagen_we_connect_id.coordinator import (
+    VolkswagenIDCoordinator,
+)
+
+from .common import fake_vehicle
+
+VIN = "WVWZZZE1ZPP000000"
+
+
+def vehicle(soc: int, odometer: int = 12345) -> Any:
+    """Return a vehicle with a battery and an odometer status."""
+    return fake_vehicle(
+        VIN,
+        {
+            "charging": {"batteryStatus": {"currentSOC_pct": soc}},
+            "measurements": {"odometerStatus": {"odometer": odometer}},
+        },
+    )
+
+
+def run(
+    tmp_path: Path,
+    test: Callable[[HomeAssistant], Awaitable[None]],
+) -> None:
+    """Run a test with a Home Assistant that is not started."""
+
+    async def main() -> None:
+        hass = HomeAssistant(str(tmp_path))
+        try:
+            await test(hass)
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(main())
+
+
+def coordinator(
+    hass: HomeAssistant, update_method: Callable[[], Awaitable[dict[str, Any]]]
+) -> VolkswagenIDCoordinator:
+    """Return a coordinator that refreshes with an update method."""
+    return VolkswagenIDCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="test",
+        update_method=update_method,
+    )
+
+
+def test_overlapping_refreshes_share_fetch(tmp_path: Path) -> None:
+    """A refresh that starts while one is in flight joins its fetch."""
+
+    async def test(hass: HomeAssistant) -> None:
+        fetches = 0
+        release = asyncio.Event()
+
+        async def update() -> dict[str, Any]:
+            nonlocal fetches
+            fetches += 1
+            await release.wait()
+            return {VIN: vehicle(50)}
+
+        refreshing = coordinator(hass, update)
+        first = asyncio.create_task(refreshing.async_refresh())
+        second = asyncio.create_task(refreshing.async_refresh())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert fetches == 1
+        assert refreshing.joined_refreshes == 1
+        assert refreshing.last_update_success
+
+        # The next refresh fetches again.
+        await refreshing.async_refresh()
+        assert fetches == 2
+
+    run(tmp_path, test)
+
+
+def test_cancelled_caller_keeps_fetch(tmp_path: Path) -> None:
+    """Cancelling one caller does not cancel the fetch the others wait for."""
+
+    async def test(hass: HomeAssistant) -> None:
+        release = asyncio.Event()
+        finished = []
+
+        async def update() -> dict[str, Any]:
+            await release.wait()
+            finished.append(True)
+            return {VIN: vehicle(50)}
+
+        refreshing = coordinator(hass, update)
+        cancelled = asyncio.create_task(refreshing.async_refresh())
+        waiting = asyncio.create_task(refreshing.async_refresh())
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await waiting
+
+        assert cancelled.cancelled()
+        assert finished == [True]
+        assert refreshing.last_update_success
+        assert refreshing.data[VIN].vin.value == VIN
+
+    run(tmp_path, test)
+
+
+def test_unchanged_values_are_not_written(tmp_path: Path) -> None:
+    """Only the listeners of the (vin, key) values that changed are called."""
+
+    async def test(hass: HomeAssistant) -> None:
+        vehicles = [vehicle(50), vehicle(51), vehicle(51, odometer=12400)]
+
+        async def update() -> dict[str, Any]:
+            return {VIN: vehicles.pop(0)}
+
+        refreshing = coordinator(hass, update)
+        refreshing.async_add_reader(
+            "soc",
+            lambda car: car.domains["charging"]["batteryStatus"].currentSOC_pct.value,
+        )
+        refreshing.async_add_reader(
+            "odometer",
+            lambda car: car.domains["measurements"]["odometerStatus"].odometer.value,
+        )
+        writes: list[str] = []
+        refreshing.async_add_listener(lambda: writes.append("soc"), (VIN, "soc"))
+        refreshing.async_add_listener(
+            lambda: writes.append("odometer"), (VIN, "odometer")
+        )
+
+        # The first refresh updates every entity.
+        await refreshing.async_refresh()
+        assert sorted(writes) == ["odometer", "soc"]
+
+        writes.clear()
+        await refreshing.async_refresh()
+        assert writes == ["soc"]
+        assert refreshing.suppressed_writes == 1
+
+        writes.clear()
+        await refreshing.async_refresh()
+        assert writes == ["odometer"]
+        assert refreshing.suppressed_writes == 2
+
+    run(tmp_path, test)
+
+
+def test_failure_updates_every_listener(tmp_path: Path) -> None:
+    """A failed refresh makes every entity write its availability."""
+
+    async def test(hass: HomeAssistant) -> None:
+        fail = False
+
+        async def update() -> dict[str, Any]:
+            if fail:
+                raise RuntimeError("boom")
+            return {VIN: vehicle(50)}
+
+        refreshing = coordinator(hass, update)
+        refreshing.async_add_reader(
+            "soc",
+            lambda car: car.domains["charging"]["batteryStatus"].currentSOC_pct.value,
+        )
+        writes: list[str] = []
+        refreshing.async_add_listener(lambda: writes.append("soc"), (VIN, "soc"))
+        await refreshing.async_refresh()
+        await refreshing.async_refresh()
+        assert writes == ["soc"]
+
+        fail = True
+        await refreshing.async_refresh()
+        assert not refreshing.last_update_success
+        assert writes == ["soc", "soc"]
+
+    run(tmp_path, test)
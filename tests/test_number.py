@@ -0,0 +1,93 @@
+"""Tests for the debounced writes of the number entities."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.volkswagen_we_connect_id.number import TargetSoCNumber
+
+from .common import FakeAttribute, fake_vehicle
+from .test_coordinator import VIN, coordinator, run
+
+WRITE_DELAY = 0.05
+
+
+class FakeCommands:
+    """Record the settings a number writes."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.settings: list[tuple[str, Any]] = []
+
+    def async_set_setting(
+        self,
+        vin: str,
+        domain: str,
+        status: str,
+        attribute: str,
+        value: Any,
+        optimistic: dict[str, Any] | None = None,
+    ) -> asyncio.Future[bool]:
+        self.settings.append((attribute, value))
+        future = self.hass.loop.create_future()
+        future.set_result(True)
+        return future
+
+
+async def target_soc(hass: HomeAssistant, commands: FakeCommands) -> TargetSoCNumber:
+    """Return a target SoC number of a vehicle that reports 80 %."""
+    car = fake_vehicle(VIN, {"charging": {"chargingSettings": {"targetSOC_pct": 80}}})
+    car.nickname = FakeAttribute("ID.3")
+    car.model = FakeAttribute("ID.3")
+
+    async def update() -> dict[str, Any]:
+        return {VIN: car}
+
+    refreshing = coordinator(hass, update)
+    await refreshing.async_refresh()
+    number = TargetSoCNumber(None, refreshing, VIN, commands, WRITE_DELAY)
+    number.hass = hass
+    number.async_write_ha_state = lambda: None
+    return number
+
+
+def test_rapid_changes_send_last_value(tmp_path: Path) -> None:
+    """Dragging a slider shows every value but sends only the last one."""
+
+    async def test(hass: HomeAssistant) -> None:
+        commands = FakeCommands(hass)
+        number = await target_soc(hass, commands)
+        assert number.native_value == 80
+
+        for value in (50, 60, 70):
+            await number.async_set_native_value(value)
+            assert number.native_value == value
+        assert commands.settings == []
+
+        await asyncio.sleep(WRITE_DELAY * 4)
+        assert commands.settings == [("targetSOC_pct", 70)]
+        assert number.native_value == 70
+
+    run(tmp_path, test)
+
+
+def test_removal_sends_pending_value(tmp_path: Path) -> None:
+    """A change waiting for the delay is sent when the number is removed."""
+
+    async def test(hass: HomeAssistant) -> None:
+        commands = FakeCommands(hass)
+        number = await target_soc(hass, commands)
+
+        await number.async_set_native_value(90)
+        await number.async_will_remove_from_hass()
+        await asyncio.sleep(0)
+        assert commands.settings == [("targetSOC_pct", 90)]
+
+        # The cancelled delay does not send it again.
+        await asyncio.sleep(WRITE_DELAY * 4)
+        assert commands.settings == [("targetSOC_pct", 90)]
+
+    run(tmp_path, test)
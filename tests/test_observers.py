@@ -0,0 +1,87 @@
+"""Tests for the tracking of the vehicle domains weconnect changed."""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any
+
+from weconnect.domain import Domain
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.fixtures import offline_api, vin_for
+from custom_components.volkswagen_we_connect_id.coordinator import (
+    VolkswagenIDCoordinator,
+)
+from custom_components.volkswagen_we_connect_id.observers import ChangeTracker
+
+from .test_coordinator import run
+
+VIN = vin_for(0)
+
+
+def change_target_soc(api: Any, value: int) -> None:
+    """Change the target SoC like parsing a response of the server does."""
+    settings = api.vehicles[VIN].domains["charging"]["chargingSettings"]
+    settings.targetSOC_pct.setValueWithCarTime(value, fromServer=True)
+
+
+def test_changes_by_vehicle_and_domain() -> None:
+    """A changed attribute marks the domain of its vehicle once."""
+    api = offline_api(1)
+    tracker = ChangeTracker(api)
+    assert tracker.pop_changes() == {}
+
+    change_target_soc(api, 90)
+    assert tracker.pop_changes() == {VIN: {"charging"}}
+    assert tracker.pop_changes() == {}
+
+    # Setting the same value again is no change.
+    change_target_soc(api, 90)
+    assert tracker.pop_changes() == {}
+
+
+def test_snapshot_reads_changed_domains(tmp_path: Path) -> None:
+    """After the first snapshot only readers of changed domains run again."""
+    api = offline_api(1)
+    tracker = ChangeTracker(api)
+    reads: list[str] = []
+
+    def read_target_soc(car: Any) -> Any:
+        reads.append("target_soc")
+        return car.domains["charging"]["chargingSettings"].targetSOC_pct.value
+
+    def read_odometer(car: Any) -> Any:
+        reads.append("odometer")
+        return car.domains["measurements"]["odometerStatus"].odometer.value
+
+    async def test(hass: HomeAssistant) -> None:
+        async def update() -> dict[str, Any]:
+            return dict(api.vehicles)
+
+        refreshing = VolkswagenIDCoordinator(
+            hass,
+            logging.getLogger(__name__),
+            name="test",
+            update_method=update,
+            changes=tracker,
+        )
+        refreshing.async_add_reader("target_soc", read_target_soc, [Domain.CHARGING])
+        refreshing.async_add_reader("odometer", read_odometer, [Domain.MEASUREMENTS])
+
+        await refreshing.async_refresh()
+        assert sorted(reads) == ["odometer", "target_soc"]
+
+        reads.clear()
+        change_target_soc(api, 90)
+        await refreshing.async_refresh()
+        assert reads == ["target_soc"]
+        assert refreshing.snapshots[VIN]["target_soc"] == 90
+        # The snapshot took the changes.
+        assert tracker.pop_changes() == {}
+
+        reads.clear()
+        await refreshing.async_refresh()
+        assert reads == []
+
+    run(tmp_path, test)
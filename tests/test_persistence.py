@@ -0,0 +1,117 @@
+"""Tests for saving and restoring the vehicle data of a config entry."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from weconnect import weconnect
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from benchmarks.fixtures import offline_api, vin_for
+from custom_components.volkswagen_we_connect_id.const import (
+    CACHE_STORAGE_VERSION,
+    DOMAIN,
+)
+from custom_components.volkswagen_we_connect_id.persistence import VehicleCacheStore
+
+from .test_coordinator import run
+
+ENTRY_ID = "entry"
+KEY = f"{DOMAIN}.{ENTRY_ID}.cache"
+
+
+def account(username: str = "benchmark") -> Any:
+    """Return an account whose api has not fetched anything."""
+    return SimpleNamespace(
+        api=weconnect.WeConnect(
+            username=username,
+            password="benchmark",
+            loginOnInit=False,
+            updateAfterLogin=False,
+        ),
+        lock=threading.Lock(),
+    )
+
+
+async def save(hass: HomeAssistant) -> None:
+    """Save the data of a refreshed api like a running entry does."""
+    refreshed = SimpleNamespace(api=offline_api(1), lock=threading.Lock())
+    cache = VehicleCacheStore(hass, ENTRY_ID, refreshed)
+    await cache._store.async_save(cache._data_to_save())
+
+
+def test_saved_data_restored(tmp_path: Path) -> None:
+    """The vehicles of the last session are parsed from the saved data."""
+
+    async def test(hass: HomeAssistant) -> None:
+        await save(hass)
+
+        restoring = account()
+        restored_at = await VehicleCacheStore(hass, ENTRY_ID, restoring).async_restore()
+
+        assert restored_at is not None
+        assert list(restoring.api.vehicles) == [vin_for(0)]
+        assert restoring.api.maxAge is None
+
+    run(tmp_path, test)
+
+
+def test_data_of_other_user_not_restored(tmp_path: Path) -> None:
+    """The data of the account the entry used before is not shown."""
+
+    async def test(hass: HomeAssistant) -> None:
+        await save(hass)
+
+        restoring = account("other")
+        assert (
+            await VehicleCacheStore(hass, ENTRY_ID, restoring).async_restore() is None
+        )
+        assert not restoring.api.vehicles
+
+    run(tmp_path, test)
+
+
+def test_corrupt_data_discarded(tmp_path: Path) -> None:
+    """Saved data that can not be parsed leaves the api empty."""
+
+    async def test(hass: HomeAssistant) -> None:
+        await Store(hass, CACHE_STORAGE_VERSION, KEY, private=True).async_save(
+            {
+                "username": "benchmark",
+                "saved_at": "2024-03-01T12:00:00+00:00",
+                "selective": ["notADomain"],
+                "cache": {},
+            }
+        )
+
+        restoring = account()
+        assert (
+            await VehicleCacheStore(hass, ENTRY_ID, restoring).async_restore() is None
+        )
+        assert not restoring.api.vehicles
+
+    run(tmp_path, test)
+
+
+def test_data_of_old_version_discarded(tmp_path: Path) -> None:
+    """Data saved with another storage version is dropped, not migrated."""
+
+    async def test(hass: HomeAssistant) -> None:
+        await save(hass)
+        path = Path(hass.config.path(".storage", KEY))
+        saved = json.loads(path.read_text())
+        saved["version"] = CACHE_STORAGE_VERSION - 1
+        path.write_text(json.dumps(saved))
+
+        restoring = account()
+        assert (
+            await VehicleCacheStore(hass, ENTRY_ID, restoring).async_restore() is None
+        )
+        assert not restoring.api.vehicles
+
+    run(tmp_path, test)
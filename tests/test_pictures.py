@@ -0,0 +1,130 @@
+"""Tests for the disk cache of the vehicle pictures."""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.volkswagen_we_connect_id.pictures import (
+    VehiclePictureCache,
+    picture_directory,
+)
+
+from .test_coordinator import run
+
+VIN = "WVWZZZE1ZPP000000"
+ENTRY_ID = "entry"
+
+
+class FakeBackend:
+    """Answer the picture requests with the pictures queued."""
+
+    def __init__(self, *pictures: tuple[bytes, str] | None) -> None:
+        self.pictures = list(pictures)
+
+    async def async_fetch_picture(self, vin: str, picture_id: str):
+        return self.pictures.pop(0)
+
+
+@pytest.fixture
+def writes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the digests of the pictures written to disk."""
+    digests: list[str] = []
+    write = VehiclePictureCache._write
+
+    def recording_write(self, digest: str, content: bytes) -> None:
+        digests.append(digest)
+        write(self, digest, content)
+
+    monkeypatch.setattr(VehiclePictureCache, "_write", recording_write)
+    return digests
+
+
+def test_new_picture_written(tmp_path: Path, writes: list[str]) -> None:
+    """A fetched picture is stored under its digest and read from the cache."""
+
+    async def test(hass: HomeAssistant) -> None:
+        cache = VehiclePictureCache(
+            hass, ENTRY_ID, FakeBackend((b"front", "image/png"))
+        )
+        await cache.async_load()
+        assert cache.is_stale(VIN)
+        assert await cache.async_get(VIN) is None
+
+        assert await cache.async_revalidate(VIN)
+        digest = hashlib.sha256(b"front").hexdigest()
+        assert writes == [digest]
+        assert (picture_directory(hass) / digest).read_bytes() == b"front"
+        assert await cache.async_get(VIN) == (b"front", "image/png")
+        assert not cache.is_stale(VIN)
+
+        # The next session reads the picture from disk.
+        restarted = VehiclePictureCache(hass, ENTRY_ID, FakeBackend())
+        await restarted.async_load()
+        assert await restarted.async_get(VIN) == (b"front", "image/png")
+
+    run(tmp_path, test)
+
+
+def test_unchanged_picture_not_rewritten(tmp_path: Path, writes: list[str]) -> None:
+    """A picture with the same SHA-256 only updates when it was checked."""
+
+    async def test(hass: HomeAssistant) -> None:
+        cache = VehiclePictureCache(
+            hass,
+            ENTRY_ID,
+            FakeBackend((b"front", "image/png"), (b"front", "image/png")),
+        )
+        await cache.async_load()
+        await cache.async_revalidate(VIN)
+        updated_at = cache.updated_at(VIN)
+        checked_at = cache._index[VIN]["checked_at"]
+
+        assert not await cache.async_revalidate(VIN)
+        assert len(writes) == 1
+        assert cache.updated_at(VIN) == updated_at
+        assert cache._index[VIN]["checked_at"] >= checked_at
+
+    run(tmp_path, test)
+
+
+def test_changed_picture_replaced(tmp_path: Path, writes: list[str]) -> None:
+    """A picture with other content is written and shown instead."""
+
+    async def test(hass: HomeAssistant) -> None:
+        cache = VehiclePictureCache(
+            hass,
+            ENTRY_ID,
+            FakeBackend((b"front", "image/png"), (b"new paint", "image/png")),
+        )
+        await cache.async_load()
+        await cache.async_revalidate(VIN)
+
+        assert await cache.async_revalidate(VIN)
+        assert writes == [
+            hashlib.sha256(b"front").hexdigest(),
+            hashlib.sha256(b"new paint").hexdigest(),
+        ]
+        assert await cache.async_get(VIN) == (b"new paint", "image/png")
+
+    run(tmp_path, test)
+
+
+def test_failed_fetch_keeps_picture(tmp_path: Path, writes: list[str]) -> None:
+    """The cached picture is kept while the picture can not be fetched."""
+
+    async def test(hass: HomeAssistant) -> None:
+        cache = VehiclePictureCache(
+            hass, ENTRY_ID, FakeBackend((b"front", "image/png"), None)
+        )
+        await cache.async_load()
+        await cache.async_revalidate(VIN)
+
+        assert not await cache.async_revalidate(VIN)
+        assert len(writes) == 1
+        assert await cache.async_get(VIN) == (b"front", "image/png")
+
+    run(tmp_path, test)
@@ -0,0 +1,153 @@
+"""Tests for the backoff and circuit breaker."""
+from __future__ import annotations
+
+from datetime import timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.volkswagen_we_connect_id import resilience
+from custom_components.volkswagen_we_connect_id.resilience import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Freeze the clock and take the longest delay instead of a jittered one."""
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    return fake
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("120", 120.0), ("0", 0.0), ("-5", 0.0), ("1.5", 1.5)],
+)
+def test_parse_retry_after_seconds(value: str, expected: float) -> None:
+    """Retry-After in seconds is never negative."""
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date() -> None:
+    """Retry-After as an HTTP date is the delay until that date."""
+    retry_at = dt_util.utcnow() + timedelta(minutes=10)
+    seconds = parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert seconds is not None
+    assert 598 <= seconds <= 600
+
+
+def test_parse_retry_after_past_date() -> None:
+    """Retry-After in the past allows a call at once."""
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.parametrize("value", [None, "", "soon"])
+def test_parse_retry_after_invalid(value: str | None) -> None:
+    """Missing or invalid Retry-After headers are ignored."""
+    assert parse_retry_after(value) is None
+
+
+def test_closed_until_threshold(clock: FakeClock) -> None:
+    """Failures below the threshold back off but keep the circuit closed."""
+    breaker = CircuitBreaker(threshold=3, min_delay=30, max_delay=3600)
+    error = RuntimeError("boom")
+    breaker.record_failure(error)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.retry_in() == timedelta(seconds=30)
+    breaker.record_failure(error)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.retry_in() == timedelta(seconds=60)
+    assert breaker.last_error is error
+    breaker.check()
+
+
+def test_opens_at_threshold(clock: FakeClock) -> None:
+    """The circuit opens after threshold failures and pauses the calls."""
+    breaker = CircuitBreaker(threshold=3, min_delay=30, max_delay=3600)
+    for _ in range(3):
+        breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == timedelta(seconds=120)
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    clock.now += 119
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_half_open_probe_closes(clock: FakeClock) -> None:
+    """A successful probe after the delay closes the circuit."""
+    breaker = CircuitBreaker(threshold=1, min_delay=30, max_delay=3600)
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == STATE_OPEN
+    clock.now += 30
+    breaker.check()
+    assert breaker.state == STATE_HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+    assert breaker.last_error is None
+    assert breaker.retry_at is None
+
+
+def test_half_open_probe_reopens(clock: FakeClock) -> None:
+    """A failed probe opens the circuit again with a longer delay."""
+    breaker = CircuitBreaker(threshold=1, min_delay=30, max_delay=3600)
+    breaker.record_failure(RuntimeError("boom"))
+    clock.now += 30
+    breaker.check()
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == timedelta(seconds=60)
+    # Only one probe is made until the delay has passed.
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_delay_is_capped(clock: FakeClock) -> None:
+    """The exponential delay stops growing at max_delay."""
+    breaker = CircuitBreaker(threshold=100, min_delay=30, max_delay=100)
+    for _ in range(10):
+        breaker.record_failure(RuntimeError("boom"))
+    assert breaker.retry_in() == timedelta(seconds=100)
+
+
+def test_retry_after_extends_delay(clock: FakeClock) -> None:
+    """A longer Retry-After wins over the backoff, a shorter one does not."""
+    breaker = CircuitBreaker(threshold=3, min_delay=30, max_delay=3600)
+    breaker.record_failure(RuntimeError("rate limited"), retry_after=900)
+    assert breaker.retry_in() == timedelta(seconds=900)
+    breaker.record_failure(RuntimeError("rate limited"), retry_after=1)
+    assert breaker.retry_in() == timedelta(seconds=60)
+
+
+def test_jitter_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The delay is jittered between half and all of the backoff."""
+    calls = []
+
+    def uniform(low: float, high: float) -> float:
+        calls.append((low, high))
+        return low
+
+    monkeypatch.setattr(resilience.random, "uniform", uniform)
+    CircuitBreaker(min_delay=30).record_failure(RuntimeError("boom"))
+    assert calls == [(15, 30)]
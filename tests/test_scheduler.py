@@ -0,0 +1,208 @@
+"""Tests for the adaptive polling scheduler."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from custom_components.volkswagen_we_connect_id import scheduler
+from custom_components.volkswagen_we_connect_id.scheduler import (
+    STAGGER_MIN_REFRESH_SECONDS,
+    PollScheduler,
+    status_value,
+)
+
+from .common import fake_vehicle
+
+FLOOR = 30
+DEFAULT = 60
+CEILING = 900
+
+
+def vehicle(
+    vin: str = "WVWZZZE1ZPP000000",
+    charging_state: str = "readyForCharging",
+    climatisation_state: str = "off",
+    plug: str = "connected",
+    online: bool = True,
+    active: bool = False,
+) -> Any:
+    """Return a vehicle with the statuses the scheduler reads."""
+    return fake_vehicle(
+        vin,
+        {
+            "charging": {
+                "chargingStatus": {"chargingState": charging_state},
+                "plugStatus": {"plugConnectionState": plug},
+            },
+            "climatisation": {
+                "climatisationStatus": {"climatisationState": climatisation_state}
+            },
+            "readiness": {
+                "readinessStatus": {
+                    "connectionState": {"isOnline": online, "isActive": active}
+                }
+            },
+        },
+    )
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 10_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Freeze the clock of the scheduler."""
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler.time, "monotonic", fake)
+    return fake
+
+
+def test_status_value() -> None:
+    """Values are unwrapped, missing and disabled values are None."""
+    car = vehicle(charging_state="charging")
+    assert (
+        status_value(car, "charging", "chargingStatus", "chargingState") == "charging"
+    )
+    assert status_value(car, "charging", "batteryStatus", "currentSOC_pct") is None
+    assert status_value(car, "charging", "chargingStatus", "chargePower_kW") is None
+    car.domains["charging"]["chargingStatus"].chargingState.enabled = False
+    assert status_value(car, "charging", "chargingStatus", "chargingState") is None
+
+
+def test_intervals_are_clamped() -> None:
+    """The default lies between floor and ceiling, the ceiling above the floor."""
+    assert PollScheduler(30, 10, 900).default == 30
+    assert PollScheduler(30, 2000, 900).default == 900
+    assert PollScheduler(60, 60, 30).ceiling == 60
+
+
+@pytest.mark.parametrize(
+    ("state", "expected"),
+    [
+        ({"charging_state": "charging"}, FLOOR),
+        ({"charging_state": "discharging"}, FLOOR),
+        ({"climatisation_state": "heating"}, FLOOR),
+        ({"climatisation_state": "ventilation"}, FLOOR),
+        # An active vehicle is polled often even when it reports offline.
+        ({"charging_state": "charging", "online": False}, FLOOR),
+        ({"online": False}, CEILING),
+        ({"plug": "disconnected"}, CEILING),
+        ({"plug": "disconnected", "active": True}, DEFAULT),
+        ({}, DEFAULT),
+    ],
+)
+def test_interval_for(state: dict[str, Any], expected: int) -> None:
+    """Active vehicles get the floor, idle ones the ceiling."""
+    assert (
+        PollScheduler(FLOOR, DEFAULT, CEILING).interval_for(vehicle(**state))
+        == expected
+    )
+
+
+def test_interval_for_without_statuses() -> None:
+    """A vehicle without the statuses is polled at the default interval."""
+    assert (
+        PollScheduler(FLOOR, DEFAULT, CEILING).interval_for(fake_vehicle("VIN"))
+        == DEFAULT
+    )
+
+
+def test_due_vehicles(clock: FakeClock) -> None:
+    """Vehicles are due after their own interval, all after the ceiling."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING)
+    charging = vehicle("CHARGING", charging_state="charging")
+    parked = vehicle("PARKED")
+    vins = ["CHARGING", "PARKED"]
+
+    assert poll.due_vehicles(vins) is None
+    poll.record_poll([charging, parked], None)
+    assert poll.due_vehicles(vins) == []
+
+    clock.now += FLOOR
+    assert poll.due_vehicles(vins) == ["CHARGING"]
+    poll.record_poll([charging, parked], ["CHARGING"])
+    clock.now += DEFAULT - FLOOR
+    assert poll.due_vehicles(vins) == ["CHARGING", "PARKED"]
+
+    # A vehicle the scheduler does not know yet needs the vehicle list.
+    assert poll.due_vehicles([*vins, "NEW"]) is None
+
+    clock.now += CEILING
+    assert poll.due_vehicles(vins) is None
+
+
+def test_record_failure(clock: FakeClock) -> None:
+    """A failed vehicle is retried at the floor interval."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING)
+    poll.record_poll([vehicle("A", online=False)], None)
+    poll.record_failure(["A"])
+    clock.now += FLOOR
+    assert poll.due_vehicles(["A"]) == ["A"]
+
+
+def test_reset(clock: FakeClock) -> None:
+    """After a reset the next refresh is a full refresh."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING)
+    poll.record_poll([vehicle("A")], None)
+    poll.reset()
+    assert poll.due_vehicles(["A"]) is None
+    assert poll.list_due()
+
+
+def test_next_refresh_in(clock: FakeClock) -> None:
+    """The next refresh waits for the first due vehicle, within the bounds."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING)
+    assert poll.next_refresh_in() == timedelta(seconds=FLOOR)
+    poll.record_poll([vehicle("A"), vehicle("B", online=False)], None)
+    assert poll.next_refresh_in() == timedelta(seconds=DEFAULT)
+    clock.now += DEFAULT + 5
+    assert poll.next_refresh_in() == timedelta(seconds=FLOOR)
+
+
+def test_stagger_spreads_polls(clock: FakeClock) -> None:
+    """Staggered vehicles are due at their own offset into the interval."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING, stagger=True)
+    cars = [vehicle(f"WVWZZZE1ZPP{number:06d}") for number in range(50)]
+    vins = [car.vin.value for car in cars]
+    poll.record_poll(cars, None)
+    next_poll = poll._next_poll  # pylint: disable=protected-access
+    next_poll_time = poll._next_poll_time  # pylint: disable=protected-access
+
+    offsets = set()
+    for vin in vins:
+        due = next_poll[vin]
+        assert clock.now < due <= clock.now + DEFAULT
+        offsets.add(round(due % DEFAULT, 3))
+        # The offset of a vehicle does not depend on when it was polled.
+        later = next_poll_time(vin, DEFAULT, clock.now + 7)
+        assert later % DEFAULT == pytest.approx(due % DEFAULT)
+    assert len(offsets) > 40
+
+    # The vehicle list is refreshed along with the due vehicles.
+    clock.now += CEILING
+    assert poll.due_vehicles(vins) == vins
+    assert poll.list_due()
+    poll.record_poll(cars, [], list_refreshed=True)
+    assert not poll.list_due()
+
+
+def test_stagger_refreshes_between_floor(clock: FakeClock) -> None:
+    """Staggered refreshes may come closer than the floor interval."""
+    poll = PollScheduler(FLOOR, DEFAULT, CEILING, stagger=True)
+    poll.record_poll(
+        [vehicle(f"WVWZZZE1ZPP{number:06d}") for number in range(50)], None
+    )
+    assert (
+        timedelta(seconds=STAGGER_MIN_REFRESH_SECONDS)
+        <= poll.next_refresh_in()
+        < timedelta(seconds=FLOOR)
+    )
@@ -0,0 +1,30 @@
+"""Tests for the readers of the sensor descriptions."""
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.volkswagen_we_connect_id import get_object_value
+from custom_components.volkswagen_we_connect_id.binary_sensor import (
+    SENSORS as BINARY_SENSORS,
+)
+from custom_components.volkswagen_we_connect_id.sensor import SENSORS
+
+
+class Unreported:
+    """A reported status whose values, and the values of its elements, are not."""
+
+    enabled = True
+    value = None
+    doors: dict[str, Any] = {}
+    windows: dict[str, Any] = {}
+    lights: dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Unreported:
+        return Unreported()
+
+
+def test_unreported_values_read_none() -> None:
+    """The readers return None, and do not raise, for values without a value."""
+    for sensor in (*SENSORS, *BINARY_SENSORS):
+        domains = {sensor.domain.value: {sensor.status: Unreported()}}
+        assert get_object_value(sensor.value(domains)) is None, sensor.key
@@ -0,0 +1,106 @@
+"""Tests for the vehicle value snapshots and their change detection."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from custom_components.volkswagen_we_connect_id.snapshot import (
+    build_snapshot,
+    reported_element,
+    reported_status,
+    update_snapshot,
+)
+
+from .common import fake_element, fake_vehicle
+
+
+def vehicle(soc: int = 80, odometer: int = 12345) -> Any:
+    """Return a vehicle with a battery and an odometer status."""
+    return fake_vehicle(
+        "WVWZZZE1ZPP000000",
+        {
+            "charging": {"batteryStatus": {"currentSOC_pct": soc}},
+            "measurements": {"odometerStatus": {"odometer": odometer}},
+        },
+    )
+
+
+def reader(domain: str, status: str, attribute: str) -> Callable[[Any], Any]:
+    """Return a reader of an attribute of a status, like the entities have."""
+
+    def read(car: Any) -> Any:
+        element = reported_status(car.domains, domain, status)
+        return None if element is None else getattr(element, attribute).value
+
+    return read
+
+
+READERS = {
+    "soc": reader("charging", "batteryStatus", "currentSOC_pct"),
+    "odometer": reader("measurements", "odometerStatus", "odometer"),
+    "fuel": reader("fuelStatus", "rangeStatus", "totalRange_km"),
+}
+INDEX = {key: position for position, key in enumerate(READERS)}
+
+
+def test_reported_status() -> None:
+    """A status the vehicle does not report is None, without raising."""
+    car = vehicle()
+    assert reported_status(car.domains, "charging", "batteryStatus") is not None
+    assert reported_status(car.domains, "charging", "chargingStatus") is None
+    assert reported_status(car.domains, "fuelStatus", "rangeStatus") is None
+
+    car.domains["charging"]["batteryStatus"].enabled = False
+    assert reported_status(car.domains, "charging", "batteryStatus") is None
+
+
+def test_reported_element() -> None:
+    """An element of a status, e.g. a door, is None when it is not reported."""
+    doors = {"bonnet": fake_element({"lockState": "locked"})}
+    assert reported_element(doors, "bonnet", "lockState").value == "locked"
+    assert reported_element(doors, "sunRoof", "lockState") is None
+
+    doors["bonnet"].enabled = False
+    assert reported_element(doors, "bonnet", "lockState") is None
+
+
+def test_build_snapshot() -> None:
+    """Every reader runs once, in the order of the index."""
+    snapshot = build_snapshot(vehicle(), READERS, INDEX)
+    assert list(snapshot.keys()) == ["soc", "odometer", "fuel"]
+    assert snapshot["soc"] == 80
+    assert snapshot["odometer"] == 12345
+    assert snapshot["fuel"] is None
+    assert "soc" in snapshot
+    assert "unknown" not in snapshot
+
+
+def test_equal_snapshots() -> None:
+    """Snapshots of the same values are equal, so no state is written."""
+    assert build_snapshot(vehicle(), READERS, INDEX) == build_snapshot(
+        vehicle(), READERS, INDEX
+    )
+    assert build_snapshot(vehicle(), READERS, INDEX) != build_snapshot(
+        vehicle(soc=81), READERS, INDEX
+    )
+
+
+def test_snapshots_of_other_readers_differ() -> None:
+    """Snapshots built from different indexes never compare equal."""
+    other_index = dict(INDEX)
+    assert build_snapshot(vehicle(), READERS, INDEX) != build_snapshot(
+        vehicle(), READERS, other_index
+    )
+
+
+def test_update_snapshot() -> None:
+    """Only the values of the given keys are read again."""
+    snapshot = build_snapshot(vehicle(), READERS, INDEX)
+    changed = vehicle(soc=90, odometer=20000)
+    updated = update_snapshot(snapshot, changed, READERS, ["soc"])
+    assert updated["soc"] == 90
+    assert updated["odometer"] == 12345
+    assert updated.index is snapshot.index
+    # The snapshot the update started from is left alone.
+    assert snapshot["soc"] == 80
+    assert update_snapshot(snapshot, vehicle(), READERS, ["soc"]) == snapshot
@@ -0,0 +1,137 @@
+"""Tests for the hourly trip statistics rows."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from custom_components.volkswagen_we_connect_id.trip_statistics import (
+    TRIP_QUANTITIES,
+    _hourly_rows,
+)
+
+QUANTITIES = {quantity.key: quantity for quantity in TRIP_QUANTITIES}
+
+
+def at(hour: int, minute: int) -> datetime:
+    """Return a trip end on the test day."""
+    return datetime(2024, 3, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def trip(**values: Any) -> dict[str, Any]:
+    """Return a trip of the API."""
+    return {"mileage_km": 10, "travelTime": 15, **values}
+
+
+def test_trips_are_summed_per_hour() -> None:
+    """Trips ending in the same hour share a row, the sum keeps running."""
+    statistics: dict[str, dict[str, Any]] = {}
+    rows = _hourly_rows(
+        [(at(8, 10), trip()), (at(8, 50), trip(mileage_km=5)), (at(10, 0), trip())],
+        QUANTITIES["distance"],
+        statistics,
+    )
+    assert rows == {at(8, 0): (15, 15), at(10, 0): (10, 25)}
+    assert statistics["distance"] == {
+        "hour": at(10, 0).isoformat(),
+        "state": 10,
+        "sum": 25,
+    }
+
+
+def test_watermark_continues_rows() -> None:
+    """The next import continues the sum and the row of the last hour."""
+    statistics: dict[str, dict[str, Any]] = {}
+    quantity = QUANTITIES["distance"]
+    _hourly_rows([(at(8, 10), trip())], quantity, statistics)
+    rows = _hourly_rows(
+        [(at(8, 40), trip(mileage_km=2)), (at(9, 5), trip(mileage_km=3))],
+        quantity,
+        statistics,
+    )
+    assert rows == {at(8, 0): (12, 12), at(9, 0): (3, 15)}
+    assert statistics["distance"]["sum"] == 15
+
+
+def test_no_trips_keep_watermark() -> None:
+    """An import without trips leaves the watermark alone."""
+    statistics = {
+        "distance": {"hour": at(8, 0).isoformat(), "state": 10.0, "sum": 100.0}
+    }
+    assert _hourly_rows([], QUANTITIES["distance"], statistics) == {}
+    assert statistics["distance"]["sum"] == 100.0
+
+
+def test_missing_values_are_skipped() -> None:
+    """Trips without a value of the quantity add no row."""
+    statistics: dict[str, dict[str, Any]] = {}
+    rows = _hourly_rows(
+        [
+            (at(8, 10), trip(averageElectricConsumption=16)),
+            (at(9, 10), trip()),
+        ],
+        QUANTITIES["electric_energy"],
+        statistics,
+    )
+    assert rows == {at(8, 0): (1.6, 1.6)}
+    assert _hourly_rows([(at(8, 10), trip())], QUANTITIES["fuel"], {}) == {}
+
+
+def test_local_trip_ends_use_utc_hours() -> None:
+    """Rows start at full UTC hours whatever the time zone of the trip."""
+    end = datetime.fromisoformat("2024-03-01T09:30:00+01:00")
+    rows = _hourly_rows([(end, trip())], QUANTITIES["travel_time"], {})
+    assert rows == {at(8, 0): (15, 15)}
+
+
+def test_cumulative_trip_adds_its_growth() -> None:
+    """A running total imported again only adds what it grew by."""
+    statistics: dict[str, dict[str, Any]] = {}
+    quantity = QUANTITIES["distance"]
+    _hourly_rows([(at(8, 10), trip(id=1, mileage_km=100))], quantity, statistics, True)
+    # The vehicle updated the same long-term trip in place.
+    rows = _hourly_rows(
+        [(at(9, 20), trip(id=1, mileage_km=130))], quantity, statistics, True
+    )
+    assert rows == {at(9, 0): (30, 130)}
+    rows = _hourly_rows(
+        [(at(9, 40), trip(id=1, mileage_km=135))], quantity, statistics, True
+    )
+    assert rows == {at(9, 0): (35, 135)}
+    assert statistics["distance"]["sum"] == 135
+
+
+def test_cumulative_trip_started_afresh() -> None:
+    """A new running total is added whole."""
+    statistics: dict[str, dict[str, Any]] = {}
+    quantity = QUANTITIES["distance"]
+    _hourly_rows([(at(8, 10), trip(id=1, mileage_km=100))], quantity, statistics, True)
+    rows = _hourly_rows(
+        [(at(9, 0), trip(id=2, mileage_km=20))], quantity, statistics, True
+    )
+    assert rows == {at(9, 0): (20, 120)}
+    # A trip reset in place starts from zero again.
+    rows = _hourly_rows(
+        [(at(10, 0), trip(id=2, mileage_km=5))], quantity, statistics, True
+    )
+    assert rows == {at(10, 0): (5, 125)}
+
+
+def test_cumulative_consumption_grows_with_distance() -> None:
+    """Derived quantities of a running total add their growth too."""
+    statistics: dict[str, dict[str, Any]] = {}
+    quantity = QUANTITIES["electric_energy"]
+    _hourly_rows(
+        [(at(8, 0), trip(id=1, mileage_km=100, averageElectricConsumption=15))],
+        quantity,
+        statistics,
+        True,
+    )
+    rows = _hourly_rows(
+        [(at(9, 0), trip(id=1, mileage_km=200, averageElectricConsumption=16))],
+        quantity,
+        statistics,
+        True,
+    )
+    assert rows == {at(9, 0): (pytest.approx(17), pytest.approx(32))}
@@ -0,0 +1,178 @@
+"""Tests for the zone index of the device trackers."""
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from homeassistant.components.zone.const import ATTR_PASSIVE, ATTR_RADIUS
+from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, STATE_UNAVAILABLE
+from homeassistant.core import State
+from homeassistant.util.location import distance
+
+from custom_components.volkswagen_we_connect_id import zones
+from custom_components.volkswagen_we_connect_id.zones import ZoneIndex
+
+
+def zone_state(
+    name: str,
+    latitude: float,
+    longitude: float,
+    radius: float,
+    state: str = "0",
+    passive: bool = False,
+) -> State:
+    """Return the state of a zone."""
+    return State(
+        f"zone.{name}",
+        state,
+        {
+            ATTR_LATITUDE: latitude,
+            ATTR_LONGITUDE: longitude,
+            ATTR_RADIUS: radius,
+            ATTR_PASSIVE: passive,
+        },
+    )
+
+
+class FakeStates:
+    """The zone states of a fake Home Assistant."""
+
+    def __init__(self, states: list[State]) -> None:
+        self.states = states
+        self.reads = 0
+
+    def async_all(self, domain: str) -> list[State]:
+        assert domain == "zone"
+        self.reads += 1
+        return self.states
+
+
+@pytest.fixture
+def tracked(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Collect the zone change listeners of the index."""
+    listeners: list[Any] = []
+
+    def track(hass, track_states, action):
+        listeners.append(action)
+        return SimpleNamespace(async_remove=lambda: listeners.remove(action))
+
+    monkeypatch.setattr(zones, "async_track_state_change_filtered", track)
+    return listeners
+
+
+def index_of(states: list[State]) -> ZoneIndex:
+    """Return an index of the zones."""
+    return ZoneIndex(SimpleNamespace(states=FakeStates(states)))
+
+
+def reference_zone(
+    states: list[State], latitude: float, longitude: float
+) -> State | None:
+    """Return the zone of a position by measuring every zone."""
+    closest = None
+    min_dist = None
+    for state in states:
+        attributes = state.attributes
+        if state.state == STATE_UNAVAILABLE or attributes[ATTR_PASSIVE]:
+            continue
+        zone_dist = distance(
+            latitude, longitude, attributes[ATTR_LATITUDE], attributes[ATTR_LONGITUDE]
+        )
+        if zone_dist >= attributes[ATTR_RADIUS]:
+            continue
+        if (
+            closest is None
+            or zone_dist < min_dist
+            or (
+                zone_dist == min_dist
+                and attributes[ATTR_RADIUS] < closest.attributes[ATTR_RADIUS]
+            )
+        ):
+            closest = state
+            min_dist = zone_dist
+    return closest
+
+
+def test_inside_and_outside(tracked: list[Any]) -> None:
+    """A position is in a zone only within its radius."""
+    home = zone_state("home", 52.4227, 10.7865, 100)
+    index = index_of([home])
+    assert index.async_active_zone(52.4227, 10.7865) is home
+    assert index.async_active_zone(52.4234, 10.7865) is home
+    assert index.async_active_zone(52.4240, 10.7865) is None
+    assert index.async_active_zone(48.0, 11.0) is None
+
+
+def test_closest_then_smallest_zone(tracked: list[Any]) -> None:
+    """Of overlapping zones the closest wins, of equally close the smaller."""
+    city = zone_state("city", 52.42, 10.78, 5000)
+    work = zone_state("work", 52.4227, 10.7865, 200)
+    office = zone_state("office", 52.4227, 10.7865, 50)
+    index = index_of([city, work, office])
+    assert index.async_active_zone(52.4227, 10.7865) is office
+    assert index.async_active_zone(52.4236, 10.7865) is work
+    assert index.async_active_zone(52.43, 10.76) is city
+
+
+def test_ignored_zones(tracked: list[Any]) -> None:
+    """Passive and unavailable zones and zones without a position are ignored."""
+    states = [
+        zone_state("passive", 52.0, 10.0, 1000, passive=True),
+        zone_state("gone", 52.0, 10.0, 1000, state=STATE_UNAVAILABLE),
+        State("zone.nowhere", "0", {ATTR_RADIUS: 1000}),
+    ]
+    assert index_of(states).async_active_zone(52.0, 10.0) is None
+
+
+def test_zone_across_cells(tracked: list[Any]) -> None:
+    """A large zone is found from every cell its circle overlaps."""
+    # The center lies right next to the corner of four cells.
+    big = zone_state("big", 52.0001, 10.0001, 3000)
+    index = index_of([big])
+    for latitude, longitude in ((52.02, 10.02), (51.98, 9.98), (52.02, 9.98)):
+        assert index.async_active_zone(latitude, longitude) is big
+
+
+def test_zone_changes_rebuild_index(tracked: list[Any]) -> None:
+    """The index is built once and again after a zone changed."""
+    home = zone_state("home", 52.4227, 10.7865, 100)
+    index = index_of([home])
+    states = index.hass.states
+    index.async_active_zone(52.4227, 10.7865)
+    index.async_active_zone(52.4227, 10.7865)
+    assert states.reads == 1
+
+    moved = zone_state("home", 48.0, 11.0, 100)
+    states.states = [moved]
+    tracked[0](None)
+    assert index.async_active_zone(52.4227, 10.7865) is None
+    assert index.async_active_zone(48.0, 11.0) is moved
+    assert states.reads == 2
+
+    index.async_remove()
+    assert not tracked
+
+
+def test_matches_measuring_every_zone(tracked: list[Any]) -> None:
+    """Lookups find the same zone as measuring the distance to every zone."""
+    rng = random.Random(4)
+    states = [
+        zone_state(
+            f"zone_{number}",
+            rng.uniform(52.0, 52.5),
+            rng.uniform(10.0, 10.8),
+            rng.choice((50, 200, 1000, 5000, 20000)),
+            passive=rng.random() < 0.1,
+        )
+        for number in range(100)
+    ]
+    index = index_of(states)
+    for _ in range(500):
+        latitude = rng.uniform(51.9, 52.6)
+        longitude = rng.uniform(9.9, 10.9)
+        assert index.async_active_zone(latitude, longitude) is reference_zone(
+            states, latitude, longitude
+        )